@@ -0,0 +1 @@
+# Banco de pruebas de rendimiento (ver run_benchmarks.py)
@@ -0,0 +1,405 @@
+# run_benchmarks.py
+# Banco de pruebas de rendimiento (benchmarks) del proyecto
+#
+# Mide el tiempo de las piezas que más pesan y de corridas completas del AG:
+# - parse_tsp, nearest_neighbor, route_cost
+# - order_crossover / swap_mutation (versión por individuo) y sus versiones en bloque
+# - los demás operadores de cruce en bloque (PMX, ERX, EAX)
+# - genetic_algorithm: rendimiento (generaciones y evaluaciones por segundo) y
+#   tiempo hasta alcanzar una calidad objetivo (time-to-target)
+#
+# Instancias: gr17/gr21/gr24 de data/ más instancias sintéticas EUC_2D con
+# ciudades uniformes en un cuadrado de 10000 x 10000 (100 a 10000 ciudades).
+#
+# Los resultados se pueden guardar como JSON y compararse con una corrida
+# anterior (línea base): si algo es más lento que el umbral, el proceso
+# termina con código 1 (útil en integración continua).
+#
+# Uso:
+#   python -m benchmarks.run_benchmarks                          # todo
+#   python -m benchmarks.run_benchmarks --quick --save base.json # guardar línea base
+#   python -m benchmarks.run_benchmarks --quick --compare base.json
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import timeit
+
+import numpy as np
+
+from main import GA_PARAMS, INSTANCES, KNOWN_OPTIMA
+from src.backends import BACKENDS, available_backends, get_backend, set_backend
+from src.genetic_algorithm import (
+    CROSSOVER_OPERATORS,
+    create_population_array,
+    genetic_algorithm,
+    order_crossover,
+    order_crossover_batch,
+    random_cut_points,
+    swap_mutation,
+    swap_mutation_batch,
+)
+from src.local_search import build_neighbor_lists, local_search
+from src.nearest_neighbor import nearest_neighbor, route_cost
+from src.parser import parse_tsp
+
+# Tamaños de las instancias sintéticas
+SYNTHETIC_SIZES = (100, 1000, 10000)
+QUICK_SIZES = (100, 1000)
+
+# Lado del cuadrado donde se generan las ciudades sintéticas
+SYNTHETIC_SIDE = 10000.0
+
+# Parámetros del AG para instancias sin entrada en GA_PARAMS (memético y con
+# población sembrada: sin eso el AG no mejora en tiempo razonable con miles de ciudades)
+DEFAULT_GA_PARAMS = {'pop_size': 100, 'mutation_rate': 0.1, 'elite_size': 10,
+                     'initialization': 'heuristic', 'local_search_rate': 0.02}
+
+# Una medición es regresión si tarda más que la línea base por encima de este factor
+DEFAULT_THRESHOLD = 0.10
+
+
+# ─────────────────────────────────────────────
+# INSTANCIAS
+# ─────────────────────────────────────────────
+
+def write_tsplib(path, name, coords):
+    """Escribe un archivo TSPLIB EUC_2D con las coordenadas dadas."""
+    lines = [f"NAME: {name}", "TYPE: TSP", f"DIMENSION: {len(coords)}",
+             "EDGE_WEIGHT_TYPE: EUC_2D", "NODE_COORD_SECTION"]
+    lines += [f"{i + 1} {x:.3f} {y:.3f}" for i, (x, y) in enumerate(coords)]
+    lines.append("EOF")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def load_instances(sizes, workdir, seed=0):
+    """
+    Prepara las instancias del benchmark: las de data/ y una sintética por cada
+    tamaño de `sizes` (escrita como .tsp en `workdir`, para medir también el parser).
+
+    Retorna: lista de diccionarios con 'name', 'path', 'dimension',
+    'dist_matrix' y 'reference': el costo contra el que se mide la calidad.
+    Para gr17/gr21/gr24 es el óptimo conocido; para las sintéticas (sin óptimo
+    conocido) es el vecino más cercano mejorado con 2-opt + Or-opt.
+    """
+    instances = []
+    for name, path in INSTANCES:
+        if not os.path.exists(path):
+            continue
+        dimension, dist_matrix = parse_tsp(path)
+        instances.append({'name': name, 'path': path, 'dimension': dimension,
+                          'dist_matrix': dist_matrix, 'reference': KNOWN_OPTIMA.get(name)})
+
+    rng = np.random.default_rng(seed)
+    for n in sizes:
+        name = f"rand{n}"
+        path = os.path.join(workdir, f"{name}.tsp")
+        write_tsplib(path, name, rng.uniform(0, SYNTHETIC_SIDE, size=(n, 2)))
+        dimension, dist_matrix = parse_tsp(path)
+        _, reference = local_search(nearest_neighbor(dist_matrix)[0], dist_matrix)
+        instances.append({'name': name, 'path': path, 'dimension': dimension,
+                          'dist_matrix': dist_matrix, 'reference': reference})
+    return instances
+
+
+# ─────────────────────────────────────────────
+# MEDICIONES
+# ─────────────────────────────────────────────
+
+def time_call(fn, repeat=5, min_time=0.2, setup=None):
+    """
+    Segundos por llamada de `fn`: el mínimo sobre `repeat` repeticiones, cada una
+    con tantas llamadas como hagan falta para durar al menos `min_time` segundos
+    (igual que `python -m timeit`). El mínimo es la medida menos ruidosa.
+
+    Si `fn` modifica sus datos, `setup` debe devolver una copia nueva de ellos:
+    se llama antes de cada llamada, fuera del tiempo medido, y su resultado se
+    pasa como argumentos a `fn`. Así todas las llamadas miden la misma entrada.
+    """
+    if setup is not None:
+        best = float('inf')
+        for _ in range(max(1, repeat)):
+            total = 0.0
+            calls = 0
+            while total < min_time and calls < 1_000_000:
+                args = setup()
+                start = time.perf_counter()
+                fn(*args)
+                total += time.perf_counter() - start
+                calls += 1
+            best = min(best, total / calls)
+        return best
+
+    timer = timeit.Timer(fn)
+    number = 1
+    while timer.timeit(number) < min_time and number < 1_000_000:
+        number *= 10
+    return min(timer.repeat(max(1, repeat), number)) / number
+
+
+def bench_components(instance, repeat):
+    """Tiempos de parse_tsp, nearest_neighbor, route_cost y de los operadores."""
+    name = instance['name']
+    dist_matrix = instance['dist_matrix']
+    n = instance['dimension']
+    results = {}
+
+    results[f"parse_tsp[{name}]"] = {'seconds': time_call(lambda: parse_tsp(instance['path']),
+                                                          repeat, min_time=0.05)}
+    results[f"nearest_neighbor[{name}]"] = {'seconds': time_call(lambda: nearest_neighbor(dist_matrix),
+                                                                 repeat, min_time=0.05)}
+
+    route = list(range(n))
+    results[f"route_cost[{name}]"] = {'seconds': time_call(lambda: route_cost(route, dist_matrix), repeat)}
+
+    # Operadores por individuo (listas de Python, módulo random)
+    random.seed(0)
+    p1 = random.sample(range(n), n)
+    p2 = random.sample(range(n), n)
+    results[f"order_crossover[{name}]"] = {
+        'seconds': time_call(lambda: order_crossover(p1, p2), repeat)}
+    results[f"swap_mutation[{name}]"] = {
+        'seconds': time_call(lambda: swap_mutation(p1, 1.0), repeat)}
+
+    # Operadores en bloque: una generación de 100 hijos
+    rng = np.random.default_rng(0)
+    population = create_population_array(100, n, rng)
+    parents = rng.integers(0, 100, size=(100, 2))
+    cuts = random_cut_points(100, n, rng)
+    results[f"order_crossover_batch[{name}]"] = {
+        'seconds': time_call(lambda: order_crossover_batch(population, parents, cuts), repeat),
+        'rows': 100}
+    neighbors = build_neighbor_lists(dist_matrix)
+    for operator, crossover in CROSSOVER_OPERATORS.items():
+        if operator != 'ox1':
+            results[f"crossover_{operator}[{name}]"] = {
+                'seconds': time_call(
+                    lambda crossover=crossover: crossover(population, parents, rng, dist_matrix,
+                                                          neighbors),
+                    repeat),
+                'rows': 100}
+    # swap_mutation_batch modifica la población y los costos: cada llamada recibe una copia
+    costs = route_cost(population[0], dist_matrix) + np.zeros(100, dtype=np.int64)
+    results[f"swap_mutation_batch[{name}]"] = {
+        'seconds': time_call(
+            lambda pop, pop_costs, mut_rng: swap_mutation_batch(pop, 1.0, mut_rng, pop_costs,
+                                                                dist_matrix),
+            repeat,
+            setup=lambda: (population.copy(), costs.copy(), np.random.default_rng(0))),
+        'rows': 100}
+    return results
+
+
+def ga_params(instance):
+    """Parámetros del AG para una instancia: GA_PARAMS si existe, si no DEFAULT_GA_PARAMS."""
+    params = dict(GA_PARAMS.get(instance['name'], DEFAULT_GA_PARAMS))
+    params.pop('generations', None)
+    return params
+
+
+def bench_throughput(instance, generations, repeat):
+    """
+    Rendimiento del AG: corre `generations` generaciones completas (sin
+    criterios de parada) y mide generaciones y evaluaciones por segundo
+    (la mejor de `repeat` corridas idénticas).
+    Se mide el motor del AG solo: población aleatoria y sin paso memético.
+    """
+    params = ga_params(instance)
+    params.pop('initialization', None)
+    params.pop('local_search_rate', None)
+    elapsed = float('inf')
+    for _ in range(max(1, repeat)):
+        _, cost, _, run_time = genetic_algorithm(
+            instance['dist_matrix'], generations=generations, verbose=False, **params
+        )
+        elapsed = min(elapsed, run_time)
+    children = params['pop_size'] - params['elite_size']
+    return {
+        'seconds': elapsed,
+        'generations_per_second': generations / elapsed,
+        'evals_per_second': generations * children / elapsed,
+        'cost': cost,
+    }
+
+
+def bench_time_to_target(instance, target_gap, budget, repeat):
+    """
+    Tiempo hasta que el AG encuentra una ruta a lo sumo `target_gap` por encima
+    de la referencia (ver load_instances), con un máximo de `budget` segundos.
+    La semilla es fija, así que las `repeat` corridas recorren las mismas
+    generaciones; se reporta el menor tiempo. Si no lo alcanza, 'seconds' es None.
+    """
+    target = instance['reference'] * (1 + target_gap)
+    best = None
+    for _ in range(max(1, repeat)):  # Al menos una corrida: de ella salen cost e info
+        _, cost, _, elapsed, info = genetic_algorithm(
+            instance['dist_matrix'], generations=10 ** 9, verbose=False, return_info=True,
+            target_cost=target, time_limit=budget, **ga_params(instance)
+        )
+        if info['stop_reason'] != 'target':
+            break  # Si no llegó con todo el presupuesto, repetir no cambia nada
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        'seconds': best,
+        'target': target,
+        'cost': cost,
+        'gap': cost / instance['reference'] - 1,
+        'generations': info['generations'],
+    }
+
+
+def run_benchmarks(sizes, repeat=5, generations=100, target_gap=0.10, budget=30.0):
+    """Ejecuta todos los benchmarks y retorna {nombre: resultado}."""
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for instance in load_instances(sizes, workdir):
+            name = instance['name']
+            print(f"  {name} ({instance['dimension']} ciudades)...", flush=True)
+            results.update(bench_components(instance, repeat))
+            results[f"ga_throughput[{name}]"] = bench_throughput(instance, generations, repeat)
+            results[f"ga_time_to_target[{name}]"] = bench_time_to_target(
+                instance, target_gap, budget, repeat
+            )
+    return results
+
+
+# ─────────────────────────────────────────────
+# LÍNEA BASE Y REPORTES
+# ─────────────────────────────────────────────
+
+def environment():
+    """Datos de la máquina y versiones, para saber contra qué se compara."""
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'backend': get_backend(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compara `results` con los de `baseline` (mismo formato).
+
+    Retorna: lista de (nombre, segundos_base, segundos_actual, cambio) de las
+    mediciones más lentas que la base en más de `threshold` (ej. 0.10 = 10%).
+    Un time-to-target que antes se alcanzaba y ahora no también es regresión.
+    """
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None or base.get('seconds') is None:
+            continue
+        if current.get('seconds') is None:
+            regressions.append((name, base['seconds'], None, None))
+            continue
+        change = current['seconds'] / base['seconds'] - 1
+        if change > threshold:
+            regressions.append((name, base['seconds'], current['seconds'], change))
+    return regressions
+
+
+def _format_seconds(seconds):
+    """Formatea un tiempo con la unidad más legible."""
+    if seconds is None:
+        return 'no alcanzó'
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.3f} s"
+
+
+def print_report(results, baseline=None):
+    """Imprime una fila por medición (y el cambio respecto a la base, si hay)."""
+    width = 84
+    print("\n" + "="*width)
+    print(f"{'Benchmark':<40} {'Tiempo':<14} {'Base':<14} {'Cambio':<10}")
+    print("="*width)
+    for name, r in results.items():
+        base = (baseline or {}).get(name, {}).get('seconds')
+        change = ''
+        if base is not None and r.get('seconds') is not None:
+            change = f"{r['seconds'] / base - 1:+.1%}"
+        base_str = _format_seconds(base) if base is not None else '-'
+        print(f"{name:<40} {_format_seconds(r.get('seconds')):<14} {base_str:<14} {change:<10}")
+    print("="*width)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='tsp-ga-bench',
+        description='Benchmarks de rendimiento del TSP con Algoritmo Genético.'
+    )
+    parser.add_argument('--quick', action='store_true',
+                        help=f'instancias sintéticas de {QUICK_SIZES} ciudades en lugar de '
+                             f'{SYNTHETIC_SIZES} (las de data/ se miden siempre)')
+    parser.add_argument('--sizes', nargs='+', type=int, metavar='N',
+                        help=f'tamaños de las instancias sintéticas (por defecto: {SYNTHETIC_SIZES})')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='repeticiones por medición (se reporta el mínimo)')
+    parser.add_argument('--generations', type=int, default=100,
+                        help='generaciones de la medición de rendimiento del AG')
+    parser.add_argument('--target-gap', type=float, default=0.10,
+                        help='calidad objetivo: fracción sobre la referencia (por defecto: 0.10)')
+    parser.add_argument('--budget', type=float, default=30.0,
+                        help='segundos máximos por corrida de time-to-target')
+    parser.add_argument('--save', metavar='ARCHIVO', help='guarda los resultados como JSON')
+    parser.add_argument('--compare', metavar='ARCHIVO',
+                        help='compara con una línea base guardada con --save')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='cambio máximo tolerado respecto a la base (por defecto: 0.10)')
+    parser.add_argument('--backend', choices=BACKENDS, default=None,
+                        help=f'kernels a medir (por defecto: {get_backend()})')
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat debe ser al menos 1")
+    if args.backend and args.backend not in available_backends():
+        parser.error(f"el backend {args.backend!r} no está instalado "
+                     f"(disponibles: {', '.join(available_backends())})")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SYNTHETIC_SIZES)
+    if args.backend:
+        set_backend(args.backend)
+
+    print(f"\n[BENCH] Instancias sintéticas: {list(sizes)} (backend: {get_backend()})")
+    results = run_benchmarks(sizes, args.repeat, args.generations, args.target_gap, args.budget)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+    print_report(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(), 'results': results}, f, indent=2)
+        print(f"\n[OK] Resultados guardados en {args.save}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n[REGRESIÓN] {len(regressions)} mediciones empeoraron más de {args.threshold:.0%}:")
+            for name, base, current, change in regressions:
+                detail = f"{change:+.1%}" if change is not None else 'ya no alcanza el objetivo'
+                print(f"  {name}: {_format_seconds(base)} → {_format_seconds(current)} ({detail})")
+            return 1
+        print(f"\n[OK] Sin regresiones mayores a {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
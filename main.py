@@ -2,13 +2,59 @@
 # Punto de entrada principal del programa
 # Ejecuta el TSP para las tres instancias y muestra los resultados
 
+import argparse  # Para leer las opciones de la línea de comandos
+import hashlib
+import importlib.util
+import inspect
+import itertools
+import json
 import os  # Para trabajar con rutas de archivos
+import statistics
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 # Importamos nuestros módulos
-from src.parser import parse_tsp
-from src.nearest_neighbor import nearest_neighbor
-from src.genetic_algorithm import genetic_algorithm
-from src.utils import plot_convergence, print_results_table
+from src.backends import BACKEND_ENV, BACKENDS, available_backends, get_backend, set_backend
+from src.cache import (
+    DEFAULT_CACHE_DIR,
+    DEFAULT_RESULT_CACHE_BYTES,
+    load_distance_matrix,
+    load_result,
+    result_key,
+    save_result,
+)
+from src.decomposition import PARTITION_METHODS, decomposition_solver
+from src.genetic_algorithm import (
+    CROSSOVER_OPERATORS,
+    DEFAULT_FITNESS_CACHE_SIZE,
+    STAGNATION_ACTIONS,
+    genetic_algorithm,
+    genetic_algorithm_iter,
+)
+from src.initialization import INIT_PRESETS
+from src.local_search import local_search
+from src.nearest_neighbor import multi_start_nearest_neighbor, nearest_neighbor
+from src.parser import read_dimension
+from src.profiling import Profiler, merge_summaries
+from src.tuning import default_params, load_profile, params_for
+from src.utils import (
+    plot_convergence,
+    plot_convergence_runs,
+    print_profile_table,
+    print_results_table,
+    save_history,
+)
+
+# Formatos de la historia de convergencia que se guarda en output/
+HISTORY_FORMATS = ('npy', 'csv')
+
+# Ciudades de inicio (al azar) del vecino más cercano multi-start con --multi-start.
+# Desde TODAS las ciudades cuesta O(n³): ~9 s con 2000 ciudades
+MULTI_START_STARTS = 32
+
+# Argumentos de genetic_algorithm_iter que no cambian el resultado: no entran
+# en la clave de la caché de resultados
+RESULT_NEUTRAL_PARAMS = ('checkpoint_path', 'checkpoint_interval', 'resume', 'profiler',
+                         'track_diversity', 'fitness_cache')
 
 # ─────────────────────────────────────────────
 # CONOCIDOS DE TSPLIB (para calcular eficiencia)
@@ -23,21 +69,124 @@ KNOWN_OPTIMA = {
 # ─────────────────────────────────────────────
 # PARÁMETROS DEL ALGORITMO GENÉTICO
 # Ajustados según el tamaño de cada instancia
+# 'crossover' elige el operador de CROSSOVER_OPERATORS ('ox1', 'pmx', 'erx', 'eax')
+# Las instancias que no están aquí usan default_params(n) de src/tuning.py
 # ─────────────────────────────────────────────
 GA_PARAMS = {
-    'gr17': {'pop_size': 200, 'generations': 1000, 'mutation_rate': 0.15, 'elite_size': 20},
-    'gr21': {'pop_size': 200, 'generations': 1500, 'mutation_rate': 0.15, 'elite_size': 20},
-    'gr24': {'pop_size': 300, 'generations': 2000, 'mutation_rate': 0.20, 'elite_size': 30},
+    'gr17': {'pop_size': 200, 'generations': 1000, 'mutation_rate': 0.15, 'elite_size': 20,
+             'crossover': 'ox1'},
+    'gr21': {'pop_size': 200, 'generations': 1500, 'mutation_rate': 0.15, 'elite_size': 20,
+             'crossover': 'ox1'},
+    'gr24': {'pop_size': 300, 'generations': 2000, 'mutation_rate': 0.20, 'elite_size': 30,
+             'crossover': 'ox1'},
 }
 
 
-def run_instance(name, filepath):
+# Instancias por defecto: (nombre, ruta al archivo)
+# os.path.join crea rutas compatibles con Windows, Mac y Linux
+INSTANCES = [
+    ('gr17', os.path.join('data', 'gr17.tsp')),
+    ('gr21', os.path.join('data', 'gr21.tsp')),
+    ('gr24', os.path.join('data', 'gr24.tsp')),
+]
+
+
+# ─────────────────────────────────────────────
+# CACHÉ DE RESULTADOS DEL AG
+# ─────────────────────────────────────────────
+
+def solver_params(params, seed):
+    """
+    Conjunto COMPLETO de parámetros de una corrida del AG: los valores por
+    defecto de genetic_algorithm_iter, reemplazados por `params` y `seed`.
+    Así la clave de la caché cambia también si cambia un valor por defecto.
+    """
+    full = {
+        key: p.default
+        for key, p in inspect.signature(genetic_algorithm_iter).parameters.items()
+        if p.default is not inspect.Parameter.empty and key not in RESULT_NEUTRAL_PARAMS
+    }
+    full.update((key, value) for key, value in params.items()
+                if key not in RESULT_NEUTRAL_PARAMS)
+    full['seed'] = seed
+    return full
+
+
+def run_ga(dist_matrix, params, seed, verbose=True, profiler=None, checkpoint=None,
+           result_cache=None):
+    """
+    Ejecuta genetic_algorithm, o reutiliza el resultado de una corrida idéntica.
+
+    Parámetros:
+    - dist_matrix, params, seed: la corrida (params como en GA_PARAMS)
+    - verbose, profiler, checkpoint: se pasan a genetic_algorithm
+    - result_cache: (carpeta, tamaño máximo en bytes) de la caché de resultados,
+      o None para no usarla
+
+    Las corridas con time_limit (el resultado depende de la velocidad de la
+    máquina) o con profiler (hay que medir de verdad) nunca usan la caché.
+
+    Retorna: (ruta, costo, historia, tiempo, desde_cache). Si el resultado viene
+    de la caché, el tiempo es el de la corrida original.
+    """
+    use_cache = (result_cache is not None and profiler is None
+                 and params.get('time_limit') is None)
+    if use_cache:
+        cache_dir, max_bytes = result_cache
+        full_params = solver_params(params, seed)
+        key = result_key(dist_matrix, 'genetic_algorithm', full_params)
+        cached = load_result(key, cache_dir)
+        if cached is not None:
+            return cached['route'], cached['cost'], cached['history'], cached['elapsed'], True
+
+    route, cost, history, elapsed = genetic_algorithm(
+        dist_matrix, **params, seed=seed, verbose=verbose, profiler=profiler, **(checkpoint or {})
+    )
+    # **params "desempaqueta" el diccionario como argumentos nombrados
+    # Equivale a: genetic_algorithm(dist_matrix, pop_size=200, generations=1000, ..., seed=seed)
+
+    if use_cache:
+        save_result(key, {'route': route, 'cost': cost, 'history': history, 'elapsed': elapsed,
+                          'solver': 'genetic_algorithm', 'params': full_params},
+                    cache_dir, max_bytes)
+    return route, cost, history, elapsed, False
+
+
+def result_cache_options(args):
+    """(carpeta, bytes máximos) de la caché de resultados, o None con --no-result-cache."""
+    if args.no_result_cache:
+        return None
+    return args.cache_dir, int(args.result_cache_size * 1024 * 1024)
+
+
+def run_instance(name, filepath, seed=42, cache_dir=DEFAULT_CACHE_DIR, condensed=False,
+                 params=None, checkpoint=None, profile=False, history_format='npy', plotter=None,
+                 result_cache=None, lazy=False, decompose=None, cluster_size=500,
+                 multi_start=None):
     """
     Ejecuta el análisis completo para una instancia TSP.
 
     Parámetros:
     - name: nombre de la instancia ('gr17', 'gr21', 'gr24')
     - filepath: ruta al archivo .tsp
+    - seed: semilla del algoritmo genético
+    - cache_dir: carpeta de la caché de matrices (None = parsear siempre)
+    - condensed: guarda solo el triángulo superior de la matriz (mitad de memoria)
+    - params: parámetros del AG (por defecto GA_PARAMS[name], o los derivados
+      del tamaño si la instancia no está en GA_PARAMS; ver build_param_sets)
+    - checkpoint: opciones de checkpoint del AG (ver checkpoint_options)
+    - profile: mide el tiempo de cada fase del AG y lo exporta a output/profile_<name>.json/.csv
+    - history_format: formato de output/history_<name> ('npy' o 'csv')
+    - plotter: un ThreadPoolExecutor donde dibujar la gráfica de convergencia en
+      segundo plano (None = no se grafica)
+    - result_cache: (carpeta, bytes máximos) de la caché de resultados (ver run_ga)
+    - lazy: en instancias por coordenadas, distancias al vuelo en lugar de la matriz
+    - decompose: partición de decomposition_solver ('auto', 'kmeans', ...) para
+      resolver también por descomposición (None = no)
+    - cluster_size: ciudades por grupo con `decompose`
+    - multi_start: si no es None, muestra también el vecino más cercano desde
+      `multi_start` ciudades al azar y la ruta del vecino más cercano mejorada
+      con búsqueda local
     """
     print(f"\n{'='*60}")
     print(f"  INSTANCIA: {name}")
@@ -45,30 +194,53 @@ def run_instance(name, filepath):
 
     # ── 1. Parsear el archivo ──
     print(f"\n[1] Leyendo archivo: {filepath}")
-    dimension, dist_matrix = parse_tsp(filepath)
+    dimension, dist_matrix = load_distance_matrix(filepath, cache_dir, condensed=condensed,
+                                                  lazy=lazy)
     print(f"    Ciudades: {dimension}")
     print(f"    Matriz: {dist_matrix.shape[0]}x{dist_matrix.shape[1]}")
 
     # ── 2. Heurística del vecino más cercano ──
-    print(f"\n[2] Ejecutando Nearest Neighbor...")
+    print("\n[2] Ejecutando Nearest Neighbor...")
     nn_route, nn_cost, nn_time = nearest_neighbor(dist_matrix, start_city=0)
     print(f"    Costo: {nn_cost} | Tiempo: {nn_time:.4f}s")
     print(f"    Ruta: {nn_route}")
 
+    if multi_start is not None:
+        # Desde varias ciudades a la vez, quedándonos con la mejor ruta
+        starts = min(dimension, multi_start)
+        _, ms_cost, ms_time = multi_start_nearest_neighbor(dist_matrix, starts=starts, seed=seed)
+        print(f"    Multi-start ({starts} ciudades): {ms_cost} | Tiempo: {ms_time:.4f}s")
+
+        # Mejoramos la ruta del vecino más cercano con 2-opt + Or-opt
+        _, ls_cost = local_search(nn_route, dist_matrix)
+        print(f"    Con búsqueda local (2-opt + Or-opt): {ls_cost}")
+
+    if decompose is not None:
+        _, dc_cost, dc_time, dc_info = decomposition_solver(
+            dist_matrix, method=decompose, cluster_size=cluster_size, seed=seed, return_info=True
+        )
+        print(f"    Por descomposición ({decompose}, {dc_info['n_clusters']} grupos): {dc_cost} "
+              f"| Tiempo: {dc_time:.4f}s")
+
     # ── 3. Algoritmo Genético ──
-    print(f"\n[3] Ejecutando Algoritmo Genético...")
-    params = GA_PARAMS[name]
+    print("\n[3] Ejecutando Algoritmo Genético...")
+    if params is None:
+        params = GA_PARAMS.get(name) or default_params(dimension)
     print(f"    Parámetros: {params}")
 
-    ga_route, ga_cost, history, ga_time = genetic_algorithm(dist_matrix, **params)
-    # **params "desempaqueta" el diccionario como argumentos nombrados
-    # Equivale a: genetic_algorithm(dist_matrix, pop_size=200, generations=1000, ...)
+    profiler = Profiler() if profile else None
+    ga_route, ga_cost, history, ga_time, cached = run_ga(
+        dist_matrix, params, seed, profiler=profiler, checkpoint=checkpoint,
+        result_cache=result_cache
+    )
+    if cached:
+        print("    Resultado tomado de la caché (corrida idéntica ya ejecutada)")
 
     print(f"\n    Costo final AG: {ga_cost} | Tiempo: {ga_time:.3f}s")
     print(f"    Ruta: {ga_route}")
 
     # ── 4. Calcular eficiencia ──
-    optimal = KNOWN_OPTIMA.get(name, None)
+    optimal = KNOWN_OPTIMA.get(name)
     efficiency = None
     if optimal:
         # Fórmula de la paper: e = 1 - (Z - Z_T) / Z_T
@@ -76,13 +248,23 @@ def run_instance(name, filepath):
         print(f"\n    Optimo conocido: {optimal}")
         print(f"    Eficiencia: {efficiency:.4f}")
 
-    # ── 5. Graficar convergencia ──
+    # ── 5. Guardar (y opcionalmente graficar) la convergencia ──
     os.makedirs('output', exist_ok=True)  # Crea carpeta 'output' si no existe
-    plot_convergence(
-        history,
-        title=f"Convergencia AG - {name} ({dimension} ciudades)",
-        save_path=f"output/convergence_{name}.png"
-    )
+    save_history(history, f"output/history_{name}.{history_format}")
+    print(f"  Historia guardada en: output/history_{name}.{history_format}")
+    plot = None
+    if plotter is not None:
+        # La gráfica se dibuja en otro hilo mientras seguimos con la siguiente instancia
+        plot = plotter.submit(
+            plot_convergence,
+            history,
+            title=f"Convergencia AG - {name} ({dimension} ciudades)",
+            save_path=f"output/convergence_{name}.png"
+        )
+    if profiler is not None:
+        profiler.to_json(f"output/profile_{name}.json")
+        profiler.to_csv(f"output/profile_{name}.csv")
+        print(f"  Perfil guardado en: output/profile_{name}.json (.csv)")
 
     # Retornamos un diccionario con todos los resultados
     return {
@@ -92,41 +274,393 @@ def run_instance(name, filepath):
         'nn_cost': nn_cost,
         'ga_cost': ga_cost,
         'ga_time': ga_time,
-        'efficiency': efficiency
+        'efficiency': efficiency,
+        'profile': profiler.summary() if profiler is not None else None,
+        'cached': cached,
+        'plot': plot  # Future de la gráfica (o None)
+    }
+
+
+# ─────────────────────────────────────────────
+# MODO BATCH: muchas corridas en paralelo
+# ─────────────────────────────────────────────
+
+def run_job(name, filepath, params, seed, nn_cost, cache_dir=DEFAULT_CACHE_DIR, condensed=False,
+            checkpoint=None, profile=False, keep_history=False, result_cache=None, lazy=False,
+            history_format='npy'):
+    """
+    Ejecuta UNA corrida (instancia, parámetros, semilla) sin imprimir nada.
+    Se ejecuta dentro de un proceso del pool, por eso es una función de módulo.
+
+    `nn_cost` es el costo del vecino más cercano de la instancia: depende solo
+    de la instancia, así que run_batch lo calcula una vez y lo pasa a cada corrida.
+
+    La historia de convergencia se guarda siempre, como en run_instance, en
+    output/history_<instancia>-<hash de parámetros>-seed<semilla>.<history_format>.
+
+    Retorna un diccionario con los resultados de la corrida (con keep_history,
+    también su historia, para graficarla al final del batch).
+    """
+    # Con la caché, todos los procesos mapean el mismo .npy en vez de reparsear
+    dimension, dist_matrix = load_distance_matrix(filepath, cache_dir, condensed=condensed,
+                                                  lazy=lazy)
+
+    # Silenciamos el progreso del AG: con muchas corridas en paralelo sería ilegible
+    profiler = Profiler() if profile else None
+    _, ga_cost, history, ga_time, cached = run_ga(
+        dist_matrix, params, seed, verbose=False, profiler=profiler, checkpoint=checkpoint,
+        result_cache=result_cache
+    )
+
+    optimal = KNOWN_OPTIMA.get(name)
+    efficiency = 1 - (ga_cost - optimal) / optimal if optimal else None
+
+    os.makedirs('output', exist_ok=True)
+    history_path = f"output/history_{name}-{params_key(params)}-seed{seed}.{history_format}"
+    save_history(history, history_path)
+
+    return {
+        'instance': name,
+        'dimension': dimension,
+        'params': params,
+        'seed': seed,
+        'optimal': optimal or 'N/A',
+        'nn_cost': nn_cost,
+        'ga_cost': ga_cost,
+        'ga_time': ga_time,
+        'efficiency': efficiency,
+        'profile': profiler.summary() if profiler is not None else None,
+        'cached': cached,
+        'history_path': history_path,
+        'history': history if keep_history else None
+    }
+
+
+def base_params(name, filepath, profile=None):
+    """
+    Parámetros de partida de una instancia: los del perfil de ajuste (ver
+    src/tuning.py) si se pasó uno; si no, GA_PARAMS[name]; y si la instancia
+    no está en GA_PARAMS, los derivados de su número de ciudades.
+    """
+    if profile is None and name in GA_PARAMS:
+        return dict(GA_PARAMS[name])
+    return params_for(read_dimension(filepath), profile)
+
+
+def build_param_sets(name, args, filepath=None):
+    """
+    Construye la lista de conjuntos de parámetros para una instancia.
+
+    Se parte de base_params (GA_PARAMS[name], el perfil de --params-profile o
+    los valores por tamaño) y cada opción de la línea de comandos que tenga
+    varios valores (ej. --mutation-rate 0.1 0.2) se combina con las demás
+    (producto cartesiano). Sin opciones, hay un único conjunto: el de partida.
+    Fuera del modo batch se usa solo el primer conjunto.
+    """
+    base = base_params(name, filepath, args.params_profile)
+    grid = {
+        key: values
+        for key, values in [
+            ('pop_size', args.pop_size),
+            ('generations', args.generations),
+            ('mutation_rate', args.mutation_rate),
+            ('elite_size', args.elite_size),
+            ('tournament_size', args.tournament_size),
+            ('crossover', args.crossover),
+            ('initialization', args.init),
+            ('time_limit', args.time_limit),
+            ('stagnation', args.stagnation),
+            ('on_stagnation', args.on_stagnation),
+        ]
+        if values
     }
+    if args.stop_at_optimum and name in KNOWN_OPTIMA:
+        base['target_cost'] = KNOWN_OPTIMA[name]
+    if args.fitness_cache:
+        base['fitness_cache'] = args.fitness_cache
+    if args.deduplicate:
+        base['deduplicate'] = True
+    if args.adaptive:
+        base['adaptive'] = True
+    keys = list(grid)
+    param_sets = []
+    for combo in itertools.product(*(grid[k] for k in keys)):
+        params = dict(base)
+        params.update(zip(keys, combo, strict=True))
+        param_sets.append(params)
+    return param_sets
+
+
+def params_key(params):
+    """Hash corto de un conjunto de parámetros, para nombrar archivos de una combinación."""
+    return hashlib.sha1(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()[:10]
 
 
-def main():
+def checkpoint_options(name, params, seed, args):
     """
-    Función principal: ejecuta las tres instancias y muestra tabla comparativa.
+    Opciones de checkpoint para genetic_algorithm de una corrida, o None si no
+    se pidió --checkpoint-dir.
+
+    Cada corrida (instancia, parámetros, semilla) tiene su propio archivo; el
+    nombre lleva un hash de los parámetros para que dos combinaciones del modo
+    batch nunca compartan checkpoint.
     """
+    if args.checkpoint_dir is None:
+        return None
+    return {
+        'checkpoint_path': os.path.join(args.checkpoint_dir,
+                                        f"{name}-seed{seed}-{params_key(params)}.npz"),
+        'checkpoint_interval': args.checkpoint_interval,
+        'resume': args.resume,
+    }
+
+
+def aggregate_results(runs):
+    """
+    Agrupa las corridas por (instancia, parámetros) y calcula estadísticas
+    sobre las semillas: costo medio, mínimo y desviación estándar,
+    tiempo medio y eficiencia media. Los perfiles (--profile) se suman y las
+    historias (si las hay) se juntan como pares (semilla, historia).
+    """
+    groups = {}
+    for r in runs:
+        key = (r['instance'], tuple(sorted(r['params'].items())))
+        groups.setdefault(key, []).append(r)
+
+    summary = []
+    for (name, _), group in groups.items():
+        costs = [r['ga_cost'] for r in group]
+        effs = [r['efficiency'] for r in group if r['efficiency'] is not None]
+        summary.append({
+            'instance': name,
+            'params': group[0]['params'],
+            'runs': len(group),
+            'optimal': group[0]['optimal'],
+            'nn_cost': group[0]['nn_cost'],
+            'ga_cost': min(costs),
+            'ga_cost_mean': statistics.mean(costs),
+            'ga_cost_std': statistics.stdev(costs) if len(costs) > 1 else 0.0,
+            'ga_time': statistics.mean(r['ga_time'] for r in group),
+            'efficiency': statistics.mean(effs) if effs else None,
+            'profile': merge_summaries(r.get('profile') for r in group),
+            'histories': sorted((r['seed'], r['history']) for r in group
+                                if r.get('history') is not None),
+        })
+    summary.sort(key=lambda r: (r['instance'], sorted(r['params'].items())))
+    return summary
+
+
+def run_batch(instances, args):
+    """
+    Reparte todas las combinaciones (instancia, parámetros, semilla) en un pool
+    de procesos. Cada resultado se imprime en cuanto termina (no en orden).
+    """
+    cache_dir = None if args.no_matrix_cache else args.cache_dir
+    nn_costs = {}
+    for _, filepath in instances:
+        # Cargamos cada matriz UNA vez antes del pool: llena la caché y da el
+        # costo del vecino más cercano, que es el mismo para todas sus corridas
+        _, dist_matrix = load_distance_matrix(filepath, cache_dir, condensed=args.condensed,
+                                              lazy=args.lazy_distances)
+        nn_costs[filepath] = nearest_neighbor(dist_matrix, start_city=0)[1]
+
+    jobs = [
+        (name, filepath, params, seed, nn_costs[filepath], cache_dir, args.condensed,
+         checkpoint_options(name, params, seed, args), args.profile, args.plot,
+         result_cache_options(args), args.lazy_distances, args.history_format)
+        for name, filepath in instances
+        for params in build_param_sets(name, args, filepath)
+        for seed in args.seeds
+    ]
+    print(f"\n[BATCH] {len(jobs)} corridas en {args.workers or os.cpu_count()} procesos")
+
+    runs = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(run_job, *job) for job in jobs]
+        # as_completed entrega cada futuro apenas termina, en el orden en que terminan
+        for future in as_completed(futures):
+            r = future.result()
+            runs.append(r)
+            source = ' (caché)' if r['cached'] else ''
+            print(f"  [{len(runs)}/{len(jobs)}] {r['instance']} seed={r['seed']} "
+                  f"costo={r['ga_cost']} tiempo={r['ga_time']:.3f}s{source} params={r['params']}")
+
+    summary = aggregate_results(runs)
+    if args.plot:
+        # Las gráficas se dibujan al final y en este proceso: los del pool nunca importan matplotlib
+        os.makedirs('output', exist_ok=True)
+        for r in summary:
+            seeds, histories = zip(*r['histories'], strict=True)
+            plot_convergence_runs(
+                histories, [f"semilla {seed}" for seed in seeds],
+                title=f"Convergencia AG - {r['instance']} ({len(seeds)} semillas)",
+                save_path=f"output/convergence_{r['instance']}-{params_key(r['params'])}.png"
+            )
+    return summary
+
+
+def parse_args(argv=None):
+    """Define y lee las opciones de la línea de comandos."""
+    parser = argparse.ArgumentParser(
+        prog='tsp-ga',
+        description='TSP con Algoritmo Genético sobre instancias TSPLIB.'
+    )
+    parser.add_argument('--batch', action='store_true',
+                        help='ejecuta todas las combinaciones instancia/parámetros/semilla en paralelo')
+    parser.add_argument('--instances', nargs='+', metavar='NOMBRE',
+                        help='instancias a ejecutar: nombres de INSTANCES o rutas a archivos '
+                             '.tsp (por defecto: todas las de INSTANCES)')
+    parser.add_argument('--seeds', nargs='+', type=int, default=[42], metavar='SEMILLA',
+                        help='semillas del AG (modo batch)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='procesos del pool (por defecto: núcleos disponibles)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f'carpeta de caché (por defecto: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--no-matrix-cache', action='store_true',
+                        help='parsea siempre los .tsp en lugar de usar la caché de matrices')
+    parser.add_argument('--no-result-cache', action='store_true',
+                        help='ejecuta siempre el AG, sin leer ni guardar resultados en la caché')
+    parser.add_argument('--result-cache-size', type=float,
+                        default=DEFAULT_RESULT_CACHE_BYTES / (1024 * 1024), metavar='MB',
+                        help='tamaño máximo de la caché de resultados; al pasarlo se borran '
+                             'los usados hace más tiempo (por defecto: %(default).0f MB)')
+    parser.add_argument('--condensed', action='store_true',
+                        help='guarda solo el triángulo superior de cada matriz (mitad de memoria)')
+    parser.add_argument('--lazy-distances', action='store_true',
+                        help='instancias por coordenadas: calcula las distancias al vuelo, sin '
+                             'matriz n x n (para decenas de miles de ciudades)')
+    parser.add_argument('--decompose', nargs='?', const='auto', choices=PARTITION_METHODS,
+                        metavar='METODO',
+                        help='resuelve también partiendo las ciudades en grupos, en paralelo: '
+                             f'{", ".join(PARTITION_METHODS)} (por defecto: auto)')
+    parser.add_argument('--cluster-size', type=int, default=500, metavar='N',
+                        help='ciudades por grupo con --decompose (por defecto: 500)')
+    parser.add_argument('--multi-start', nargs='?', type=int, const=MULTI_START_STARTS,
+                        default=None, metavar='K',
+                        help='muestra también el vecino más cercano desde K ciudades al azar y '
+                             'con búsqueda local 2-opt + Or-opt '
+                             f'(por defecto: {MULTI_START_STARTS} ciudades)')
+    parser.add_argument('--pop-size', nargs='+', type=int, metavar='N')
+    parser.add_argument('--generations', nargs='+', type=int, metavar='N')
+    parser.add_argument('--mutation-rate', nargs='+', type=float, metavar='P')
+    parser.add_argument('--elite-size', nargs='+', type=int, metavar='N')
+    parser.add_argument('--tournament-size', nargs='+', type=int, metavar='N')
+    parser.add_argument('--crossover', nargs='+', choices=tuple(CROSSOVER_OPERATORS),
+                        metavar='CRUCE',
+                        help=f'operador de cruce del AG: {", ".join(CROSSOVER_OPERATORS)} '
+                             '(por defecto: el de GA_PARAMS)')
+    parser.add_argument('--init', nargs='+', choices=tuple(INIT_PRESETS), metavar='TIPO',
+                        help=f'población inicial del AG: {", ".join(INIT_PRESETS)} '
+                             '(por defecto: aleatoria)')
+    parser.add_argument('--time-limit', nargs='+', type=float, metavar='SEG',
+                        help='tiempo máximo de cada corrida del AG en segundos')
+    parser.add_argument('--stagnation', nargs='+', type=int, metavar='N',
+                        help='generaciones sin mejora antes de aplicar --on-stagnation')
+    parser.add_argument('--on-stagnation', nargs='+', choices=STAGNATION_ACTIONS, metavar='ACCION',
+                        help=f'qué hacer al estancarse: {", ".join(STAGNATION_ACTIONS)} '
+                             '(por defecto: stop)')
+    parser.add_argument('--fitness-cache', nargs='?', type=int, const=DEFAULT_FITNESS_CACHE_SIZE,
+                        default=None, metavar='RUTAS',
+                        help='memo de costos del AG: las rutas repetidas (o rotadas/invertidas) '
+                             f'no se vuelven a evaluar (por defecto: {DEFAULT_FITNESS_CACHE_SIZE} rutas)')
+    parser.add_argument('--deduplicate', action='store_true',
+                        help='perturba los hijos del AG que repiten una ruta de la población')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='ajusta la mutación y la presión del torneo durante la corrida '
+                             'según la diversidad y la mejora de la población')
+    parser.add_argument('--params-profile', type=load_profile, default=None, metavar='JSON',
+                        help='parámetros por clase de instancia escritos por src/tuning.py '
+                             '(reemplazan a GA_PARAMS)')
+    parser.add_argument('--checkpoint-dir', default=None,
+                        help='guarda checkpoints del AG en esta carpeta')
+    parser.add_argument('--checkpoint-interval', type=int, default=100, metavar='N',
+                        help='generaciones entre checkpoints (por defecto: 100)')
+    parser.add_argument('--resume', action='store_true',
+                        help='retoma cada corrida desde su checkpoint en --checkpoint-dir, si existe')
+    parser.add_argument('--profile', action='store_true',
+                        help='mide el tiempo de cada fase del AG y muestra un resumen')
+    parser.add_argument('--stop-at-optimum', action='store_true',
+                        help='detiene el AG al alcanzar el óptimo conocido de la instancia')
+    parser.add_argument('--plot', action='store_true',
+                        help='dibuja las gráficas de convergencia en output/ (necesita matplotlib); '
+                             'en modo batch se dibujan al final, una por instancia y parámetros')
+    parser.add_argument('--history-format', choices=HISTORY_FORMATS, default='npy',
+                        help='formato de la historia de convergencia en output/ (por defecto: npy)')
+    parser.add_argument('--backend', choices=BACKENDS, default=None,
+                        help='kernels de costo, cruce y vecino más cercano '
+                             f'(por defecto: {get_backend()}; ver src/backends.py)')
+    args = parser.parse_args(argv)
+    if args.plot and importlib.util.find_spec('matplotlib') is None:
+        parser.error("--plot necesita matplotlib (pip install matplotlib)")
+    if args.backend and args.backend not in available_backends():
+        parser.error(f"el backend {args.backend!r} no está instalado "
+                     f"(disponibles: {', '.join(available_backends())})")
+    return args
+
+
+def main(argv=None):
+    """
+    Función principal: ejecuta las instancias y muestra tabla comparativa.
+    Con --batch reparte muchas corridas en paralelo y muestra estadísticas.
+    """
+    args = parse_args(argv)
+    if args.backend:
+        set_backend(args.backend)
+        os.environ[BACKEND_ENV] = args.backend  # Lo heredan los procesos del modo batch
+
     print("\n" + "="*60)
     print("  TSP con Algoritmo Genetico - UNET Evaluacion #2")
+    print(f"  Backend de kernels: {get_backend()}")
     print("="*60)
 
     # Definimos las instancias a procesar
-    # os.path.join crea rutas compatibles con Windows, Mac y Linux
-    instances = [
-        ('gr17', os.path.join('data', 'gr17.tsp')),
-        ('gr21', os.path.join('data', 'gr21.tsp')),
-        ('gr24', os.path.join('data', 'gr24.tsp')),
-    ]
-
-    all_results = []
+    instances = INSTANCES
+    if args.instances:
+        known = dict(INSTANCES)
+        # Un nombre de INSTANCES o la ruta a un .tsp (data/kroA100.tsp se llama kroA100)
+        instances = [(item, known[item]) if item in known
+                     else (os.path.splitext(os.path.basename(item))[0], item)
+                     for item in args.instances]
 
+    available = []
     for name, filepath in instances:
         if not os.path.exists(filepath):
             print(f"\n[ADVERTENCIA] No se encontró: {filepath}")
             continue
+        available.append((name, filepath))
 
-        result = run_instance(name, filepath)
-        all_results.append(result)
+    if args.batch:
+        all_results = run_batch(available, args)
+    else:
+        all_results = []
+        # Un solo hilo para las gráficas: matplotlib se importa ahí, fuera del camino del AG
+        plotter = ThreadPoolExecutor(max_workers=1) if args.plot else None
+        for name, filepath in available:
+            cache_dir = None if args.no_matrix_cache else args.cache_dir
+            params = build_param_sets(name, args, filepath)[0]
+            result = run_instance(name, filepath, seed=args.seeds[0], cache_dir=cache_dir,
+                                  condensed=args.condensed, params=params,
+                                  checkpoint=checkpoint_options(name, params, args.seeds[0], args),
+                                  profile=args.profile, history_format=args.history_format,
+                                  plotter=plotter, result_cache=result_cache_options(args),
+                                  lazy=args.lazy_distances, decompose=args.decompose,
+                                  cluster_size=args.cluster_size,
+                                  multi_start=args.multi_start)
+            all_results.append(result)
+        if plotter is not None:
+            plotter.shutdown(wait=True)
+            for result in all_results:
+                result['plot'].result()  # Si una gráfica falló, el error aparece aquí
 
     # ── Tabla comparativa final ──
     print("\n\n>>> RESUMEN COMPARATIVO")
     print_results_table(all_results)
+    print_profile_table(all_results)
 
-    print("\n[OK] Proceso completado. Graficas guardadas en carpeta 'output/'")
+    if not args.batch or args.plot:
+        print("\n[OK] Proceso completado. Resultados guardados en carpeta 'output/'")
+    else:
+        print("\n[OK] Proceso completado.")
 
 
 # Este bloque garantiza que main() solo se ejecute cuando corremos este archivo directamente
@@ -0,0 +1,394 @@
+# backends.py
+# Núcleos (kernels) intercambiables para los bucles más calientes del proyecto
+#
+# IDEA:
+# - El costo de las rutas, el cruce OX1 y la construcción del vecino más cercano
+#   son bucles sobre ciudades. Hay tres formas de ejecutarlos:
+#   - 'numba':  bucles compilados a código nativo con Numba (si está instalado)
+#   - 'numpy':  operaciones vectorizadas sobre arreglos completos
+#   - 'python': bucles de Python puro (la versión de referencia, la más lenta)
+# - route_cost, order_crossover(_batch), evaluate_population_array y
+#   nearest_neighbor(_tours) llaman a estas funciones en lugar de hacer el
+#   trabajo ellas mismas, así cambiar de backend no toca el resto del código
+# - Al importar el módulo se elige 'numba' si está instalado y si no 'numpy'.
+#   La variable de entorno TSP_GA_BACKEND o set_backend() fuerzan otro (un valor
+#   inválido en TSP_GA_BACKEND solo produce un aviso)
+#
+# COMPILACIÓN PEREZOSA: elegir 'numba' no importa numba ni compila nada; eso
+# pasa en la primera llamada a un kernel (y una vez por tipo de matriz: int16,
+# int32, float64...). Con cache=True el código compilado se guarda en
+# __pycache__, así que las corridas siguientes (y los procesos del modo batch)
+# no vuelven a compilar.
+#
+# Los tres backends dan los mismos resultados. Numba no acepta una
+# CondensedDistanceMatrix: con ella sus kernels usan la versión numpy.
+
+import importlib.util
+import os
+import warnings
+
+import numpy as np
+
+# Backends en orden de preferencia
+BACKENDS = ('numba', 'numpy', 'python')
+
+# Variable de entorno para forzar un backend (ej. TSP_GA_BACKEND=python)
+BACKEND_ENV = 'TSP_GA_BACKEND'
+
+
+def _sum_dtype(dist_matrix):
+    """Tipo del resultado de numpy al sumar distancias (int16 → int64, float64 → float64)."""
+    return np.zeros(1, dtype=dist_matrix.dtype).sum().dtype
+
+
+# ─────────────────────────────────────────────
+# NUMPY (VECTORIZADO)
+# ─────────────────────────────────────────────
+
+def _numpy_tour_costs(routes, dist_matrix):
+    """
+    np.roll(routes, -1, axis=1) desplaza cada fila una posición a la izquierda,
+    así que en la columna i queda la ciudad siguiente a routes[:, i] (y la última
+    columna apunta de regreso a la primera). dist_matrix[R, R_siguiente] toma la
+    distancia de cada arista en un solo paso y .sum(axis=1) suma cada ruta.
+    """
+    next_cities = np.roll(routes, -1, axis=1)
+    return dist_matrix[routes, next_cities].sum(axis=1)
+
+
+def _numpy_order_crossover(population, parents, cuts):
+    """
+    Truco: si "rotamos" cada ruta para que empiece en cut2+1, el segmento
+    copiado del padre 1 queda al FINAL de la fila, y el relleno con el padre 2
+    ocupa el principio, en el mismo orden en que se recorre el padre 2.
+    Así ambas partes se copian con máscaras booleanas, sin bucles.
+    """
+    p1 = population[parents[:, 0]]
+    p2 = population[parents[:, 1]]
+    m, n = p1.shape
+    rows = np.arange(m)[:, None]
+
+    cut1 = cuts[:, :1]
+    cut2 = cuts[:, 1:]
+    order = (np.arange(n) + cut2 + 1) % n  # Posiciones en orden circular desde cut2+1
+    segment = np.arange(n) >= n - (cut2 - cut1 + 1)  # En la fila rotada, el segmento va al final
+
+    rot_p1 = p1[rows, order]
+    rot_p2 = p2[rows, order]
+
+    # in_segment[k, ciudad] = True si la ciudad ya está en el segmento del hijo k
+    in_segment = np.zeros((m, n), dtype=bool)
+    in_segment[np.nonzero(segment)[0], rot_p1[segment]] = True
+
+    # Cada fila tiene tantas ciudades del padre 2 por colocar como huecos libres,
+    # por eso las dos máscaras se alinean fila por fila al aplanarse
+    rot_child = rot_p1.copy()
+    rot_child[~segment] = rot_p2[~in_segment[rows, rot_p2]]
+
+    children = np.empty_like(p1)
+    children[rows, order] = rot_child  # Deshacemos la rotación
+    return children
+
+
+def penalty_dtype(dist_matrix):
+    """
+    Tipo float para las máscaras de ciudades visitadas: float32 alcanza (y es más
+    rápido) si las distancias son int16; si no, float64 para no perder precisión.
+    """
+    return np.float32 if dist_matrix.dtype.itemsize <= 2 else np.float64
+
+
+def _numpy_nearest_neighbor_tours(dist_matrix, starts):
+    """
+    Todas las rutas avanzan juntas: en cada paso se toman las filas de las
+    ciudades actuales como un bloque (len(starts), n), se les suma la matriz de
+    penalización (infinito en las visitadas) y un solo np.argmin por filas
+    elige el siguiente paso de todas.
+    """
+    n = len(dist_matrix)
+    m = len(starts)
+    routes = np.empty((m, n), dtype=np.int32)
+    penalty = np.zeros((m, n), dtype=penalty_dtype(dist_matrix))
+    block = np.empty_like(penalty)
+    rows = np.arange(m)
+
+    current = starts
+    routes[:, 0] = current
+    penalty[rows, current] = np.inf
+    for step in range(1, n):
+        np.add(dist_matrix[current], penalty, out=block)
+        current = np.argmin(block, axis=1)
+        routes[:, step] = current
+        penalty[rows, current] = np.inf
+    return routes
+
+
+# ─────────────────────────────────────────────
+# PYTHON PURO
+# ─────────────────────────────────────────────
+
+def _python_tour_costs(routes, dist_matrix):
+    """Suma arista por arista, con dist_matrix.item(a, b) (números de Python)."""
+    costs = []
+    for route in routes.tolist():
+        total = 0
+        for a, b in zip(route, route[1:] + route[:1], strict=True):
+            total += dist_matrix.item(a, b)
+        costs.append(total)
+    return np.array(costs, dtype=_sum_dtype(dist_matrix))
+
+
+def _python_order_crossover(population, parents, cuts):
+    """El algoritmo de order_crossover, hijo por hijo, con los cortes dados."""
+    n = population.shape[1]
+    children = []
+    for (a, b), (cut1, cut2) in zip(parents.tolist(), cuts.tolist(), strict=True):
+        parent1, parent2 = population[a].tolist(), population[b].tolist()
+        child = [None] * n
+        child[cut1:cut2 + 1] = parent1[cut1:cut2 + 1]
+        placed = set(child[cut1:cut2 + 1])
+        c_idx = (cut2 + 1) % n
+        # El padre 2 se recorre una vez, en orden circular desde cut2+1
+        for k in range(n):
+            city = parent2[(cut2 + 1 + k) % n]
+            if city not in placed:
+                child[c_idx] = city
+                placed.add(city)
+                c_idx = (c_idx + 1) % n
+        children.append(child)
+    return np.array(children, dtype=population.dtype).reshape(len(children), n)
+
+
+def _python_nearest_neighbor_tours(dist_matrix, starts):
+    """Una ruta a la vez: en cada paso se recorre la fila buscando la más cercana no visitada."""
+    n = len(dist_matrix)
+    routes = []
+    for start in starts.tolist():
+        visited = [False] * n
+        visited[start] = True
+        route = [start]
+        current = start
+        for _ in range(n - 1):
+            row = dist_matrix[current].tolist()
+            best_city, best_dist = -1, None
+            for city in range(n):
+                # Con empates gana el índice menor, igual que np.argmin
+                if not visited[city] and (best_city < 0 or row[city] < best_dist):
+                    best_city, best_dist = city, row[city]
+            route.append(best_city)
+            visited[best_city] = True
+            current = best_city
+        routes.append(route)
+    return np.array(routes, dtype=np.int32).reshape(len(routes), n)
+
+
+# ─────────────────────────────────────────────
+# NUMBA (COMPILADO, OPCIONAL)
+# ─────────────────────────────────────────────
+
+_numba_compiled = None  # Diccionario con los kernels compilados; se crea al primer uso
+
+
+def _numba_kernels():
+    """
+    Importa numba y define los kernels la primera vez que se necesitan.
+    njit compila cada uno en su primera llamada (para los tipos recibidos) y
+    cache=True guarda el resultado en disco.
+    """
+    global _numba_compiled
+    if _numba_compiled is not None:
+        return _numba_compiled
+
+    from numba import njit
+
+    @njit(cache=True)
+    def tour_costs(routes, dist_matrix, out):
+        m, n = routes.shape
+        for k in range(m):
+            total = out[k]
+            for i in range(n - 1):
+                total += dist_matrix[routes[k, i], routes[k, i + 1]]
+            out[k] = total + dist_matrix[routes[k, n - 1], routes[k, 0]]
+
+    @njit(cache=True)
+    def order_crossover(population, parents, cuts, children):
+        m = parents.shape[0]
+        n = population.shape[1]
+        # mark[ciudad] == k + 1 si la ciudad ya está en el hijo k (no hay que limpiarlo)
+        mark = np.zeros(n, dtype=np.int64)
+        for k in range(m):
+            a, b = parents[k, 0], parents[k, 1]
+            cut1, cut2 = cuts[k, 0], cuts[k, 1]
+            for i in range(cut1, cut2 + 1):
+                city = population[a, i]
+                children[k, i] = city
+                mark[city] = k + 1
+            pos = (cut2 + 1) % n
+            for i in range(n):
+                city = population[b, (cut2 + 1 + i) % n]
+                if mark[city] != k + 1:
+                    children[k, pos] = city
+                    pos = (pos + 1) % n
+
+    @njit(cache=True)
+    def nearest_neighbor_tours(dist_matrix, starts, routes):
+        m = starts.shape[0]
+        n = dist_matrix.shape[0]
+        visited = np.zeros(n, dtype=np.bool_)
+        for k in range(m):
+            visited[:] = False
+            current = starts[k]
+            routes[k, 0] = current
+            visited[current] = True
+            for step in range(1, n):
+                best_city = -1
+                best_dist = dist_matrix[current, 0]
+                for city in range(n):
+                    if not visited[city]:
+                        d = dist_matrix[current, city]
+                        if best_city < 0 or d < best_dist:
+                            best_city, best_dist = city, d
+                routes[k, step] = best_city
+                visited[best_city] = True
+                current = best_city
+
+    _numba_compiled = {
+        'tour_costs': tour_costs,
+        'order_crossover': order_crossover,
+        'nearest_neighbor_tours': nearest_neighbor_tours,
+    }
+    return _numba_compiled
+
+
+def _numba_tour_costs(routes, dist_matrix):
+    if not isinstance(dist_matrix, np.ndarray) or routes.shape[1] == 0:
+        return _numpy_tour_costs(routes, dist_matrix)
+    out = np.zeros(len(routes), dtype=_sum_dtype(dist_matrix))
+    _numba_kernels()['tour_costs'](routes, dist_matrix, out)
+    return out
+
+
+def _numba_order_crossover(population, parents, cuts):
+    children = np.empty((len(parents), population.shape[1]), dtype=population.dtype)
+    _numba_kernels()['order_crossover'](population, parents, cuts, children)
+    return children
+
+
+def _numba_nearest_neighbor_tours(dist_matrix, starts):
+    if not isinstance(dist_matrix, np.ndarray):
+        return _numpy_nearest_neighbor_tours(dist_matrix, starts)
+    routes = np.empty((len(starts), len(dist_matrix)), dtype=np.int32)
+    _numba_kernels()['nearest_neighbor_tours'](dist_matrix, starts, routes)
+    return routes
+
+
+# ─────────────────────────────────────────────
+# SELECCIÓN DEL BACKEND
+# ─────────────────────────────────────────────
+
+_KERNELS = {
+    'numba': {
+        'tour_costs': _numba_tour_costs,
+        'order_crossover': _numba_order_crossover,
+        'nearest_neighbor_tours': _numba_nearest_neighbor_tours,
+    },
+    'numpy': {
+        'tour_costs': _numpy_tour_costs,
+        'order_crossover': _numpy_order_crossover,
+        'nearest_neighbor_tours': _numpy_nearest_neighbor_tours,
+    },
+    'python': {
+        'tour_costs': _python_tour_costs,
+        'order_crossover': _python_order_crossover,
+        'nearest_neighbor_tours': _python_nearest_neighbor_tours,
+    },
+}
+
+_active = None  # Nombre del backend en uso
+
+
+def available_backends():
+    """Backends que se pueden usar en esta instalación, en orden de preferencia."""
+    # find_spec solo busca el paquete, no lo importa
+    return tuple(name for name in BACKENDS
+                 if name != 'numba' or importlib.util.find_spec('numba') is not None)
+
+
+def get_backend():
+    """Nombre del backend en uso ('numba', 'numpy' o 'python')."""
+    return _active
+
+
+def set_backend(name=None):
+    """
+    Cambia el backend de los kernels.
+
+    Parámetros:
+    - name: uno de BACKENDS, o None para el preferido entre los disponibles
+
+    Retorna: el nombre del backend anterior (para restaurarlo después).
+    """
+    global _active
+    available = available_backends()
+    if name is None:
+        name = available[0]
+    if name not in BACKENDS:
+        raise ValueError(f"Backend desconocido: {name!r} (opciones: {BACKENDS})")
+    if name not in available:
+        raise ValueError(f"El backend {name!r} no está disponible: falta instalar {name} "
+                         f"(disponibles: {available})")
+    previous, _active = _active, name
+    return previous
+
+
+# ─────────────────────────────────────────────
+# KERNELS
+# ─────────────────────────────────────────────
+
+def tour_costs(routes, dist_matrix):
+    """
+    Costo de cada ruta (fila) de `routes` (m, n), como ciclo cerrado.
+    Retorna: vector de m costos (int64 si las distancias son enteras).
+    """
+    return _KERNELS[_active]['tour_costs'](routes, dist_matrix)
+
+
+def order_crossover(population, parents, cuts):
+    """
+    Cruce OX1 en bloque (ver order_crossover_batch en genetic_algorithm.py).
+
+    Parámetros:
+    - population: arreglo (pop_size, n) con las rutas
+    - parents: arreglo (m, 2) con los índices [padre1, padre2] de cada hijo
+    - cuts: arreglo (m, 2) con los puntos de corte [cut1, cut2] (inclusive)
+
+    Retorna: arreglo (m, n) con los hijos.
+    """
+    return _KERNELS[_active]['order_crossover'](population, parents, cuts)
+
+
+def nearest_neighbor_tours(dist_matrix, starts):
+    """
+    Una ruta de vecino más cercano desde cada ciudad de `starts` (arreglo de enteros).
+    Con empates se elige la ciudad de índice menor.
+
+    Retorna: arreglo (len(starts), n) de tipo int32.
+    """
+    return _KERNELS[_active]['nearest_neighbor_tours'](dist_matrix, starts)
+
+
+
+def _init_backend():
+    """
+    Backend inicial: el de TSP_GA_BACKEND si se puede usar; si no (nombre
+    desconocido o paquete no instalado) se avisa y se usa el preferido. Un
+    valor inválido en el entorno no debe impedir importar el proyecto.
+    """
+    try:
+        set_backend(os.environ.get(BACKEND_ENV) or None)
+    except ValueError as exc:
+        warnings.warn(f"{BACKEND_ENV} ignorada: {exc}", RuntimeWarning, stacklevel=2)
+        set_backend(None)
+
+
+_init_backend()
@@ -0,0 +1,297 @@
+# cache.py
+# Caché en disco de las matrices de distancias ya parseadas
+#
+# IDEA:
+# - La primera vez que se lee un .tsp, guardamos la matriz resultante como archivo
+#   binario .npy (más un .json con los datos de la instancia y del archivo fuente)
+# - Las siguientes veces cargamos el .npy con np.load(mmap_mode='r'): el sistema
+#   operativo "mapea" el archivo en memoria y solo lee las páginas que se usan.
+#   Si varios procesos cargan la misma matriz, comparten esas páginas físicas.
+# - Si el .tsp cambia (tamaño, fecha de modificación o contenido), la entrada se
+#   invalida y se vuelve a parsear.
+#
+# CACHÉ DE RESULTADOS: el AG es determinista dada la matriz, los parámetros y la
+# semilla, así que repetir una corrida idéntica no aporta nada. save_result guarda
+# la mejor ruta, su costo y la historia en .tsp_cache/results/<clave>.npz, donde
+# la clave es un hash de la matriz, del nombre del solver y de TODOS sus
+# parámetros. Cada lectura "toca" el archivo (fecha de modificación = último uso)
+# y, si la carpeta pasa del tamaño máximo, se borran primero las entradas que
+# hace más tiempo no se usan (LRU).
+
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from src.distances import CondensedDistanceMatrix, CoordinateDistanceMatrix
+from src.parser import instance_matrix, read_tsplib
+
+DEFAULT_CACHE_DIR = '.tsp_cache'
+
+# Versión del formato de la caché: si cambia, las entradas viejas se regeneran
+CACHE_VERSION = 2
+
+# Versión del formato de los resultados guardados (y de la clave)
+RESULT_CACHE_VERSION = 1
+
+# Tamaño máximo por defecto de .tsp_cache/results/ (en bytes)
+DEFAULT_RESULT_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def file_sha256(filepath, block_size=1 << 20):
+    """Calcula el hash SHA-256 del archivo leyéndolo por bloques de 1 MB."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_paths(filepath, cache_dir, condensed=False):
+    """
+    Rutas (.npy, .json) de la entrada de caché de un archivo .tsp.
+    El nombre incluye un hash de la ruta absoluta para no mezclar dos archivos
+    con el mismo nombre en carpetas distintas; la versión condensada de la
+    matriz es una entrada aparte.
+    """
+    abspath = os.path.abspath(filepath)
+    stem = os.path.splitext(os.path.basename(abspath))[0]
+    key = hashlib.sha1(abspath.encode('utf-8')).hexdigest()[:12]
+    layout = '-condensed' if condensed else ''
+    base = os.path.join(cache_dir, 'matrices', f"{stem}-{key}{layout}")
+    return base + '.npy', base + '.json'
+
+
+def _is_valid(meta, filepath, stat):
+    """
+    ¿La entrada de caché corresponde al archivo actual?
+
+    Si tamaño y fecha de modificación coinciden, la damos por buena sin leer el
+    archivo. Si solo cambió la fecha (ej. se copió el archivo), comparamos el hash.
+    """
+    if meta.get('version') != CACHE_VERSION or meta.get('size') != stat.st_size:
+        return False
+    if meta.get('mtime_ns') == stat.st_mtime_ns:
+        return True
+    return meta.get('sha256') == file_sha256(filepath)
+
+
+def atomic_write(path, write):
+    """Escribe en un archivo temporal y lo renombra: nunca queda un archivo a medias."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def _write_meta(meta_path, meta):
+    """Guarda los metadatos de una entrada como JSON legible."""
+    atomic_write(meta_path, lambda f: f.write(json.dumps(meta, indent=2).encode('utf-8')))
+
+
+def load_distance_matrix(filepath, cache_dir=DEFAULT_CACHE_DIR, mmap=True, refresh=False,
+                         condensed=False, lazy=False):
+    """
+    Devuelve (dimension, dist_matrix) de un .tsp, usando la caché si es válida.
+
+    Parámetros:
+    - filepath: ruta al archivo .tsp
+    - cache_dir: carpeta de la caché (None = sin caché, equivale a parse_tsp)
+    - mmap: si es True la matriz se carga mapeada en memoria y es de SOLO LECTURA
+    - refresh: fuerza a volver a parsear y reescribir la entrada
+    - condensed: devuelve una CondensedDistanceMatrix (solo el triángulo superior)
+    - lazy: con una instancia por coordenadas devuelve una CoordinateDistanceMatrix
+      (distancias al vuelo); no hay matriz que guardar, así que no usa la caché
+
+    La primera llamada parsea el archivo y guarda la entrada; las siguientes
+    solo abren el .npy.
+    """
+    if cache_dir is None or lazy:
+        instance = read_tsplib(filepath)
+        if cache_dir is None or instance['edge_weight_type'] != 'EXPLICIT':
+            return instance['dimension'], instance_matrix(instance, condensed, lazy)
+
+    npy_path, meta_path = cache_paths(filepath, cache_dir, condensed)
+    stat = os.stat(filepath)
+
+    if not refresh and os.path.exists(npy_path) and os.path.exists(meta_path):
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if _is_valid(meta, filepath, stat):
+            if meta['mtime_ns'] != stat.st_mtime_ns:
+                # Mismo contenido con otra fecha: actualizamos para no volver a calcular el hash
+                meta['mtime_ns'] = stat.st_mtime_ns
+                _write_meta(meta_path, meta)
+            data = np.load(npy_path, mmap_mode='r' if mmap else None)
+            return meta['dimension'], _wrap(data, meta['dimension'], condensed)
+
+    # ── Entrada ausente o inválida: parseamos y guardamos ──
+    instance = read_tsplib(filepath)
+    dist_matrix = instance_matrix(instance, condensed)
+    data = dist_matrix.data if condensed else dist_matrix
+
+    os.makedirs(os.path.dirname(npy_path), exist_ok=True)
+    atomic_write(npy_path, lambda f: np.save(f, data))
+    meta = {
+        'version': CACHE_VERSION,
+        'source': os.path.abspath(filepath),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': file_sha256(filepath),
+        'name': instance['name'],
+        'dimension': instance['dimension'],
+        'edge_weight_type': instance['edge_weight_type'],
+        'edge_weight_format': instance['edge_weight_format'],
+        'layout': 'condensed' if condensed else 'dense',
+        'dtype': data.dtype.str,
+        'shape': list(data.shape),
+    }
+    _write_meta(meta_path, meta)
+
+    if mmap:
+        dist_matrix = _wrap(np.load(npy_path, mmap_mode='r'), instance['dimension'], condensed)
+    return instance['dimension'], dist_matrix
+
+
+def _wrap(data, dimension, condensed):
+    """Convierte el arreglo guardado en la matriz que espera quien llama."""
+    return CondensedDistanceMatrix(data, dimension) if condensed else data
+
+
+# ─────────────────────────────────────────────
+# CACHÉ DE RESULTADOS
+# ─────────────────────────────────────────────
+
+def matrix_digest(dist_matrix):
+    """
+    Hash SHA-256 de una matriz de distancias (densa, CondensedDistanceMatrix o
+    CoordinateDistanceMatrix). Incluye la forma, el tipo y el formato: la misma
+    instancia guardada como int16 o condensada da otra clave. De una matriz
+    por coordenadas se usan las coordenadas y la fórmula.
+    """
+    if isinstance(dist_matrix, CoordinateDistanceMatrix):
+        layout = f"coords-{dist_matrix.edge_weight_type}-{dist_matrix.dtype.str}"
+        data = dist_matrix.coords
+    elif isinstance(dist_matrix, CondensedDistanceMatrix):
+        layout, data = 'condensed', dist_matrix.data
+    else:
+        layout, data = 'dense', dist_matrix
+    data = np.ascontiguousarray(data)
+    digest = hashlib.sha256()
+    header = [layout, data.dtype.str, list(dist_matrix.shape)]
+    digest.update(json.dumps(header).encode('utf-8'))
+    digest.update(memoryview(data).cast('B'))  # Sin copiar (también sirve con mmap)
+    return digest.hexdigest()
+
+
+def result_key(dist_matrix, solver, params):
+    """
+    Clave de un resultado: hash de la matriz, del nombre del solver y de sus
+    parámetros (un diccionario que pueda pasarse a JSON; el orden no importa).
+    """
+    payload = json.dumps({
+        'version': RESULT_CACHE_VERSION,
+        'matrix': matrix_digest(dist_matrix),
+        'solver': solver,
+        'params': params,
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def result_path(key, cache_dir=DEFAULT_CACHE_DIR):
+    """Ruta del archivo .npz de un resultado."""
+    return os.path.join(cache_dir, 'results', f"{key}.npz")
+
+
+def load_result(key, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Lee el resultado guardado con la clave `key`.
+
+    Retorna: diccionario con 'route', 'cost', 'history', 'elapsed' (el tiempo de
+    la corrida original), 'solver' y 'params'; o None si no existe (o es de
+    otra versión o está dañado).
+    """
+    path = result_path(key, cache_dir)
+    try:
+        with np.load(path) as data:
+            meta = json.loads(data['meta'].item())
+            route = data['route'].tolist()
+            history = data['history'].tolist()
+        os.utime(path)  # Último uso = ahora (orden de la expulsión LRU)
+    except (OSError, KeyError, ValueError):
+        # Ausente, borrado por otro proceso a mitad de la lectura o dañado
+        return None
+    if meta.get('version') != RESULT_CACHE_VERSION:
+        return None
+    return {
+        'route': route,
+        'cost': meta['cost'],
+        'history': history,
+        'elapsed': meta['elapsed'],
+        'solver': meta['solver'],
+        'params': meta['params'],
+    }
+
+
+def save_result(key, result, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_RESULT_CACHE_BYTES):
+    """
+    Guarda un resultado y aplica el límite de tamaño (ver evict_results).
+
+    Parámetros:
+    - key: clave de result_key
+    - result: diccionario con 'route', 'cost', 'history' y 'elapsed'; opcionalmente
+      'solver' y 'params' (solo informativos, para inspeccionar la caché)
+    - cache_dir: carpeta de la caché
+    - max_bytes: tamaño máximo de la carpeta de resultados
+    """
+    cost = result['cost']
+    meta = {
+        'version': RESULT_CACHE_VERSION,
+        'cost': cost.item() if isinstance(cost, np.generic) else cost,
+        'elapsed': result['elapsed'],
+        'solver': result.get('solver'),
+        'params': result.get('params'),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    arrays = {
+        'route': np.asarray(result['route'], dtype=np.int32),
+        'history': np.asarray(result['history']),
+        'meta': np.array(json.dumps(meta, default=str)),
+    }
+    path = result_path(key, cache_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write(path, lambda f: np.savez_compressed(f, **arrays))
+    evict_results(cache_dir, max_bytes)
+
+
+def evict_results(cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_RESULT_CACHE_BYTES):
+    """
+    Borra los resultados usados hace más tiempo hasta que la carpeta ocupe a lo
+    sumo `max_bytes`. Retorna cuántas entradas se borraron.
+    """
+    directory = os.path.join(cache_dir, 'results')
+    entries = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.name.endswith('.npz'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:  # Otro proceso la borró
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+    # De la más reciente a la más vieja: se conservan mientras quepan
+    entries.sort(reverse=True)
+    total = 0
+    removed = 0
+    for _, size, path in entries:
+        total += size
+        if total > max_bytes:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
@@ -0,0 +1,101 @@
+# checkpoint.py
+# Puntos de control (checkpoints) del algoritmo genético
+#
+# IDEA:
+# - Cada cierto número de generaciones se guarda TODO lo necesario para seguir:
+#   población, costos, mejor ruta, historia, contadores y el estado del
+#   generador de numpy del AG
+# - Si el proceso muere (ej. un nodo interrumpible), genetic_algorithm(..., resume=True)
+#   retoma desde el último checkpoint y produce exactamente el mismo resultado
+#   que una corrida sin interrupciones
+#
+# FORMATO: un único archivo .npz (binario de numpy) con los arreglos, más un
+# texto JSON con los escalares y el estado del generador.
+# Se escribe en un archivo temporal que luego se renombra: si el proceso muere
+# a mitad de la escritura, el checkpoint anterior sigue intacto.
+
+import json
+import os
+
+import numpy as np
+
+from src.cache import atomic_write
+
+# Versión del formato: un checkpoint de otra versión no se puede retomar
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(path, state):
+    """
+    Guarda el estado del AG en `path` (.npz) de forma atómica.
+
+    `state` es un diccionario con:
+    - 'population', 'costs': arreglos de la generación actual
+    - 'best_route', 'best_cost', 'history': lo mejor encontrado hasta ahora
+    - 'generation': índice de la próxima generación a ejecutar
+    - 'last_improvement', 'restarts', 'elapsed': contadores del control de parada
+    - 'rng': el generador de numpy del AG
+    - 'controller': estado del control adaptativo (opcional; ver AdaptiveController)
+
+    El estado global del módulo `random` no se guarda: el AG no lo usa, y
+    restaurarlo pisaría el de quien llama.
+    """
+    meta = {
+        'version': CHECKPOINT_VERSION,
+        'generation': state['generation'],
+        'best_cost': state['best_cost'],
+        'last_improvement': state['last_improvement'],
+        'restarts': state['restarts'],
+        'elapsed': state['elapsed'],
+        'controller': state.get('controller'),
+        # El estado de PCG64 son enteros de Python: JSON los guarda exactos
+        'numpy_rng': state['rng'].bit_generator.state,
+    }
+    best_route = state['best_route']
+    arrays = {
+        'population': state['population'],
+        'costs': state['costs'],
+        'best_route': np.asarray(best_route if best_route is not None else [], dtype=np.int32),
+        'history': np.asarray(state['history']),
+        'meta': np.array(json.dumps(meta)),
+    }
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    atomic_write(path, lambda f: np.savez_compressed(f, **arrays))
+
+
+def load_checkpoint(path):
+    """
+    Lee un checkpoint escrito por save_checkpoint.
+
+    Devuelve el diccionario `state` con un generador de numpy nuevo en el
+    mismo estado que el guardado.
+    """
+    with np.load(path) as data:
+        meta = json.loads(data['meta'].item())
+        if meta.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Checkpoint con versión {meta.get('version')!r}; "
+                             f"se esperaba {CHECKPOINT_VERSION}: {path}")
+        population = data['population']
+        costs = data['costs']
+        best_route = data['best_route'].tolist() or None
+        history = data['history']
+
+    rng = np.random.default_rng()
+    rng.bit_generator.state = meta['numpy_rng']
+
+    return {
+        'population': population,
+        'costs': costs,
+        'best_route': best_route,
+        'best_cost': meta['best_cost'],
+        'history': history.tolist(),  # Números de Python, como los de la corrida original
+        'generation': meta['generation'],
+        'last_improvement': meta['last_improvement'],
+        'restarts': meta['restarts'],
+        'elapsed': meta['elapsed'],
+        'controller': meta.get('controller'),
+        'rng': rng,
+    }
@@ -0,0 +1,462 @@
+# decomposition.py
+# Solver jerárquico para instancias grandes: dividir, resolver en paralelo y unir
+#
+# IDEA:
+# - Con miles de ciudades, UNA población del AG sobre todas ellas escala mal:
+#   cada generación cuesta más y hacen falta muchas más generaciones
+# - En lugar de eso partimos las ciudades en grupos (clusters) de unos cientos,
+#   resolvemos cada grupo por separado (vecino más cercano + búsqueda local, o el
+#   AG) en un pool de procesos, y unimos las sub-rutas en una sola ruta
+# - Al final, una búsqueda local que empieza solo en las ciudades de la
+#   "frontera" entre grupos arregla las costuras
+#
+# PARTICIONES:
+# - 'kmeans':  k-means sobre las coordenadas (grupos compactos)
+# - 'hilbert': orden de la curva de Hilbert, cortado en tramos del mismo tamaño
+#              (grupos del mismo tamaño, muy barato)
+# - 'spectral': clustering espectral sobre la matriz de distancias (para
+#              instancias con matriz explícita, sin coordenadas; O(n³))
+#
+# El trabajo de cada grupo es independiente, así que el tiempo escala casi
+# linealmente con el número de ciudades y se reparte entre los núcleos.
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.distances import CoordinateDistanceMatrix, as_distance_matrix
+from src.genetic_algorithm import genetic_algorithm
+from src.local_search import build_neighbor_lists, local_search
+from src.nearest_neighbor import nearest_neighbor, route_cost
+
+# Particiones soportadas ('auto' = kmeans con coordenadas, spectral sin ellas)
+PARTITION_METHODS = ('auto', 'kmeans', 'hilbert', 'spectral')
+
+# Solvers para cada grupo
+CLUSTER_SOLVERS = ('nn', 'ga')
+
+# Cuántos grupos vecinos (por centroide) aportan candidatos a las listas de vecinos
+NEAR_CLUSTERS = 4
+
+# Filas por bloque al asignar puntos a centros en k-means (limita la memoria)
+KMEANS_BLOCK = 8192
+
+
+# ─────────────────────────────────────────────
+# PARTICIÓN DE LAS CIUDADES
+# ─────────────────────────────────────────────
+
+def _nearest_center(points, centers):
+    """Índice del centro más cercano a cada punto (por bloques de filas)."""
+    labels = np.empty(len(points), dtype=np.int64)
+    center_sq = (centers * centers).sum(axis=1)
+    for start in range(0, len(points), KMEANS_BLOCK):
+        block = points[start:start + KMEANS_BLOCK]
+        # |p - c|² = |p|² - 2 p·c + |c|²; |p|² no cambia el argmin
+        labels[start:start + len(block)] = np.argmin(center_sq - 2.0 * block @ centers.T, axis=1)
+    return labels
+
+
+def kmeans(points, k, rng, iterations=25):
+    """
+    k-means (algoritmo de Lloyd con inicialización k-means++) sobre `points` (n, d).
+
+    Retorna: arreglo (n,) con el grupo de cada punto, numerado 0..k'-1
+    (k' < k si algún grupo quedó vacío).
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    k = max(1, min(k, n))
+
+    # k-means++: cada centro nuevo se elige con probabilidad proporcional a la
+    # distancia² al centro más cercano ya elegido (centros bien repartidos)
+    centers = np.empty((k, points.shape[1]))
+    centers[0] = points[rng.integers(n)]
+    closest = ((points - centers[0]) ** 2).sum(axis=1)
+    for c in range(1, k):
+        total = closest.sum()
+        idx = rng.choice(n, p=closest / total) if total > 0 else rng.integers(n)
+        centers[c] = points[idx]
+        np.minimum(closest, ((points - centers[c]) ** 2).sum(axis=1), out=closest)
+
+    labels = None
+    for _ in range(iterations):
+        new_labels = _nearest_center(points, centers)
+        if labels is not None and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        counts = np.bincount(labels, minlength=k)
+        filled = counts > 0  # Un grupo vacío conserva su centro anterior
+        for dim in range(points.shape[1]):
+            sums = np.bincount(labels, weights=points[:, dim], minlength=k)
+            centers[filled, dim] = sums[filled] / counts[filled]
+
+    _, labels = np.unique(labels, return_inverse=True)  # Sin huecos en la numeración
+    return labels
+
+
+def hilbert_index(coords, order=16):
+    """
+    Posición de cada punto (n, 2) sobre una curva de Hilbert de 2^order x 2^order
+    celdas que cubre el rectángulo de las coordenadas. Puntos cercanos en el plano
+    suelen quedar cerca en la curva.
+    """
+    pts = np.asarray(coords, dtype=float)
+    side = 1 << order
+    low = pts.min(axis=0)
+    span = max(float((pts.max(axis=0) - low).max()), 1e-12)
+    cells = np.minimum(((pts - low) / span * side).astype(np.int64), side - 1)
+    x, y = cells[:, 0], cells[:, 1]
+
+    d = np.zeros(len(pts), dtype=np.int64)
+    s = side >> 1
+    while s > 0:
+        rx = ((x & s) > 0).astype(np.int64)
+        ry = ((y & s) > 0).astype(np.int64)
+        d += s * s * ((3 * rx) ^ ry)
+        # Rotamos el cuadrante para que la curva siga conectada
+        turn = ry == 0
+        flip = turn & (rx == 1)
+        x = np.where(flip, side - 1 - x, x)
+        y = np.where(flip, side - 1 - y, y)
+        x, y = np.where(turn, y, x), np.where(turn, x, y)
+        s >>= 1
+    return d
+
+
+def spectral_labels(dist_matrix, k, rng, scale_k=7):
+    """
+    Clustering espectral sobre la matriz de distancias: afinidad gaussiana
+    exp(-(d/sigma)²), con sigma = mediana de la distancia al `scale_k`-ésimo
+    vecino, y k-means sobre los k vectores propios principales del laplaciano
+    normalizado. Construye la matriz densa n x n: solo para instancias moderadas.
+    """
+    dense = np.asarray(dist_matrix, dtype=float)
+    n = len(dense)
+    k = max(1, min(k, n))
+    if k == 1:
+        return np.zeros(n, dtype=np.int64)
+
+    off = dense + np.diag(np.full(n, np.inf))
+    kth = np.partition(off, min(scale_k, n - 1) - 1, axis=1)[:, min(scale_k, n - 1) - 1]
+    sigma = float(np.median(kth)) or 1.0
+
+    affinity = np.exp(-(dense / sigma) ** 2)
+    np.fill_diagonal(affinity, 0.0)
+    degree = np.sqrt(np.maximum(affinity.sum(axis=1), 1e-12))
+    normalized = affinity / degree[:, None] / degree[None, :]
+    _, vectors = np.linalg.eigh(normalized)  # Valores propios en orden ascendente
+    embedding = vectors[:, -k:]
+    embedding /= np.maximum(np.linalg.norm(embedding, axis=1, keepdims=True), 1e-12)
+    return kmeans(embedding, k, rng)
+
+
+def partition_cities(dist_matrix, n_clusters, method='auto', coords=None, seed=42):
+    """
+    Asigna cada ciudad a uno de `n_clusters` grupos.
+
+    Parámetros:
+    - dist_matrix: matriz de distancias (se usa con method='spectral')
+    - method: uno de PARTITION_METHODS; 'kmeans' y 'hilbert' necesitan coordenadas
+    - coords: coordenadas (n, 2); si faltan se toman de una CoordinateDistanceMatrix
+
+    Retorna: arreglo (n,) con el grupo de cada ciudad, numerado 0..k-1.
+    """
+    if method not in PARTITION_METHODS:
+        raise ValueError(f"Partición desconocida: {method!r} (opciones: {PARTITION_METHODS})")
+    if coords is None and isinstance(dist_matrix, CoordinateDistanceMatrix):
+        coords = dist_matrix.coords
+    if method == 'auto':
+        method = 'spectral' if coords is None else 'kmeans'
+    if method != 'spectral' and coords is None:
+        raise ValueError(f"La partición {method!r} necesita las coordenadas de las ciudades")
+
+    rng = np.random.default_rng(seed)
+    n = len(dist_matrix)
+    n_clusters = max(1, min(n_clusters, n))
+    if method == 'kmeans':
+        return kmeans(coords, n_clusters, rng)
+    if method == 'hilbert':
+        # Tramos consecutivos de la curva, todos del mismo tamaño (±1)
+        labels = np.empty(n, dtype=np.int64)
+        order = np.argsort(hilbert_index(coords), kind='stable')
+        for c, chunk in enumerate(np.array_split(order, n_clusters)):
+            labels[chunk] = c
+        return labels
+    return spectral_labels(dist_matrix, n_clusters, rng)
+
+
+def cluster_members(labels):
+    """Lista con las ciudades de cada grupo (arreglos de índices, en orden creciente)."""
+    order = np.argsort(labels, kind='stable')
+    counts = np.bincount(labels)
+    return np.split(order, np.cumsum(counts)[:-1])
+
+
+# ─────────────────────────────────────────────
+# RESOLVER CADA GRUPO (en los procesos del pool)
+# ─────────────────────────────────────────────
+
+def submatrix(dist_matrix, cities):
+    """
+    Matriz de distancias entre las ciudades `cities`. De una
+    CoordinateDistanceMatrix se devuelve otra (pequeña) sobre sus coordenadas:
+    así al proceso trabajador viajan m coordenadas y no m² distancias.
+    """
+    if isinstance(dist_matrix, CoordinateDistanceMatrix):
+        return CoordinateDistanceMatrix(dist_matrix.coords[cities], dist_matrix.edge_weight_type,
+                                        dtype=dist_matrix.dtype)
+    return dist_matrix[cities[:, None], cities[None, :]]
+
+
+def _solve_cluster(sub_matrix, solver, params, seed):
+    """
+    Tarea del pool: ruta cíclica sobre un grupo (índices locales 0..m-1).
+    - 'nn': vecino más cercano mejorado con 2-opt + Or-opt
+    - 'ga': genetic_algorithm con `params`
+    """
+    sub_matrix = np.asarray(sub_matrix)  # Densa: el grupo es pequeño
+    m = len(sub_matrix)
+    if m <= 3:
+        return list(range(m))  # Con 3 ciudades o menos toda ruta cuesta lo mismo
+    if solver == 'ga':
+        route, _, _, _ = genetic_algorithm(sub_matrix, verbose=False, seed=seed, **params)
+        return route
+    route, _, _ = nearest_neighbor(sub_matrix, start_city=0)
+    route, _ = local_search(route, sub_matrix)
+    return route
+
+
+# ─────────────────────────────────────────────
+# ORDEN DE LOS GRUPOS Y UNIÓN DE LAS SUB-RUTAS
+# ─────────────────────────────────────────────
+
+def _centroids(coords, members):
+    return np.array([coords[cities].mean(axis=0) for cities in members])
+
+
+def _cluster_distances(dist_matrix, members, coords):
+    """
+    Distancias entre grupos: entre centroides si hay coordenadas; si no, la
+    menor distancia entre una ciudad de cada grupo (recorre la matriz completa).
+    """
+    if coords is not None:
+        centers = _centroids(coords, members)
+        diff = centers[:, None, :] - centers[None, :, :]
+        return np.sqrt((diff * diff).sum(axis=-1))
+
+    k = len(members)
+    labels = np.empty(len(dist_matrix), dtype=np.int64)
+    for c, cities in enumerate(members):
+        labels[cities] = c
+    order = np.argsort(labels, kind='stable')
+    starts = np.concatenate(([0], np.cumsum([len(c) for c in members])[:-1]))
+    linkage = np.empty((k, k))
+    for c, cities in enumerate(members):
+        closest = np.asarray(dist_matrix[cities], dtype=float).min(axis=0)  # (n,)
+        linkage[c] = np.minimum.reduceat(closest[order], starts)
+    np.fill_diagonal(linkage, 0.0)
+    return linkage
+
+
+def cluster_order(cluster_dist):
+    """Orden de visita de los grupos: una ruta TSP (vecino más cercano + 2-opt) entre ellos."""
+    k = len(cluster_dist)
+    if k <= 3:
+        return list(range(k))
+    route, _, _ = nearest_neighbor(cluster_dist, start_city=0)
+    route, _ = local_search(route, cluster_dist, k=min(10, k - 1))
+    return route
+
+
+def _best_break(tour, dist_matrix, prev_city=None, next_city=None):
+    """
+    Elige por qué arista (T[j], T[j+1]) abrir la sub-ruta cíclica T para
+    recorrerla como un camino entre `prev_city` y `next_city` (cualquiera puede
+    faltar). Prueba todas las aristas y los dos sentidos a la vez:
+    - adelante:  T[j+1] → ... → T[j]
+    - al revés:  T[j]   → ... → T[j+1]
+
+    Retorna: el camino (arreglo de ciudades) de menor costo de conexión.
+    """
+    if len(tour) == 1:
+        return tour
+    nxt = np.roll(tour, -1)
+    cost_fwd = -np.asarray(dist_matrix[tour, nxt], dtype=float)  # La arista que se quita
+    cost_rev = cost_fwd.copy()
+    if prev_city is not None:
+        cost_fwd += dist_matrix[prev_city, nxt]
+        cost_rev += dist_matrix[prev_city, tour]
+    if next_city is not None:
+        cost_fwd += dist_matrix[tour, next_city]
+        cost_rev += dist_matrix[nxt, next_city]
+
+    j_fwd, j_rev = int(np.argmin(cost_fwd)), int(np.argmin(cost_rev))
+    forward = np.roll(tour, -(j_fwd + 1))
+    if cost_fwd[j_fwd] <= cost_rev[j_rev]:
+        return forward
+    return np.roll(tour, -(j_rev + 1))[::-1]
+
+
+def stitch_tours(tours, dist_matrix):
+    """
+    Une sub-rutas cíclicas (ya en orden de visita) en una sola ruta.
+
+    1. Pasada voraz: cada grupo se abre por la arista que mejor conecta con la
+       salida del grupo anterior
+    2. Pasada de ajuste: con las salidas y entradas vecinas ya fijas, cada grupo
+       vuelve a elegir su arista mirando a los dos lados
+
+    Retorna: la ruta completa (arreglo de ciudades).
+    """
+    paths = []
+    for tour in tours:
+        prev_city = paths[-1][-1] if paths else None
+        paths.append(_best_break(np.asarray(tour), dist_matrix, prev_city))
+
+    k = len(paths)
+    if k > 1:
+        for t in range(k):
+            prev_city = paths[t - 1][-1]
+            next_city = paths[(t + 1) % k][0]
+            paths[t] = _best_break(paths[t], dist_matrix, prev_city, next_city)
+    return np.concatenate(paths)
+
+
+def _cluster_neighbor_lists(dist_matrix, members, coords, k):
+    """
+    Listas de vecinos cercanos sin recorrer la matriz completa: los candidatos
+    de cada ciudad son las ciudades de su grupo y de los NEAR_CLUSTERS grupos
+    de centroide más cercano. El costo total es O(n · tamaño de grupo).
+    """
+    n = len(dist_matrix)
+    k = max(1, min(k, n - 1))
+    centers = _centroids(coords, members)
+    near = np.argsort(((centers[:, None, :] - centers[None, :, :]) ** 2).sum(axis=-1), axis=1)
+    neighbors = np.empty((n, k), dtype=np.int32)
+    for c, cities in enumerate(members):
+        candidates = np.concatenate([members[o] for o in near[c, :NEAR_CLUSTERS + 1]])
+        rows = np.asarray(dist_matrix[cities[:, None], candidates[None, :]], dtype=float)
+        rows[candidates[None, :] == cities[:, None]] = np.inf  # Una ciudad no es su vecina
+        kk = min(k, len(candidates) - 1)
+        part = np.argpartition(rows, kk - 1, axis=1)[:, :kk]
+        order = np.argsort(np.take_along_axis(rows, part, axis=1), axis=1, kind='stable')
+        best = candidates[np.take_along_axis(part, order, axis=1)]
+        if kk < k:  # Grupos muy pequeños: se repite el último vecino
+            best = np.concatenate([best, np.repeat(best[:, -1:], k - kk, axis=1)], axis=1)
+        neighbors[cities] = best
+    return neighbors
+
+
+# ─────────────────────────────────────────────
+# SOLVER COMPLETO
+# ─────────────────────────────────────────────
+
+def decomposition_solver(
+    dist_matrix,
+    coords=None,            # Coordenadas (n, 2); se toman de una CoordinateDistanceMatrix si faltan
+    method='auto',          # Partición: 'auto', 'kmeans', 'hilbert' o 'spectral'
+    cluster_size=500,       # Ciudades por grupo (aprox.); ignorado si se da n_clusters
+    n_clusters=None,
+    solver='nn',            # Solver de cada grupo: 'nn' (NN + búsqueda local) o 'ga'
+    ga_params=None,         # Parámetros de genetic_algorithm para solver='ga'
+    k=10,                   # Vecinos candidatos por ciudad en la búsqueda local final
+    workers=None,           # Procesos del pool (None = núcleos disponibles; 1 = sin pool)
+    seed=42,
+    time_limit=None,        # Segundos para resolver los grupos (solo con solver='ga')
+    return_info=False
+):
+    """
+    Resuelve una instancia grande por descomposición:
+    1. Parte las ciudades en grupos (partition_cities)
+    2. Resuelve cada grupo por separado, en paralelo
+    3. Ordena los grupos (una ruta entre ellos) y une sus sub-rutas (stitch_tours)
+    4. Mejora las costuras con 2-opt + Or-opt, empezando solo por las ciudades
+       de frontera (las que tienen un vecino cercano en otro grupo)
+
+    Con time_limit (solo solver='ga': el vecino más cercano no se puede cortar)
+    lo que queda después de la partición se reparte entre las rondas de grupos
+    del pool, y cada AG recibe su parte como time_limit.
+
+    Retorna:
+    - best_route: la ruta (lista)
+    - best_cost: su costo
+    - elapsed: tiempo en segundos
+    Si return_info=True se agrega un cuarto elemento, un diccionario con:
+    - 'labels': grupo de cada ciudad
+    - 'n_clusters': número de grupos
+    - 'stitched_cost': costo de la ruta unida, antes de la búsqueda local final
+    - 'cluster_time': segundos resolviendo los grupos
+    """
+    if solver not in CLUSTER_SOLVERS:
+        raise ValueError(f"Solver desconocido: {solver!r} (opciones: {CLUSTER_SOLVERS})")
+    if time_limit is not None and solver != 'ga':
+        raise ValueError(f"time_limit solo se aplica con solver='ga'; se recibió {solver!r}")
+
+    start_time = time.time()
+    dist_matrix = as_distance_matrix(dist_matrix)
+    if coords is None and isinstance(dist_matrix, CoordinateDistanceMatrix):
+        coords = dist_matrix.coords
+    n = len(dist_matrix)
+    if n_clusters is None:
+        n_clusters = math.ceil(n / cluster_size)
+
+    # ── 1. Partición ──
+    labels = partition_cities(dist_matrix, n_clusters, method, coords, seed)
+    members = cluster_members(labels)
+
+    # ── 2. Sub-rutas de cada grupo (las más grandes primero: mejor reparto del pool) ──
+    cluster_start = time.time()
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(len(members))]
+    jobs = sorted(range(len(members)), key=lambda c: -len(members[c]))
+    params = dict(ga_params or {})
+    if workers is None:
+        workers = min(len(members), os.cpu_count() or 1)
+    if time_limit is not None:
+        rounds = math.ceil(len(members) / max(1, workers))
+        share = max(0.0, time_limit - (time.time() - start_time)) / rounds
+        params['time_limit'] = min(share, params.get('time_limit') or share)
+
+    local_routes = [None] * len(members)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                c: pool.submit(_solve_cluster, submatrix(dist_matrix, members[c]), solver,
+                               params, seeds[c])
+                for c in jobs
+            }
+            for c, future in futures.items():
+                local_routes[c] = future.result()
+    else:
+        for c in jobs:
+            local_routes[c] = _solve_cluster(submatrix(dist_matrix, members[c]), solver,
+                                             params, seeds[c])
+    cluster_time = time.time() - cluster_start
+
+    # ── 3. Orden de los grupos y unión ──
+    order = cluster_order(_cluster_distances(dist_matrix, members, coords))
+    tours = [members[c][np.asarray(local_routes[c], dtype=np.int64)] for c in order]
+    route = stitch_tours(tours, dist_matrix)
+    stitched_cost = route_cost(route, dist_matrix)
+
+    # ── 4. Búsqueda local en las costuras ──
+    if coords is not None and len(members) > 1:
+        neighbors = _cluster_neighbor_lists(dist_matrix, members, coords, k)
+    else:
+        neighbors = build_neighbor_lists(dist_matrix, k)
+    boundary = np.flatnonzero((labels[neighbors] != labels[:, None]).any(axis=1))
+    best_route, best_cost = local_search(route, dist_matrix, neighbors, active=boundary)
+
+    elapsed = time.time() - start_time
+    if return_info:
+        info = {
+            'labels': labels,
+            'n_clusters': len(members),
+            'stitched_cost': stitched_cost,
+            'cluster_time': cluster_time,
+        }
+        return best_route, best_cost, elapsed, info
+    return best_route, best_cost, elapsed
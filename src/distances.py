@@ -0,0 +1,445 @@
+# distances.py
+# Funciones de distancia de TSPLIB para instancias definidas por coordenadas
+#
+# En TSPLIB una instancia puede dar la matriz de distancias explícita
+# (EDGE_WEIGHT_TYPE: EXPLICIT, como gr17/gr21/gr24) o solo las coordenadas de
+# cada ciudad (NODE_COORD_SECTION). En el segundo caso la distancia se calcula
+# con una fórmula que depende de EDGE_WEIGHT_TYPE:
+#
+# - EUC_2D:  distancia euclidiana redondeada al entero más cercano
+# - CEIL_2D: distancia euclidiana redondeada hacia arriba
+# - ATT:     distancia "pseudo-euclidiana" (instancias att48, att532)
+# - GEO:     distancia geográfica sobre la esfera terrestre (coordenadas en grados.minutos)
+#
+# Todas las funciones trabajan con arreglos numpy completos (sin bucles por ciudad).
+#
+# Para instancias muy grandes (decenas de miles de ciudades) la matriz n x n no
+# cabe en memoria: CoordinateDistanceMatrix guarda solo las coordenadas y calcula
+# cada distancia al vuelo, con una caché LRU de las filas usadas recientemente.
+
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+# Tipos de distancia por coordenadas que sabemos calcular
+COORD_WEIGHT_TYPES = ('EUC_2D', 'CEIL_2D', 'GEO', 'ATT')
+
+# Constantes de la definición oficial de GEO en TSPLIB
+GEO_PI = 3.141592
+GEO_RADIUS = 6378.388
+
+
+def _nint(x):
+    """Redondeo al entero más cercano como en TSPLIB: (int)(x + 0.5)."""
+    return np.floor(x + 0.5)
+
+
+def _geo_radians(coords):
+    """
+    Convierte coordenadas GEO (formato grados.minutos, ej. 38.24 = 38° 24')
+    a radianes, tal como lo define TSPLIB.
+    """
+    degrees = np.trunc(coords)
+    minutes = coords - degrees
+    return GEO_PI * (degrees + 5.0 * minutes / 3.0) / 180.0
+
+
+def coordinate_distances(coords_a, coords_b, edge_weight_type):
+    """
+    Calcula la distancia entre cada punto de `coords_a` (..., 2) y el punto
+    correspondiente de `coords_b` (..., 2) según la fórmula de `edge_weight_type`.
+    Las formas se combinan con broadcasting: (m, 1, 2) contra (k, 2) da (m, k).
+
+    Retorna: arreglo de enteros (int64) con la forma combinada (sin el último eje).
+    """
+    a = np.asarray(coords_a, dtype=float)
+    b = np.asarray(coords_b, dtype=float)
+
+    if edge_weight_type == 'GEO':
+        lat_a, lon_a = _geo_radians(a[..., 0]), _geo_radians(a[..., 1])
+        lat_b, lon_b = _geo_radians(b[..., 0]), _geo_radians(b[..., 1])
+        q1 = np.cos(lon_a - lon_b)
+        q2 = np.cos(lat_a - lat_b)
+        q3 = np.cos(lat_a + lat_b)
+        inner = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        return np.trunc(GEO_RADIUS * np.arccos(inner) + 1.0).astype(np.int64)
+
+    dx = a[..., 0] - b[..., 0]
+    dy = a[..., 1] - b[..., 1]
+    squared = dx * dx + dy * dy
+
+    if edge_weight_type == 'EUC_2D':
+        return _nint(np.sqrt(squared)).astype(np.int64)
+    if edge_weight_type == 'CEIL_2D':
+        return np.ceil(np.sqrt(squared)).astype(np.int64)
+    if edge_weight_type == 'ATT':
+        r = np.sqrt(squared / 10.0)
+        t = _nint(r)
+        return np.where(t < r, t + 1, t).astype(np.int64)
+
+    raise ValueError(f"EDGE_WEIGHT_TYPE no soportado: {edge_weight_type!r} "
+                     f"(opciones: {COORD_WEIGHT_TYPES})")
+
+
+def pairwise_distances(coords_a, coords_b, edge_weight_type):
+    """
+    Calcula las distancias entre cada punto de `coords_a` (m, 2) y cada punto
+    de `coords_b` (k, 2) según la fórmula de `edge_weight_type`.
+
+    Retorna: arreglo (m, k) de enteros (int64).
+    """
+    a = np.asarray(coords_a, dtype=float)
+    b = np.asarray(coords_b, dtype=float)
+    return coordinate_distances(a[:, None, :], b[None, :, :], edge_weight_type)
+
+
+def coordinate_distance_matrix(coords, edge_weight_type, block=1024, dtype=None):
+    """
+    Construye la matriz de distancias completa (n, n) a partir de coordenadas.
+
+    Se calcula por bloques de `block` filas para no crear arreglos temporales
+    de tamaño n x n en float64 además de la matriz final.
+    La diagonal siempre es 0 (GEO, por su fórmula, daría 1).
+    Si no se indica `dtype`, se usa el entero más pequeño que alcanza (smallest_int_dtype).
+    """
+    coords = np.asarray(coords, dtype=float)
+    n = len(coords)
+    if dtype is None:
+        dtype = smallest_int_dtype(max_coordinate_distance(coords, edge_weight_type))
+    matrix = np.empty((n, n), dtype=dtype)
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        matrix[start:stop] = pairwise_distances(coords[start:stop], coords, edge_weight_type)
+    np.fill_diagonal(matrix, 0)
+    return matrix
+
+
+# ─────────────────────────────────────────────
+# TIPO DE DATO COMPACTO
+# ─────────────────────────────────────────────
+
+def smallest_int_dtype(max_value):
+    """
+    Devuelve el tipo entero con signo más pequeño que puede guardar `max_value`.
+
+    Las distancias de TSPLIB suelen caber en int16 (hasta 32767) o int32:
+    usar int64 para todo multiplica por 4 la memoria de la matriz.
+    Se usan tipos CON signo para que las restas (deltas) no den la vuelta.
+    """
+    for dtype in (np.int16, np.int32):
+        if max_value <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def max_coordinate_distance(coords, edge_weight_type):
+    """
+    Cota superior de la distancia entre dos ciudades cualesquiera, sin calcular
+    la matriz: la distancia entre las esquinas opuestas del rectángulo que
+    contiene todos los puntos (para GEO, media vuelta a la Tierra).
+    """
+    if edge_weight_type == 'GEO':
+        return int(GEO_RADIUS * np.pi + 1.0)
+    coords = np.asarray(coords, dtype=float)
+    corners = np.array([coords.min(axis=0), coords.max(axis=0)])
+    return int(pairwise_distances(corners[:1], corners[1:], edge_weight_type)[0, 0])
+
+
+# ─────────────────────────────────────────────
+# MATRIZ CONDENSADA (TRIÁNGULO SUPERIOR)
+# ─────────────────────────────────────────────
+# Una matriz simétrica con diagonal cero queda determinada por su triángulo
+# superior: n*(n-1)/2 valores en lugar de n*n (la mitad de memoria).
+# Guardamos ese triángulo fila por fila en un arreglo plano:
+#   (0,1) (0,2) ... (0,n-1) (1,2) ... (1,n-1) ... (n-2,n-1)
+
+def condensed_index(i, j, n):
+    """
+    Posición en el arreglo condensado del par (i, j), con i < j.
+    Antes de la fila i hay (n-1) + (n-2) + ... + (n-i) = i*n - i*(i+1)/2 valores.
+    """
+    return i * n - i * (i + 1) // 2 + (j - i - 1)
+
+
+class CondensedDistanceMatrix:
+    """
+    Matriz de distancias simétrica guardada solo como su triángulo superior.
+
+    Se indexa igual que una matriz numpy en los usos del proyecto, así que
+    route_cost, nearest_neighbor y el AG la aceptan sin cambios:
+    - D[i, j] con enteros o arreglos (fancy indexing, con broadcasting)
+    - D[i] devuelve la fila completa i; D[a:b] un bloque de filas
+    - D.item(i, j) devuelve un número de Python
+    - len(D), D.shape, D.dtype, np.asarray(D) (esta última construye la matriz densa)
+    """
+
+    def __init__(self, data, n):
+        self.data = data          # Arreglo plano de n*(n-1)/2 valores
+        self.n = n
+
+    @property
+    def shape(self):
+        return (self.n, self.n)
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        for i in range(self.n):
+            yield self.row(i)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            return self.pairs(*key)
+        if isinstance(key, slice):
+            return np.stack([self.row(i) for i in range(*key.indices(self.n))])
+        return self.row(key)
+
+    def pairs(self, i, j):
+        """Distancias entre los pares (i, j); i y j se combinan con broadcasting."""
+        i = np.asarray(i, dtype=np.int64)
+        j = np.asarray(j, dtype=np.int64)
+        lo = np.minimum(i, j)
+        hi = np.maximum(i, j)
+        same = lo == hi
+        k = np.where(same, 0, condensed_index(lo, hi, self.n))
+        values = np.where(same, 0, self.data[k]).astype(self.dtype, copy=False)
+        return values[()]  # Un par suelto devuelve un escalar, no un arreglo 0-d
+
+    def item(self, i, j):
+        """Distancia entre i y j como número de Python."""
+        if i == j:
+            return 0
+        if i > j:
+            i, j = j, i
+        return self.data[condensed_index(i, j, self.n)].item()
+
+    def row(self, i):
+        """
+        Fila i completa: distancias de la ciudad i a todas las demás.
+        Con un arreglo de ciudades devuelve una fila por cada una (como D[arreglo]).
+        """
+        i = np.asarray(i)
+        return self.pairs(i[..., None], np.arange(self.n))
+
+    def __array__(self, dtype=None, copy=None):
+        dense = self[0:self.n] if self.n else np.zeros((0, 0), dtype=self.dtype)
+        return dense if dtype is None else dense.astype(dtype)
+
+
+def as_distance_matrix(dist_matrix):
+    """
+    Normaliza la matriz que recibe un algoritmo: una CondensedDistanceMatrix,
+    una CoordinateDistanceMatrix o un arreglo numpy se usan tal cual; cualquier
+    otra cosa (ej. listas de listas) se convierte con np.asarray.
+    """
+    if isinstance(dist_matrix, (np.ndarray, CondensedDistanceMatrix, CoordinateDistanceMatrix)):
+        return dist_matrix
+    return np.asarray(dist_matrix)
+
+
+def condensed_coordinate_matrix(coords, edge_weight_type, dtype=None, block=256):
+    """
+    Construye directamente la CondensedDistanceMatrix a partir de coordenadas,
+    sin crear nunca la matriz n x n.
+    """
+    coords = np.asarray(coords, dtype=float)
+    n = len(coords)
+    if dtype is None:
+        dtype = smallest_int_dtype(max_coordinate_distance(coords, edge_weight_type))
+    data = np.empty(n * (n - 1) // 2, dtype=dtype)
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        rows = pairwise_distances(coords[start:stop], coords, edge_weight_type)
+        for i in range(start, stop):
+            offset = condensed_index(i, i + 1, n)
+            data[offset:offset + n - i - 1] = rows[i - start, i + 1:]
+    return CondensedDistanceMatrix(data, n)
+
+
+# ─────────────────────────────────────────────
+# DISTANCIAS AL VUELO (SIN MATRIZ)
+# ─────────────────────────────────────────────
+# Con 100.000 ciudades la matriz int32 ocupa 40 GB (la condensada, 20 GB).
+# Pero casi todos los algoritmos del proyecto solo piden pares sueltos de
+# ciudades: las aristas de las rutas (evaluación, deltas de mutación, 2-opt),
+# que se calculan directo de las coordenadas. Las filas completas (vecino más
+# cercano) se calculan vectorizadas y las más usadas quedan en una caché LRU.
+
+# Memoria máxima por defecto de la caché de filas (en bytes)
+DEFAULT_ROW_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class CoordinateDistanceMatrix:
+    """
+    "Oráculo" de distancias de una instancia por coordenadas: se usa como una
+    matriz (igual que CondensedDistanceMatrix) pero solo guarda las coordenadas.
+
+    - D[i, j], D.pairs(i, j): se calculan directo de las coordenadas (sin caché)
+    - D[i], D.row(i): fila completa; las últimas filas pedidas quedan en una
+      caché LRU de a lo sumo `cache_bytes` bytes (hits/misses en cache_info())
+    - D[a:b]: bloque de filas calculado de una vez (no pasa por la caché, para
+      que un recorrido completo de la matriz no la vacíe)
+    - D.item(i, j), len(D), D.shape, D.dtype, np.asarray(D) (matriz densa)
+
+    Las distancias son idénticas a las de coordinate_distance_matrix: el mismo
+    tipo entero y la diagonal en 0.
+    """
+
+    def __init__(self, coords, edge_weight_type, dtype=None, cache_bytes=DEFAULT_ROW_CACHE_BYTES):
+        if edge_weight_type not in COORD_WEIGHT_TYPES:
+            raise ValueError(f"EDGE_WEIGHT_TYPE no soportado: {edge_weight_type!r} "
+                             f"(opciones: {COORD_WEIGHT_TYPES})")
+        self.coords = np.ascontiguousarray(coords, dtype=float)
+        self.edge_weight_type = edge_weight_type
+        self.n = len(self.coords)
+        if dtype is None:
+            dtype = smallest_int_dtype(max_coordinate_distance(self.coords, edge_weight_type))
+        self._dtype = np.dtype(dtype)
+        self.cache_bytes = cache_bytes
+        # Cuántas filas caben en la caché (al menos una)
+        self.max_rows = max(1, cache_bytes // max(1, self.n * self._dtype.itemsize))
+        self._rows = OrderedDict()  # ciudad → fila; el final es la usada más recientemente
+        self.hits = 0
+        self.misses = 0
+        self._xy = self.coords.tolist()  # Para item(): números de Python, sin numpy
+
+    @property
+    def shape(self):
+        return (self.n, self.n)
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def nbytes(self):
+        """Memoria ocupada: coordenadas más las filas en caché."""
+        return self.coords.nbytes + len(self._rows) * self.n * self._dtype.itemsize
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        for i in range(self.n):
+            yield self.row(i)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            return self.pairs(*key)
+        if isinstance(key, slice):
+            return self._block(np.arange(*key.indices(self.n)))
+        return self.row(key)
+
+    def __getstate__(self):
+        # Al copiarla a otro proceso viajan las coordenadas, no la caché
+        state = self.__dict__.copy()
+        state['_rows'] = OrderedDict()
+        state['hits'] = state['misses'] = 0
+        return state
+
+    def pairs(self, i, j):
+        """Distancias entre los pares (i, j); i y j se combinan con broadcasting."""
+        i = np.asarray(i, dtype=np.int64)
+        j = np.asarray(j, dtype=np.int64)
+        values = coordinate_distances(self.coords[i], self.coords[j], self.edge_weight_type)
+        values = np.where(i == j, 0, values).astype(self._dtype, copy=False)
+        return values[()]  # Un par suelto devuelve un escalar, no un arreglo 0-d
+
+    def item(self, i, j):
+        """
+        Distancia entre i y j como número de Python. Para las fórmulas euclidianas
+        se calcula con el módulo math (mucho más rápido que numpy para un solo par
+        y con el mismo resultado: la raíz cuadrada es exacta en ambos).
+        """
+        if i == j:
+            return 0
+        kind = self.edge_weight_type
+        if kind == 'GEO':
+            return self.pairs(i, j).item()
+        (xa, ya), (xb, yb) = self._xy[i], self._xy[j]
+        dx, dy = xa - xb, ya - yb
+        squared = dx * dx + dy * dy
+        if kind == 'EUC_2D':
+            return int(math.floor(math.sqrt(squared) + 0.5))
+        if kind == 'CEIL_2D':
+            return int(math.ceil(math.sqrt(squared)))
+        r = math.sqrt(squared / 10.0)  # ATT
+        t = math.floor(r + 0.5)
+        return int(t + 1 if t < r else t)
+
+    def row(self, i):
+        """
+        Fila i completa, desde la caché si está. Con un arreglo de ciudades
+        devuelve una fila por cada una (como D[arreglo]); las que faltan se
+        calculan juntas en un solo bloque.
+        Las filas devueltas son de solo lectura: son las mismas de la caché.
+        """
+        if np.ndim(i) == 0:
+            i = int(i)
+            cached = self._rows.get(i)
+            if cached is not None:
+                self.hits += 1
+                self._rows.move_to_end(i)
+                return cached
+            self.misses += 1
+            row = self._block(np.array([i]))[0]
+            self._store(i, row)
+            return row
+
+        cities = np.asarray(i, dtype=np.int64)
+        out = np.empty(cities.shape + (self.n,), dtype=self._dtype)
+        flat = cities.ravel()
+        rows = out.reshape(len(flat), self.n)
+        missing = []
+        for k, city in enumerate(flat.tolist()):
+            cached = self._rows.get(city)
+            if cached is None:
+                missing.append(k)
+            else:
+                self.hits += 1
+                self._rows.move_to_end(city)
+                rows[k] = cached
+        if missing:
+            self.misses += len(missing)
+            rows[missing] = self._block(flat[missing])
+            for k in missing:
+                self._store(int(flat[k]), rows[k].copy())
+        return out
+
+    def _block(self, cities):
+        """Filas de `cities` calculadas de una vez (sin tocar la caché)."""
+        block = pairwise_distances(self.coords[cities], self.coords,
+                                   self.edge_weight_type).astype(self._dtype)
+        block[np.arange(len(cities)), cities] = 0  # Diagonal (GEO daría 1)
+        return block
+
+    def _store(self, city, row):
+        """Guarda una fila en la caché y descarta la usada hace más tiempo si no cabe."""
+        row.flags.writeable = False
+        self._rows[city] = row
+        if len(self._rows) > self.max_rows:
+            self._rows.popitem(last=False)
+
+    def cache_info(self):
+        """Estado de la caché de filas: aciertos, fallos, filas guardadas y máximo."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'rows': len(self._rows), 'max_rows': self.max_rows}
+
+    def clear_cache(self):
+        """Vacía la caché de filas (y sus contadores)."""
+        self._rows.clear()
+        self.hits = self.misses = 0
+
+    def __array__(self, dtype=None, copy=None):
+        dense = self[0:self.n]
+        return dense if dtype is None else dense.astype(dtype)
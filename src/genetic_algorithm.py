@@ -10,11 +10,27 @@
 # - Cruce (Crossover): combinar dos rutas para crear una nueva
 # - Mutación: hacer un pequeño cambio aleatorio en una ruta
 
+import asyncio
+import contextlib
+import hashlib
+import os
 import random
 import time
-import copy
-from src.nearest_neighbor import route_cost  # Reutilizamos la función de costo
+from collections import OrderedDict
+
+import numpy as np
 
+from src import backends
+from src.checkpoint import load_checkpoint, save_checkpoint
+from src.distances import as_distance_matrix
+from src.initialization import (
+    canonical_tours,
+    double_bridge_batch,
+    initial_population,
+    resolve_initialization,
+)
+from src.local_search import build_neighbor_lists, improve_population
+from src.nearest_neighbor import route_cost  # Reutilizamos la función de costo
 
 # ─────────────────────────────────────────────
 # INICIALIZACIÓN DE LA POBLACIÓN
@@ -131,30 +147,11 @@ def order_crossover(parent1, parent2):
     cut1, cut2 = sorted(random.sample(range(n), 2))
     # sorted() garantiza que cut1 <= cut2
 
-    # Creamos el hijo con None en todas las posiciones
-    child = [None] * n
-
-    # Copiamos el segmento del padre 1 al hijo
-    child[cut1:cut2+1] = parent1[cut1:cut2+1]
-    # parent1[cut1:cut2+1] es el "slice" de cut1 hasta cut2 (inclusive)
-
-    # Conjunto de ciudades ya colocadas en el hijo (para verificar rápidamente)
-    placed = set(child[cut1:cut2+1])
-
-    # Llenamos el resto con ciudades del padre 2 en orden
-    # Empezamos desde la posición cut2+1 del padre 2 (de forma circular)
-    p2_idx = (cut2 + 1) % n  # Índice en parent2, circular
-    c_idx = (cut2 + 1) % n   # Índice en child donde colocaremos, circular
-
-    while None in child:
-        city = parent2[p2_idx]
-        if city not in placed:
-            child[c_idx] = city       # Colocamos la ciudad en el hijo
-            placed.add(city)           # La marcamos como colocada
-            c_idx = (c_idx + 1) % n   # Avanzamos al siguiente slot del hijo
-        p2_idx = (p2_idx + 1) % n     # Siempre avanzamos en parent2
-
-    return child
+    # El relleno lo hace el kernel del backend activo (ver backends.py): con el
+    # backend 'python' es exactamente el bucle descrito arriba
+    parents = np.array([parent1, parent2])
+    child = backends.order_crossover(parents, np.array([[0, 1]]), np.array([[cut1, cut2]]))
+    return child[0].tolist()
 
 
 # ─────────────────────────────────────────────
@@ -187,89 +184,1266 @@ def swap_mutation(individual, mutation_rate):
     return ind
 
 
+# ─────────────────────────────────────────────
+# MOTOR VECTORIZADO (NumPy)
+# ─────────────────────────────────────────────
+# Las funciones anteriores trabajan con un individuo (una lista) a la vez.
+# El ciclo principal usa estas versiones, que guardan TODA la población en un
+# único arreglo numpy de forma (pop_size, n): cada fila es una ruta.
+# Así el costo de todas las rutas se calcula con una sola operación de numpy
+# en lugar de un bucle de Python por cada arista.
+
+def create_population_array(pop_size, n, rng):
+    """
+    Crea la población inicial como un arreglo (pop_size, n) de tipo int32.
+
+    Cada fila es una permutación aleatoria de 0 a n-1 (igual que create_individual).
+    `rng` es un generador de numpy (np.random.default_rng).
+    """
+    base = np.tile(np.arange(n, dtype=np.int32), (pop_size, 1))  # pop_size copias de [0..n-1]
+    return rng.permuted(base, axis=1)  # Mezcla cada fila de forma independiente
+
+
+def evaluate_population_array(population, dist_matrix):
+    """
+    Calcula el costo de TODAS las rutas de la población a la vez.
+
+    El kernel depende del backend activo (ver backends.py). Con numpy,
+    np.roll(population, -1, axis=1) desplaza cada fila una posición a la izquierda,
+    así que en la columna i tenemos la ciudad siguiente a population[:, i]
+    (y la última columna apunta de regreso a la primera ciudad), y
+    dist_matrix[P, P_siguiente].sum(axis=1) suma las aristas de cada ruta.
+
+    Retorna: vector de costos de tamaño pop_size.
+    """
+    return backends.tour_costs(population, dist_matrix)
+
+
+# ─────────────────────────────────────────────
+# MEMO DE COSTOS Y RUTAS REPETIDAS
+# ─────────────────────────────────────────────
+# Cuando la población converge, muchos hijos son copias de rutas ya evaluadas
+# (o la misma ruta rotada o en sentido contrario). El memo guarda el costo de
+# cada ruta bajo un hash de su forma canónica (canonical_tours): una ruta
+# repetida no se vuelve a sumar. Se asume una matriz simétrica, como en el resto
+# del proyecto (recorrer el ciclo al revés cuesta lo mismo).
+
+# Rutas que guarda el memo si no se indica otro tamaño
+DEFAULT_FITNESS_CACHE_SIZE = 100_000
+
+
+class FitnessCache:
+    """
+    Memo acotado (LRU) de costos de rutas: ruta canónica → costo.
+
+    - evaluate(population, dist_matrix): costos de todas las filas; solo se
+      calculan (en un único lote) las rutas que no estaban, una vez cada una
+    - store(routes, costs): guarda costos ya conocidos (ej. tras una mutación)
+    - cache_info(): aciertos, fallos, entradas y tasa de aciertos
+
+    Al pasar de `max_entries` rutas se descarta la usada hace más tiempo.
+    """
+
+    def __init__(self, max_entries=DEFAULT_FITNESS_CACHE_SIZE):
+        self.max_entries = max(1, max_entries)
+        self._costs = OrderedDict()  # clave → costo; el final es la usada más recientemente
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def keys(routes):
+        """Clave de cada ruta (m, n): hash de 16 bytes de su forma canónica."""
+        canonical = np.ascontiguousarray(canonical_tours(routes), dtype=np.int32)
+        return [hashlib.blake2b(row, digest_size=16).digest() for row in canonical]
+
+    def evaluate(self, population, dist_matrix):
+        """Costos de las filas de `population`, usando el memo donde se pueda."""
+        if len(population) == 0:
+            return evaluate_population_array(population, dist_matrix)
+        keys = self.keys(population)
+        values = [None] * len(keys)
+        pending = {}  # clave que falta → filas que la comparten
+        for r, key in enumerate(keys):
+            cost = self._costs.get(key)
+            if cost is None:
+                pending.setdefault(key, []).append(r)
+            else:
+                self._costs.move_to_end(key)
+                values[r] = cost
+
+        if pending:
+            first_rows = [rows[0] for rows in pending.values()]
+            computed = evaluate_population_array(population[first_rows], dist_matrix)
+            for (key, rows), cost in zip(pending.items(), computed, strict=True):
+                for r in rows:
+                    values[r] = cost
+                self._put(key, cost)
+        self.misses += len(pending)
+        self.hits += len(keys) - len(pending)
+        return np.array(values)
+
+    def store(self, routes, costs):
+        """Guarda los costos (ya calculados) de las filas de `routes`."""
+        if len(routes) == 0:
+            return
+        for key, cost in zip(self.keys(routes), costs, strict=True):
+            self._put(key, cost)
+
+    def _put(self, key, cost):
+        self._costs[key] = cost
+        self._costs.move_to_end(key)
+        if len(self._costs) > self.max_entries:
+            self._costs.popitem(last=False)
+
+    def cache_info(self):
+        """Estado del memo: aciertos, fallos, entradas guardadas, máximo y tasa de aciertos."""
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._costs),
+                'max_entries': self.max_entries, 'hit_rate': self.hits / total if total else 0.0}
+
+    def clear(self):
+        """Vacía el memo (y sus contadores)."""
+        self._costs.clear()
+        self.hits = self.misses = 0
+
+
+def evaluate_with_cache(population, dist_matrix, fitness_cache=None):
+    """
+    Como evaluate_population_array, pero a través de un FitnessCache si se da.
+    Retorna: (costos, cuántas rutas se calcularon de verdad).
+    """
+    if fitness_cache is None:
+        return evaluate_population_array(population, dist_matrix), len(population)
+    misses = fitness_cache.misses
+    costs = fitness_cache.evaluate(population, dist_matrix)
+    return costs, fitness_cache.misses - misses
+
+
+def duplicate_rows(population):
+    """
+    Máscara de las filas que repiten (como ciclo) una fila anterior: la primera
+    aparición de cada ruta no se marca.
+    """
+    duplicated = np.ones(len(population), dtype=bool)
+    if len(population):
+        _, first = np.unique(canonical_tours(population), axis=0, return_index=True)
+        duplicated[first] = False
+    return duplicated
+
+
+def tournament_selection_array(costs, n_winners, tournament_size, rng):
+    """
+    Selección por torneo vectorizada: realiza `n_winners` torneos a la vez.
+
+    Cada torneo elige `tournament_size` índices al azar (con reemplazo) y gana
+    el de menor costo. Retorna el vector de índices ganadores.
+    """
+    contestants = rng.integers(0, len(costs), size=(n_winners, tournament_size))
+    best = np.argmin(costs[contestants], axis=1)  # Posición del ganador en cada torneo
+    return contestants[np.arange(n_winners), best]
+
+
+def select_elite(costs, elite_size):
+    """
+    Devuelve los índices de los `elite_size` individuos de menor costo,
+    ordenados de mejor a peor.
+
+    np.argpartition encuentra los k menores en O(n) sin ordenar toda la población;
+    luego solo ordenamos ese pequeño grupo.
+    """
+    elite_size = min(elite_size, len(costs))
+    if elite_size <= 0:
+        return np.empty(0, dtype=np.intp)
+    idx = np.argpartition(costs, elite_size - 1)[:elite_size]
+    return idx[np.argsort(costs[idx], kind='stable')]
+
+
+def random_cut_points(n_pairs, n, rng):
+    """
+    Genera `n_pairs` pares de puntos de corte distintos (cut1 < cut2) en [0, n-1].
+
+    Equivale a sorted(random.sample(range(n), 2)) repetido n_pairs veces:
+    el segundo punto se obtiene sumando un desplazamiento de 1..n-1 (módulo n),
+    así nunca coincide con el primero.
+
+    Retorna: arreglo (n_pairs, 2) con las columnas [cut1, cut2].
+    """
+    first = rng.integers(0, n, size=n_pairs)
+    second = (first + rng.integers(1, n, size=n_pairs)) % n
+    return np.sort(np.stack([first, second], axis=1), axis=1)
+
+
+def order_crossover_batch(population, parents, cuts):
+    """
+    Cruce OX1 para una generación completa de hijos a la vez.
+
+    Parámetros:
+    - population: arreglo (pop_size, n) con las rutas
+    - parents: arreglo (m, 2) con los índices [padre1, padre2] de cada hijo
+    - cuts: arreglo (m, 2) con los puntos de corte [cut1, cut2] (inclusive)
+
+    Produce exactamente los mismos hijos que order_crossover con esos cortes.
+    El trabajo lo hace el kernel del backend activo (backends.order_crossover):
+    un bucle compilado con numba, o con numpy rotando cada ruta para que empiece
+    en cut2+1 (el segmento del padre 1 queda al final de la fila y el relleno
+    con el padre 2 al principio) y copiando ambas partes con máscaras booleanas.
+
+    Retorna: arreglo (m, n) con los hijos.
+    """
+    return backends.order_crossover(population, parents, cuts)
+
+
+def _edge_sum(population, rows, edges, dist_matrix):
+    """
+    Suma el costo de las aristas `edges` (m, k) de las filas `rows` de la población,
+    contando una sola vez las aristas repetidas en la misma fila.
+    La arista e de una ruta une la posición e con la posición e+1 (circular).
+    """
+    n = population.shape[1]
+    r = rows[:, None]
+    weights = dist_matrix[population[r, edges], population[r, (edges + 1) % n]]
+    # Una arista repetida (p. ej. si i y j son vecinas) se cuenta solo la primera vez
+    repeated = np.zeros(edges.shape, dtype=bool)
+    for k in range(1, edges.shape[1]):
+        repeated[:, k] = (edges[:, :k] == edges[:, k:k + 1]).any(axis=1)
+    return np.where(repeated, 0, weights).sum(axis=1)
+
+
+def swap_mutation_batch(population, mutation_rate, rng, costs=None, dist_matrix=None):
+    """
+    Mutación swap sobre una generación completa, modificando `population` en el lugar.
+
+    Con un único sorteo de Bernoulli por fila decidimos qué individuos mutan;
+    solo esas filas se tocan (no se copia nada si no hay mutación).
+
+    Si se pasan `costs` y `dist_matrix`, los costos de las filas mutadas se
+    actualizan en el lugar con un delta O(1): un swap solo cambia las (a lo sumo
+    cuatro) aristas que tocan las posiciones i y j, así que basta restar esas
+    aristas antes del intercambio y sumar las nuevas después.
+
+    Retorna: (rows, i, j) = filas mutadas y las posiciones intercambiadas en cada una.
+    """
+    m, n = population.shape
+    rows = np.flatnonzero(rng.random(m) < mutation_rate)
+    if n < 2:
+        rows = rows[:0]
+    i = rng.integers(0, n, size=len(rows))
+    j = (i + rng.integers(1, max(n, 2), size=len(rows))) % n  # j siempre distinto de i
+
+    if costs is not None:
+        # Aristas afectadas: las que entran y salen de las posiciones i y j
+        edges = np.stack([(i - 1) % n, i, (j - 1) % n, j], axis=1)
+        before = _edge_sum(population, rows, edges, dist_matrix)
+
+    population[rows, i], population[rows, j] = population[rows, j], population[rows, i]
+
+    if costs is not None:
+        costs[rows] += _edge_sum(population, rows, edges, dist_matrix) - before
+    return rows, i, j
+
+
+# ─────────────────────────────────────────────
+# CRUCES QUE CONSERVAN ARISTAS: PMX, ERX Y EAX
+# ─────────────────────────────────────────────
+# OX1 conserva el orden relativo de las ciudades, pero en el TSP lo que importa
+# es qué ciudades quedan juntas (las aristas). Estos cruces heredan aristas de
+# los padres. Todos trabajan con tablas de adyacencia en arreglos: la fila de
+# una ciudad guarda sus dos vecinas en la ruta (anterior y siguiente).
+
+# Vecinos cercanos por ciudad entre los que EAX busca cómo unir subciclos
+EAX_NEIGHBORS = 10
+
+def adjacency_table(routes):
+    """
+    Tabla de adyacencia de cada ruta de `routes` (m, n).
+
+    Retorna: arreglo (m, n, 2) donde [k, ciudad] = [anterior, siguiente] de la
+    ciudad en la ruta k.
+    """
+    m, n = routes.shape
+    rows = np.arange(m)[:, None]
+    table = np.empty((m, n, 2), dtype=routes.dtype)
+    table[rows, routes, 0] = np.roll(routes, 1, axis=1)
+    table[rows, routes, 1] = np.roll(routes, -1, axis=1)
+    return table
+
+
+def pmx_crossover_batch(population, parents, cuts):
+    """
+    Cruce PMX (Partially Mapped Crossover) para todos los hijos a la vez.
+
+    El hijo copia el segmento [cut1, cut2] del padre 1 y el resto de las
+    posiciones del padre 2. Si la ciudad del padre 2 ya está en el segmento,
+    se sigue la correspondencia del segmento (ciudad del padre 1 en la
+    posición j → ciudad del padre 2 en la posición j) hasta dar con una libre.
+    `pos1` (la posición de cada ciudad en el padre 1) hace cada paso en O(1),
+    y todas las posiciones de todos los hijos avanzan juntas.
+
+    Parámetros: igual que order_crossover_batch.
+    Retorna: arreglo (m, n) con los hijos.
+    """
+    p1 = population[parents[:, 0]]
+    p2 = population[parents[:, 1]]
+    m, n = p1.shape
+    rows = np.arange(m)[:, None]
+    positions = np.arange(n)
+
+    in_segment = (positions >= cuts[:, :1]) & (positions <= cuts[:, 1:])
+    pos1 = np.empty_like(p1)
+    pos1[rows, p1] = positions
+
+    city = p2.copy()
+    pending = ~in_segment & in_segment[rows, pos1[rows, city]]
+    while pending.any():
+        r, c = np.nonzero(pending)
+        j = pos1[r, city[r, c]]           # Dónde está la ciudad repetida en el padre 1
+        city[r, c] = p2[r, j]             # Se reemplaza por la correspondiente del padre 2
+        pending[r, c] = in_segment[r, pos1[r, city[r, c]]]
+
+    return np.where(in_segment, p1, city)
+
+
+def edge_recombination_batch(population, parents, rng):
+    """
+    Cruce ERX (Edge Recombination) para todos los hijos a la vez.
+
+    Cada ciudad tiene una lista con sus vecinas en cualquiera de los dos padres
+    (hasta 4; las aristas que están en ambos padres se marcan como comunes).
+    El hijo empieza en la primera ciudad del padre 1 y en cada paso:
+    1. La ciudad actual se borra de las listas de sus vecinas
+    2. La siguiente es una vecina de la actual: primero las de arista común,
+       luego la que tiene menos vecinas pendientes (empates al azar)
+    3. Si la actual ya no tiene vecinas pendientes, se salta a una ciudad no
+       visitada al azar (esa es la única arista que no viene de un padre)
+
+    La tabla de vecinas es un arreglo (m, n, 4) con -1 en los huecos, y cada
+    paso se resuelve para los m hijos a la vez.
+
+    Retorna: arreglo (m, n) con los hijos.
+    """
+    p1 = population[parents[:, 0]]
+    p2 = population[parents[:, 1]]
+    m, n = p1.shape
+    if n < 4:
+        return p1.copy()
+    rows = np.arange(m)
+
+    table = np.concatenate([adjacency_table(p1), adjacency_table(p2)], axis=2)
+    common = np.zeros(table.shape, dtype=bool)
+    for slot in (2, 3):
+        # Una vecina del padre 2 que ya está entre las del padre 1 es arista común
+        same = table[:, :, slot:slot + 1] == table[:, :, :2]
+        common[:, :, :2] |= same
+        table[:, :, slot][same.any(axis=2)] = -1
+
+    children = np.empty_like(p1)
+    visited = np.zeros((m, n), dtype=bool)
+    priority = rng.random((m, n))  # Orden al azar de los saltos cuando no hay vecinas
+    current = p1[:, 0].astype(np.intp)
+    for step in range(n):
+        children[:, step] = current
+        visited[rows, current] = True
+        if step == n - 1:
+            break
+
+        # 1. Borramos la ciudad actual de las listas de sus vecinas
+        neighbors = table[rows, current]                  # (m, 4)
+        valid = neighbors >= 0
+        safe = np.where(valid, neighbors, 0)
+        their = table[rows[:, None], safe]                # (m, 4, 4): listas de las vecinas
+        hit = (their == current[:, None, None]) & valid[:, :, None]
+        r, i, j = np.nonzero(hit)
+        table[r, safe[r, i], j] = -1
+        their[r, i, j] = -1
+
+        # 2. Arista común primero, luego menos vecinas pendientes, luego al azar
+        key = (np.where(common[rows, current], 0, 8) + (their >= 0).sum(axis=2)
+               + 0.5 * rng.random((m, 4)))
+        key[~valid] = np.inf
+        following = neighbors[rows, np.argmin(key, axis=1)].astype(np.intp)
+
+        # 3. Sin vecinas pendientes: la no visitada de menor prioridad al azar
+        stuck = np.flatnonzero(~valid.any(axis=1))
+        if len(stuck):
+            following[stuck] = np.argmin(np.where(visited[stuck], np.inf, priority[stuck]), axis=1)
+        current = following
+
+    return children
+
+
+def _ab_cycle(adj_a, adj_b, uncommon_a, uncommon_b, start, rng):
+    """
+    Busca un AB-cycle de EAX desde la ciudad `start`: un ciclo que alterna una
+    arista de A con una de B, usando solo aristas que no están en ambos padres.
+
+    Se camina alternando aristas al azar (cada una se usa una sola vez) hasta
+    volver a una ciudad ya visitada con la misma paridad; el tramo entre las
+    dos visitas es el ciclo.
+
+    Retorna: (cycle, first) = la lista de ciudades [v0, v1, ..., v0] y si la
+    primera arista del ciclo es de A (0) o de B (1).
+    """
+    adjacency = (adj_a, adj_b)
+    uncommon = (uncommon_a, uncommon_b)
+    free = ({}, {})  # Aristas pendientes por ciudad, de A y de B (se crean al primer uso)
+
+    def pending(side, city):
+        if city not in free[side]:
+            free[side][city] = [c for c, keep in zip(adjacency[side][city], uncommon[side][city], strict=True)
+                                if keep]
+        return free[side][city]
+
+    path = [start]
+    seen = ({start: 0}, {})  # Posición de cada ciudad en el camino, por paridad
+    city = start
+    while True:
+        side = (len(path) - 1) % 2  # Las aristas pares del camino son de A
+        options = pending(side, city)
+        following = options[int(rng.integers(len(options)))]
+        options.remove(following)
+        pending(side, following).remove(city)
+
+        t = len(path)
+        path.append(following)
+        s = seen[t % 2].get(following)
+        if s is not None:
+            return path[s:], s % 2
+        seen[t % 2][following] = t
+        city = following
+
+
+def _subtour(adj, start):
+    """Las ciudades del ciclo de `adj` (lista de pares de vecinas) que pasa por `start`."""
+    cycle = [start]
+    prev, city = start, adj[start][0]
+    while city != start:
+        cycle.append(city)
+        a, b = adj[city]
+        prev, city = city, (b if a == prev else a)
+    return cycle
+
+
+def _best_merge(adj, members, outside, dist_matrix, neighbors):
+    """
+    El intercambio 2-opt más barato que une el subciclo `members` con otro:
+    quitar una arista (a, b) del subciclo y una (v, w) de afuera y agregar
+    (a, v) y (b, w). Como en EAX, v se busca entre los vecinos cercanos de a;
+    si ninguno está afuera (`outside` es la máscara de ciudades de otros
+    subciclos), se revisan todas las ciudades de afuera, por bloques.
+
+    Retorna: (a, b, v, w).
+    """
+    following = np.roll(members, -1)
+    a = np.concatenate([members, following])  # Cada arista, en los dos sentidos
+    b = np.concatenate([following, members])
+    wide = np.float64 if dist_matrix.dtype.kind == 'f' else np.int64  # Sin desbordar int16
+
+    candidates = neighbors[a]
+    if outside[candidates].any():
+        blocks = [(a, b, candidates)]
+    else:
+        others = np.flatnonzero(outside)
+        size = max(1, (1 << 20) // len(others))  # Limita la memoria: bloque x len(others)
+        blocks = []
+        for lo in range(0, len(members), size):  # Un sentido basta: se prueban ambas w
+            a_block, b_block = a[lo:lo + size], b[lo:lo + size]
+            blocks.append((a_block, b_block, np.broadcast_to(others, (len(a_block), len(others)))))
+
+    best = None
+    for a_block, b_block, v in blocks:
+        a_col, b_col = a_block[:, None], b_block[:, None]
+        for slot in (0, 1):
+            w = adj[v, slot]
+            delta = (dist_matrix[a_col, v].astype(wide) + dist_matrix[b_col, w]
+                     - dist_matrix[a_col, b_col] - dist_matrix[v, w])
+            delta = np.where(outside[v], delta, np.inf)
+            i, j = np.unravel_index(np.argmin(delta), delta.shape)
+            if best is None or delta[i, j] < best[0]:
+                best = (delta[i, j], int(a_block[i]), int(b_block[i]), int(v[i, j]), int(w[i, j]))
+    return best[1:]
+
+
+def _eax_child(route_a, adj_a, adj_b, dist_matrix, neighbors, rng):
+    """
+    Un hijo EAX de los padres A y B (una ruta y las tablas de adyacencia (n, 2)).
+
+    1. Se elige un AB-cycle al azar (_ab_cycle)
+    2. A las aristas de A se le quitan las de A del ciclo y se le agregan las
+       de B: cada ciudad sigue con dos vecinas, pero pueden quedar varios
+       subciclos
+    3. Se une el subciclo más chico con otro con el mejor intercambio 2-opt
+       (_best_merge), hasta que queda uno solo
+    """
+    n = len(route_a)
+    uncommon_a = (adj_a != adj_b[:, :1]) & (adj_a != adj_b[:, 1:])
+    candidates = np.flatnonzero(uncommon_a.any(axis=1))
+    if len(candidates) == 0:
+        return route_a.copy()  # Padres iguales: no hay nada que recombinar
+    uncommon_b = (adj_b != adj_a[:, :1]) & (adj_b != adj_a[:, 1:])
+
+    cycle, first = _ab_cycle(adj_a.tolist(), adj_b.tolist(), uncommon_a.tolist(),
+                             uncommon_b.tolist(), int(rng.choice(candidates)), rng)
+    edges = list(zip(cycle[:-1], cycle[1:], strict=True))
+
+    # ── 2. Intercambiamos las aristas del ciclo ──
+    adj = adj_a.astype(np.int64)
+    for u, v in edges[first::2]:
+        adj[u][adj[u] == v] = -1
+        adj[v][adj[v] == u] = -1
+    for u, v in edges[1 - first::2]:
+        adj[u][np.argmax(adj[u] < 0)] = v
+        adj[v][np.argmax(adj[v] < 0)] = u
+    adj_list = adj.tolist()
+
+    # Todo subciclo pasa por alguna ciudad del AB-cycle
+    label = np.full(n, -1)
+    subtours = {}
+    for city in cycle:
+        if label[city] < 0:
+            members = _subtour(adj_list, city)
+            label[members] = city
+            subtours[city] = members
+
+    # ── 3. Unimos los subciclos, siempre el más chico con el resto ──
+    while len(subtours) > 1:
+        key = min(subtours, key=lambda k: len(subtours[k]))
+        members = np.array(subtours.pop(key))
+        a, b, v, w = _best_merge(adj, members, label != key, dist_matrix, neighbors)
+        # Quitamos (a, b) y (v, w); agregamos (a, v) y (b, w)
+        for x, old, new in ((a, b, v), (b, a, w), (v, w, a), (w, v, b)):
+            adj[x][adj[x] == old] = new
+            adj_list[x] = adj[x].tolist()
+        target = int(label[v])
+        label[members] = target
+        subtours[target] = _subtour(adj_list, target)
+
+    return np.array(_subtour(adj_list, int(route_a[0])), dtype=route_a.dtype)
+
+
+def eax_crossover_batch(population, parents, dist_matrix, rng, neighbors=None):
+    """
+    Cruce al estilo EAX (Edge Assembly Crossover) para cada par de padres.
+
+    EAX arma el hijo casi solo con aristas de los padres: toma las de A, cambia
+    las de un AB-cycle (aristas que alternan entre A y B) por las de B y une
+    los subciclos que quedan con el intercambio 2-opt más barato entre los
+    vecinos cercanos. Es la versión de un solo AB-cycle elegido al azar y un
+    hijo por par (ver _eax_child).
+
+    Parámetros:
+    - population, parents: igual que order_crossover_batch
+    - dist_matrix: matriz de distancias
+    - rng: generador de numpy
+    - neighbors: listas de vecinos (build_neighbor_lists); None = se calculan
+      con EAX_NEIGHBORS vecinos (mejor pasarlas si se llama en cada generación)
+
+    Cada hijo se arma en un bucle de Python sobre las tablas de adyacencia,
+    así que es más caro por hijo que OX1, pero necesita muchas menos
+    generaciones para llegar a la misma calidad.
+
+    Retorna: arreglo (m, n) con los hijos.
+    """
+    m, n = len(parents), population.shape[1]
+    if n < 5:
+        return population[parents[:, 0]].copy()
+    if neighbors is None:
+        neighbors = build_neighbor_lists(dist_matrix, EAX_NEIGHBORS)
+    table = adjacency_table(population)
+    children = np.empty((m, n), dtype=population.dtype)
+    for k, (a, b) in enumerate(parents.tolist()):
+        children[k] = _eax_child(population[a], table[a], table[b], dist_matrix, neighbors, rng)
+    return children
+
+
+# Operadores de cruce que acepta genetic_algorithm(crossover=...).
+# Todos reciben (population, parents, rng, dist_matrix, neighbors) y devuelven
+# los hijos (m, n); neighbors son las listas de vecinos cercanos del AG (o None).
+
+def _ox1(population, parents, rng, dist_matrix, neighbors):
+    return order_crossover_batch(population, parents, random_cut_points(len(parents),
+                                                                         population.shape[1], rng))
+
+
+def _pmx(population, parents, rng, dist_matrix, neighbors):
+    return pmx_crossover_batch(population, parents, random_cut_points(len(parents),
+                                                                       population.shape[1], rng))
+
+
+def _erx(population, parents, rng, dist_matrix, neighbors):
+    return edge_recombination_batch(population, parents, rng)
+
+
+def _eax(population, parents, rng, dist_matrix, neighbors):
+    return eax_crossover_batch(population, parents, dist_matrix, rng, neighbors)
+
+
+CROSSOVER_OPERATORS = {
+    'ox1': _ox1,  # Order Crossover (por defecto)
+    'pmx': _pmx,  # Partially Mapped Crossover
+    'erx': _erx,  # Edge Recombination
+    'eax': _eax,  # Edge Assembly (un AB-cycle por hijo)
+}
+
+
+def resolve_crossover(crossover):
+    """Devuelve la función de CROSSOVER_OPERATORS para un nombre (o la función misma)."""
+    if callable(crossover):
+        return crossover
+    if crossover not in CROSSOVER_OPERATORS:
+        raise ValueError(f"Cruce desconocido: {crossover!r} "
+                         f"(opciones: {tuple(CROSSOVER_OPERATORS)})")
+    return CROSSOVER_OPERATORS[crossover]
+
+
+def next_generation(population, costs, dist_matrix, mutation_rate, elite_size, tournament_size, rng,
+                    profiler=None, crossover='ox1', neighbors=None, fitness_cache=None,
+                    deduplicate=False):
+    """
+    Produce la siguiente generación a partir de una población ya evaluada.
+
+    1. Los `elite_size` mejores pasan sin cambios (elitismo), junto con su costo:
+       no se vuelven a evaluar
+    2. El resto se crea cruzando padres elegidos por torneo con el operador
+       `crossover` (un nombre de CROSSOVER_OPERATORS; `neighbors` son las listas
+       de vecinos cercanos que usa 'eax'); solo estos hijos se evalúan
+    3. Los hijos se mutan con swap y su costo se corrige con un delta O(1)
+
+    Con un `fitness_cache` (FitnessCache) los hijos que repiten una ruta ya
+    evaluada toman su costo del memo. Con deduplicate=True los hijos que repiten
+    una ruta de la nueva población reciben una perturbación double-bridge (y un
+    swap) y se vuelven a evaluar, para no perder diversidad.
+
+    Con un `profiler` (ver profiling.py) se mide el tiempo de cada fase.
+
+    Retorna: (population, costs) de la nueva generación; la élite va en las primeras filas.
+    """
+    pop_size = len(population)
+    n_elite = min(elite_size, pop_size)
+    n_children = pop_size - n_elite
+    if profiler is not None:
+        t = time.perf_counter_ns()
+
+    elite_idx = select_elite(costs, n_elite)
+    if profiler is not None:
+        t = profiler.record('elitism', t)
+
+    # Todos los torneos de la generación se resuelven de una vez
+    parents = tournament_selection_array(costs, 2 * n_children, tournament_size, rng)
+    parents = parents.reshape(n_children, 2)
+    if profiler is not None:
+        t = profiler.record('selection', t)
+
+    # Cruzamos todos los pares de una vez, evaluamos solo a los hijos y los mutamos
+    children = resolve_crossover(crossover)(population, parents, rng, dist_matrix, neighbors)
+    if profiler is not None:
+        t = profiler.record('crossover', t)
+    child_costs, evaluated = evaluate_with_cache(children, dist_matrix, fitness_cache)
+    if profiler is not None:
+        t = profiler.record('evaluation', t, evaluations=evaluated)
+    mutated, _, _ = swap_mutation_batch(children, mutation_rate, rng, child_costs, dist_matrix)
+    if fitness_cache is not None:
+        fitness_cache.store(children[mutated], child_costs[mutated])  # Costos exactos por delta
+    if profiler is not None:
+        t = profiler.record('mutation', t)
+
+    new_population = np.concatenate([population[elite_idx], children])
+    new_costs = np.concatenate([costs[elite_idx], child_costs])
+    if profiler is not None:
+        t = profiler.record('replacement', t)
+
+    if deduplicate:
+        repeated = duplicate_rows(new_population)
+        repeated[:n_elite] = False  # La élite nunca se toca
+        rows = np.flatnonzero(repeated)
+        if len(rows):
+            shaken = double_bridge_batch(new_population[rows], rng)
+            swap_mutation_batch(shaken, 1.0, rng)
+            new_population[rows] = shaken
+            new_costs[rows], evaluated = evaluate_with_cache(shaken, dist_matrix, fitness_cache)
+        else:
+            evaluated = 0
+        if profiler is not None:
+            profiler.record('deduplication', t, evaluations=evaluated)
+    return new_population, new_costs
+
+
+# ─────────────────────────────────────────────
+# CONTROL DE PARADA Y REINICIO
+# ─────────────────────────────────────────────
+# Con un número fijo de generaciones el AG sigue corriendo aunque la historia
+# lleve cientos de generaciones plana. Estos criterios permiten cortar antes
+# (o sacudir la población) y dar semántica de "la mejor respuesta en X segundos".
+
+# Razones de parada que reporta genetic_algorithm(..., return_info=True)
+STOP_REASONS = ('generations', 'time_limit', 'target', 'stagnation', 'diversity')
+
+# Qué hacer cuando la búsqueda se estanca o la población colapsa
+STAGNATION_ACTIONS = ('stop', 'restart', 'hypermutation')
+
+
+def population_diversity(population):
+    """
+    Diversidad de la población medida por aristas (no dirigidas) distintas.
+
+    Cada ruta tiene n aristas; si todas las rutas fueran iguales habría solo n
+    aristas distintas, y como máximo hay n * pop_size (o n*(n-1)/2, todas las
+    aristas posibles, en instancias chicas). El resultado se escala a [0, 1]:
+    0 = todas las rutas son el mismo ciclo, 1 = el máximo de aristas distintas posible.
+    """
+    pop_size, n = population.shape
+    if pop_size < 2 or n < 4:
+        return 0.0  # Con 3 ciudades o menos solo existe un ciclo
+    a = population.astype(np.int64)
+    b = np.roll(a, -1, axis=1)
+    keys = np.minimum(a, b) * n + np.maximum(a, b)  # Cada arista como un solo entero
+    if n * n <= max(1 << 20, 4 * keys.size):
+        # Pocas aristas posibles: marcarlas en un arreglo booleano es más rápido que ordenar
+        seen = np.zeros(n * n, dtype=bool)
+        seen[keys.ravel()] = True
+        distinct = np.count_nonzero(seen)
+    else:
+        ordered = np.sort(keys, axis=None)
+        distinct = 1 + np.count_nonzero(ordered[1:] != ordered[:-1])
+    most = min(n * pop_size, n * (n - 1) // 2)
+    return (distinct - n) / (most - n)
+
+
+# ─────────────────────────────────────────────
+# CONTROL ADAPTATIVO DE PARÁMETROS
+# ─────────────────────────────────────────────
+# Una tasa de mutación y un torneo fijos sirven para una fase de la búsqueda y
+# no para otra: al principio conviene explotar (torneo grande, poca mutación) y
+# cuando la población colapsa o deja de mejorar, explorar (más mutación, menos
+# presión selectiva). El controlador mira la diversidad y la mejora reciente.
+
+# Generaciones entre ajustes del control adaptativo
+ADAPTIVE_WINDOW = 20
+
+
+class AdaptiveController:
+    """
+    Ajusta mutation_rate y tournament_size cada `window` generaciones:
+
+    - diversidad < low_diversity o mejora relativa < min_improvement en la
+      ventana → explorar: mutación × step, torneo - 1
+    - diversidad > high_diversity y mejorando → explotar: mutación / step, torneo + 1
+
+    La mutación se mantiene en [min_rate, max_rate] y el torneo en
+    [2, max_tournament] (por defecto, el doble del inicial).
+    """
+
+    def __init__(self, mutation_rate, tournament_size, window=ADAPTIVE_WINDOW,
+                 low_diversity=0.15, high_diversity=0.5, min_improvement=1e-3,
+                 step=1.25, min_rate=0.01, max_rate=0.5, max_tournament=None):
+        self.mutation_rate = mutation_rate
+        self.tournament_size = tournament_size
+        self.window = window
+        self.low_diversity = low_diversity
+        self.high_diversity = high_diversity
+        self.min_improvement = min_improvement
+        self.step = step
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.max_tournament = max_tournament or max(2, 2 * tournament_size)
+        self.adjustments = 0
+
+    def due(self, generation):
+        """True si en esta generación toca ajustar (y hace falta medir la diversidad)."""
+        return generation > 0 and generation % self.window == 0
+
+    def update(self, generation, diversity, history):
+        """
+        Ajusta los parámetros si toca en `generation`, con la diversidad actual
+        y la historia del mejor costo. Retorna (mutation_rate, tournament_size).
+        """
+        if self.due(generation) and len(history) > self.window:
+            past, now = history[-self.window - 1], history[-1]
+            improvement = (past - now) / past if past > 0 else 0.0
+            if diversity < self.low_diversity or improvement < self.min_improvement:
+                self.mutation_rate = min(self.max_rate, self.mutation_rate * self.step)
+                self.tournament_size = max(2, self.tournament_size - 1)
+                self.adjustments += 1
+            elif diversity > self.high_diversity:
+                self.mutation_rate = max(self.min_rate, self.mutation_rate / self.step)
+                self.tournament_size = min(self.max_tournament, self.tournament_size + 1)
+                self.adjustments += 1
+        return self.mutation_rate, self.tournament_size
+
+    def state(self):
+        """Estado variable (para checkpoints)."""
+        return {'mutation_rate': self.mutation_rate, 'tournament_size': self.tournament_size,
+                'adjustments': self.adjustments}
+
+    def restore(self, state):
+        self.mutation_rate = state['mutation_rate']
+        self.tournament_size = state['tournament_size']
+        self.adjustments = state['adjustments']
+
+
+def perturb_population(population, costs, dist_matrix, n_elite, action, rng, fractions=None):
+    """
+    Sacude una población estancada conservando su élite (las primeras `n_elite`
+    filas de next_generation). Retorna (population, costs).
+
+    - action='restart': el resto de la población se reemplaza por una nueva
+      población inicial (aleatoria o sembrada según `fractions`)
+    - action='hypermutation': al resto se le aplica una perturbación double-bridge
+      (cuatro aristas cambiadas de una vez) más la mutación swap
+    """
+    pop_size, n = population.shape
+    elite_idx = select_elite(costs, n_elite)
+    rest = pop_size - len(elite_idx)
+
+    if action == 'restart':
+        if fractions:
+            others = initial_population(dist_matrix, rest, rng, fractions)
+        else:
+            others = create_population_array(rest, n, rng)
+    else:
+        keep = np.ones(pop_size, dtype=bool)
+        keep[elite_idx] = False
+        others = double_bridge_batch(population[keep], rng)
+        swap_mutation_batch(others, 1.0, rng)
+
+    population = np.concatenate([population[elite_idx], others])
+    costs = np.concatenate([costs[elite_idx], evaluate_population_array(others, dist_matrix)])
+    return population, costs
+
+
 # ─────────────────────────────────────────────
 # ALGORITMO GENÉTICO PRINCIPAL
 # ─────────────────────────────────────────────
 
-def genetic_algorithm(
+def genetic_algorithm_iter(
     dist_matrix,
     pop_size=100,        # Tamaño de la población
     generations=500,     # Número de generaciones
     mutation_rate=0.1,   # Probabilidad de mutación (10%)
     elite_size=10,       # Cuántos mejores individuos pasan sin cambios (elitismo)
     tournament_size=5,   # Tamaño del torneo para selección
-    seed=42              # Semilla para reproducibilidad
+    seed=42,             # Semilla para reproducibilidad
+    crossover='ox1',     # Operador de cruce: 'ox1', 'pmx', 'erx' o 'eax'
+    local_search_rate=0.0,  # Fracción de hijos mejorados con 2-opt/Or-opt (AG memético)
+    local_search_k=10,      # Vecinos candidatos por ciudad para la búsqueda local
+    initialization=None,    # None/'random', 'heuristic' o un diccionario de fracciones
+    time_limit=None,        # Segundos máximos de ejecución
+    stagnation=None,        # Generaciones seguidas sin mejorar antes de actuar
+    target_cost=None,       # Costo con el que se da por terminado (ej. el óptimo conocido)
+    min_diversity=None,     # Diversidad mínima (population_diversity) antes de actuar
+    on_stagnation='stop',   # 'stop', 'restart' o 'hypermutation'
+    checkpoint_path=None,   # Archivo .npz donde guardar checkpoints (None = sin checkpoints)
+    checkpoint_interval=100,  # Cada cuántas generaciones se guarda
+    resume=False,           # Retomar desde checkpoint_path si existe
+    profiler=None,          # Profiler (profiling.py) para medir el tiempo de cada fase
+    fitness_cache=None,     # Rutas que guarda el memo de costos (None = sin memo)
+    deduplicate=False,      # Perturbar los hijos que repiten una ruta de la población
+    adaptive=False,         # Ajustar mutation_rate y tournament_size durante la corrida
+    *,
+    track_diversity=True    # Calcular la diversidad de cada generación para los snapshots
 ):
     """
-    Ejecuta el Algoritmo Genético completo para el TSP.
+    El Algoritmo Genético como generador: produce un "snapshot" por generación.
 
-    Parámetros explicados:
-    - pop_size: más grande → más diversidad, pero más lento
-    - generations: más generaciones → más tiempo para converger
-    - mutation_rate: muy bajo → convergencia prematura; muy alto → búsqueda aleatoria
-    - elite_size: elitismo asegura que las mejores soluciones no se pierdan
-    - tournament_size: controla la presión selectiva
-    - seed: fijar la semilla permite reproducir exactamente los mismos resultados
+    Recibe los mismos parámetros que genetic_algorithm, en el mismo orden (ver
+    allí su explicación); track_diversity, que solo tiene sentido aquí, va por nombre.
+    Quien lo recorre puede mostrar el progreso en vivo, graficar la historia
+    mientras crece o dejar de iterar cuando quiera (cancelar): la mejor ruta
+    hasta ese momento siempre está en el último snapshot.
 
-    Retorna:
-    - best_route: la mejor ruta encontrada
-    - best_cost: su costo total
-    - history: lista con el mejor costo por generación (para graficar convergencia)
-    - elapsed: tiempo total de ejecución
+    Cada snapshot es un diccionario con:
+    - 'generation': índice de la generación (empieza en 0)
+    - 'best_cost', 'best_route': lo mejor encontrado hasta ahora
+    - 'mean_cost': costo medio de la población en esta generación
+    - 'diversity': population_diversity de la población (None si track_diversity=False)
+    - 'mutation_rate', 'tournament_size': los usados en esta generación
+      (cambian durante la corrida con adaptive=True)
+    - 'elapsed': segundos transcurridos desde el inicio
+    - 'history': la lista del mejor costo por generación (la misma lista, que va creciendo)
+    - 'stop_reason': None mientras sigue; en el último snapshot, por qué terminó
+
+    Al terminar, el valor de retorno del generador (StopIteration.value) es la
+    tupla completa (best_route, best_cost, history, elapsed, info) que
+    genetic_algorithm(..., return_info=True) devuelve.
     """
+    if on_stagnation not in STAGNATION_ACTIONS:
+        raise ValueError(f"Acción desconocida: {on_stagnation!r} (opciones: {STAGNATION_ACTIONS})")
+    resolve_crossover(crossover)  # Un nombre inválido falla antes de empezar
 
-    random.seed(seed)  # Fijamos la semilla aleatoria para reproducibilidad
+    rng = np.random.default_rng(seed)  # Generador de numpy: único origen de azar del AG
+    memo = FitnessCache(fitness_cache) if fitness_cache else None
+    controller = AdaptiveController(mutation_rate, tournament_size) if adaptive else None
 
     start_time = time.time()
+    if profiler is not None:
+        profiler.start()
+        t = time.perf_counter_ns()
+    dist_matrix = as_distance_matrix(dist_matrix)  # Matriz numpy o condensada
     n = len(dist_matrix)  # Número de ciudades
+    fractions = resolve_initialization(initialization)
+
+    state = None
+    if resume and checkpoint_path is not None and os.path.exists(checkpoint_path):
+        state = load_checkpoint(checkpoint_path)
+        if state['population'].shape != (pop_size, n):
+            raise ValueError(f"El checkpoint es de una población {state['population'].shape}; "
+                             f"se esperaba {(pop_size, n)}: {checkpoint_path}")
+        if profiler is not None:
+            t = profiler.record('checkpoint', t)
 
-    # ── Paso 1: Crear población inicial ──
-    population = create_population(pop_size, n)
+    if state is not None:
+        # ── Retomamos: todo el estado viene del checkpoint ──
+        rng = state['rng']
+        population, costs = state['population'], state['costs']
+        best_route, best_cost, history = state['best_route'], state['best_cost'], state['history']
+        start_gen = state['generation']
+        last_improvement = state['last_improvement']
+        restarts = state['restarts']
+        start_time -= state['elapsed']  # El tiempo ya corrido cuenta para elapsed y time_limit
+        if controller is not None and state.get('controller'):
+            controller.restore(state['controller'])
+            mutation_rate, tournament_size = controller.mutation_rate, controller.tournament_size
+    else:
+        # ── Paso 1: Crear población inicial ──
+        if fractions:
+            population = initial_population(dist_matrix, pop_size, rng, fractions)
+        else:
+            population = create_population_array(pop_size, n, rng)
+        if profiler is not None:
+            t = profiler.record('initialization', t)
 
-    best_route = None      # La mejor ruta encontrada hasta ahora
-    best_cost = float('inf')  # El mejor costo (inicialmente infinito)
-    history = []           # Guardamos el mejor costo de cada generación
+        # La población se evalúa completa UNA sola vez; después cada individuo
+        # lleva su costo consigo (la élite lo conserva y los hijos se evalúan al nacer)
+        costs, evaluated = evaluate_with_cache(population, dist_matrix, memo)
+        if profiler is not None:
+            t = profiler.record('evaluation', t, evaluations=evaluated)
+
+        best_route = None      # La mejor ruta encontrada hasta ahora
+        best_cost = float('inf')  # El mejor costo (inicialmente infinito)
+        history = []           # Guardamos el mejor costo de cada generación
+        start_gen = 0
+        last_improvement = 0   # Generación de la última mejora (para detectar estancamiento)
+        restarts = 0
+
+    # Listas de vecinos cercanos para el paso memético (local_search_k) y el cruce
+    # EAX (siempre EAX_NEIGHBORS, como en eax_crossover_batch y el modelo de islas).
+    # Se calculan una sola vez; si los tamaños coinciden, son la misma lista.
+    eax_neighbors = None
+    neighbors = None
+    if crossover == 'eax':
+        eax_neighbors = build_neighbor_lists(dist_matrix, EAX_NEIGHBORS)
+    if local_search_rate > 0:
+        if eax_neighbors is None or local_search_k != EAX_NEIGHBORS:
+            neighbors = build_neighbor_lists(dist_matrix, local_search_k).tolist()
+        else:
+            neighbors = eax_neighbors.tolist()
+    if profiler is not None and (eax_neighbors is not None or neighbors is not None):
+        profiler.record('neighbor_lists', t)
+    n_elite = min(elite_size, pop_size)
+    measure_diversity = track_diversity or min_diversity is not None or profiler is not None
+
+    deadline = start_time + time_limit if time_limit is not None else None
+    stop_reason = None
+    gen = start_gen - 1
 
     # ── Paso 2: Iterar por generaciones ──
-    for gen in range(generations):
+    for gen in range(start_gen, generations):
+        if profiler is not None:
+            t = time.perf_counter_ns()
 
-        # Evaluamos toda la población: calculamos fitness y ordenamos de mejor a peor
-        evaluated = evaluate_population(population, dist_matrix)
+        # ── Checkpoint: estado al inicio de la generación `gen` ──
+        if checkpoint_path is not None and gen > start_gen and gen % checkpoint_interval == 0:
+            save_checkpoint(checkpoint_path, {
+                'population': population, 'costs': costs,
+                'best_route': best_route, 'best_cost': best_cost, 'history': history,
+                'generation': gen, 'last_improvement': last_improvement,
+                'restarts': restarts, 'elapsed': time.time() - start_time, 'rng': rng,
+                'controller': controller.state() if controller is not None else None,
+            })
+            if profiler is not None:
+                t = profiler.record('checkpoint', t)
 
-        # ── Elitismo: los mejores `elite_size` individuos pasan directamente ──
-        # [1] en la tupla es el individuo (la ruta); [0] sería el fitness
-        new_population = [copy.deepcopy(ind) for _, ind in evaluated[:elite_size]]
-        # copy.deepcopy() hace una copia profunda para evitar referencias compartidas
+        diversity = None
+        if measure_diversity or (controller is not None and controller.due(gen)):
+            diversity = population_diversity(population)
+            if profiler is not None:
+                t = profiler.record('diversity', t)
 
         # ── Verificamos si el mejor de esta generación es el mejor global ──
-        best_of_gen_cost = route_cost(evaluated[0][1], dist_matrix)  # evaluated[0] = mejor
-        if best_of_gen_cost < best_cost:
-            best_cost = best_of_gen_cost
-            best_route = evaluated[0][1][:]  # Guardamos una copia del mejor individuo
+        best_idx = np.argmin(costs)
+        if costs[best_idx] < best_cost:
+            best_cost = costs[best_idx].item()
+            best_route = population[best_idx].tolist()  # Copia como lista de Python
+            last_improvement = gen
 
         history.append(best_cost)  # Registramos el mejor costo de esta generación
+        if controller is not None:
+            mutation_rate, tournament_size = controller.update(gen, diversity, history)
+
+        # ── Criterios de parada ──
+        stalled = stagnation is not None and gen - last_improvement >= stagnation
+        collapsed = min_diversity is not None and diversity < min_diversity
+
+        if target_cost is not None and best_cost <= target_cost:
+            stop_reason = 'target'
+        elif deadline is not None and time.time() >= deadline:
+            stop_reason = 'time_limit'
+        elif (stalled or collapsed) and on_stagnation == 'stop':
+            stop_reason = 'stagnation' if stalled else 'diversity'
+        elif gen == generations - 1:
+            stop_reason = 'generations'
+        if profiler is not None:
+            profiler.record('bookkeeping', t)
+
+        yield {
+            'generation': gen,
+            'best_cost': best_cost,
+            'best_route': best_route,
+            'mean_cost': costs.mean().item(),
+            'diversity': diversity,
+            'mutation_rate': mutation_rate,
+            'tournament_size': tournament_size,
+            'elapsed': time.time() - start_time,
+            'history': history,
+            'stop_reason': stop_reason,
+        }
+        if stop_reason is not None:
+            if profiler is not None:
+                profiler.end_generation(gen, diversity)
+            break
+
+        if profiler is not None:
+            t = time.perf_counter_ns()
+        if stalled or collapsed:
+            population, costs = perturb_population(
+                population, costs, dist_matrix, n_elite, on_stagnation, rng, fractions
+            )
+            restarts += 1
+            last_improvement = gen  # La ventana de estancamiento vuelve a empezar
+            if profiler is not None:
+                profiler.record('perturbation', t, evaluations=pop_size - n_elite)
+
+        # ── Paso 3: Élite + cruce + mutación; la nueva población reemplaza a la anterior ──
+        population, costs = next_generation(
+            population, costs, dist_matrix, mutation_rate, elite_size, tournament_size, rng,
+            profiler, crossover, eax_neighbors, memo, deduplicate
+        )
+
+        # ── Paso memético (opcional): búsqueda local sobre una fracción de los hijos ──
+        if neighbors is not None:
+            if profiler is not None:
+                t = time.perf_counter_ns()
+            chosen = rng.random(pop_size - n_elite) < local_search_rate
+            improve_population(
+                population, n_elite + np.flatnonzero(chosen), dist_matrix, neighbors, costs
+            )
+            if profiler is not None:
+                profiler.record('local_search', t, evaluations=int(chosen.sum()))
+
+        if profiler is not None:
+            profiler.end_generation(gen, diversity)
+
+    elapsed = time.time() - start_time
+    info = {
+        'stop_reason': stop_reason or 'generations',
+        'generations': gen + 1,
+        'restarts': restarts,
+    }
+    if memo is not None:
+        info['fitness_cache'] = memo.cache_info()
+    if controller is not None:
+        info['adaptive'] = controller.state()
+    return best_route, best_cost, history, elapsed, info
+
+
+def genetic_algorithm(
+    dist_matrix,
+    pop_size=100,        # Tamaño de la población
+    generations=500,     # Número de generaciones
+    mutation_rate=0.1,   # Probabilidad de mutación (10%)
+    elite_size=10,       # Cuántos mejores individuos pasan sin cambios (elitismo)
+    tournament_size=5,   # Tamaño del torneo para selección
+    seed=42,             # Semilla para reproducibilidad
+    crossover='ox1',     # Operador de cruce: 'ox1', 'pmx', 'erx' o 'eax'
+    local_search_rate=0.0,  # Fracción de hijos mejorados con 2-opt/Or-opt (AG memético)
+    local_search_k=10,      # Vecinos candidatos por ciudad para la búsqueda local
+    initialization=None,    # None/'random', 'heuristic' o un diccionario de fracciones
+    time_limit=None,        # Segundos máximos de ejecución
+    stagnation=None,        # Generaciones seguidas sin mejorar antes de actuar
+    target_cost=None,       # Costo con el que se da por terminado (ej. el óptimo conocido)
+    min_diversity=None,     # Diversidad mínima (population_diversity) antes de actuar
+    on_stagnation='stop',   # 'stop', 'restart' o 'hypermutation'
+    checkpoint_path=None,   # Archivo .npz donde guardar checkpoints (None = sin checkpoints)
+    checkpoint_interval=100,  # Cada cuántas generaciones se guarda
+    resume=False,           # Retomar desde checkpoint_path si existe
+    profiler=None,          # Profiler (profiling.py) para medir el tiempo de cada fase
+    fitness_cache=None,     # Rutas que guarda el memo de costos (None = sin memo)
+    deduplicate=False,      # Perturbar los hijos que repiten una ruta de la población
+    adaptive=False,         # Ajustar mutation_rate y tournament_size durante la corrida
+    *,
+    verbose=True,           # Imprimir el progreso
+    return_info=False       # Agregar el diccionario `info` al resultado
+):
+    """
+    Ejecuta el Algoritmo Genético completo para el TSP.
+
+    Parámetros explicados:
+    - pop_size: más grande → más diversidad, pero más lento
+    - generations: más generaciones → más tiempo para converger
+    - mutation_rate: muy bajo → convergencia prematura; muy alto → búsqueda aleatoria
+    - elite_size: elitismo asegura que las mejores soluciones no se pierdan
+    - tournament_size: controla la presión selectiva
+    - crossover: operador de cruce (ver CROSSOVER_OPERATORS). 'ox1' conserva el
+      orden relativo de las ciudades; 'pmx' sus posiciones; 'erx' y 'eax'
+      heredan aristas de los padres, que es lo que importa en el TSP: cuestan
+      más por hijo pero convergen en muchas menos generaciones
+    - seed: fijar la semilla permite reproducir exactamente los mismos resultados
+    - local_search_rate: si es > 0, cada hijo se mejora con local_search (2-opt + Or-opt)
+      con esa probabilidad. Es más caro por generación pero converge en muchas menos.
+    - local_search_k: tamaño de las listas de candidatos de la búsqueda local
+    - initialization: cómo se crea la población inicial (ver initialization.py).
+      'heuristic' siembra parte de la población con rutas de vecino más cercano,
+      greedy edge y vecino más cercano aleatorizado; necesita muchas menos
+      generaciones para llegar a la misma calidad.
+    - verbose: imprime el progreso cada 100 generaciones (False = silencioso)
+
+    Los parámetros hasta `seed` conservan su posición original, así que
+    genetic_algorithm(D, 200, 1000, 0.1, 10) sigue funcionando; verbose y
+    return_info solo se pasan por nombre.
 
-        # ── Paso 3: Crear el resto de la nueva población por cruce y mutación ──
-        while len(new_population) < pop_size:
-            # Seleccionamos dos padres por torneo
-            parent1 = tournament_selection(evaluated, tournament_size)
-            parent2 = tournament_selection(evaluated, tournament_size)
+    Criterios de parada (todos opcionales; `generations` siempre es el máximo):
+    - time_limit: corta al agotar ese tiempo (la generación en curso termina)
+    - target_cost: corta en cuanto el mejor costo es <= target_cost
+    - stagnation: si pasan tantas generaciones sin mejorar, se aplica `on_stagnation`
+    - min_diversity: si la diversidad de aristas cae por debajo, también se
+      aplica `on_stagnation` (se mide cada generación: tiene un costo)
+    - on_stagnation: 'stop' termina; 'restart' y 'hypermutation' renuevan la
+      población sin perder la élite (ver perturb_population) y siguen
 
-            # Cruzamos para crear un hijo
-            child = order_crossover(parent1, parent2)
+    Checkpoints (ver checkpoint.py):
+    - checkpoint_path: cada `checkpoint_interval` generaciones se guarda ahí el
+      estado completo (población, costos, historia, generador de numpy)
+    - resume: si el archivo existe, la corrida continúa desde ese punto y da
+      exactamente el mismo resultado que sin la interrupción (con los mismos
+      parámetros). `elapsed` y time_limit incluyen el tiempo ya corrido.
 
-            # Aplicamos mutación
-            child = swap_mutation(child, mutation_rate)
+    Rutas repetidas:
+    - fitness_cache: tamaño (en rutas) de un memo de costos (FitnessCache); una
+      ruta ya evaluada, aunque esté rotada o invertida, no se vuelve a sumar.
+      No cambia el resultado, solo ahorra evaluaciones
+    - deduplicate: los hijos que repiten una ruta de la población se perturban
+      (double-bridge + swap), para evitar la convergencia prematura
 
-            new_population.append(child)  # Añadimos el hijo a la nueva población
+    Control adaptativo:
+    - adaptive: mutation_rate y tournament_size pasan a ser solo los valores
+      iniciales; cada ADAPTIVE_WINDOW generaciones AdaptiveController los ajusta
+      según la diversidad y la mejora reciente (más mutación y menos presión
+      selectiva al estancarse; lo contrario mientras mejora con diversidad alta)
 
-        # La nueva población reemplaza a la anterior
-        population = new_population
+    Medición (ver profiling.py):
+    - profiler: un Profiler que acumula el tiempo y las llamadas de cada fase
+      (evaluación, selección, cruce, mutación, élite...) por generación, las
+      evaluaciones por segundo y la diversidad. Sin profiler no se mide nada.
 
+    La población se guarda como un arreglo numpy (pop_size, n) junto con el
+    vector de costos de cada fila; los hijos se producen en bloque con el
+    operador de cruce y swap_mutation_batch y solo ellos se evalúan.
+    El ciclo vive en genetic_algorithm_iter; esta función lo recorre completo.
+
+    Retorna:
+    - best_route: la mejor ruta encontrada
+    - best_cost: su costo total
+    - history: lista con el mejor costo por generación (para graficar convergencia)
+    - elapsed: tiempo total de ejecución
+    Si return_info=True se agrega un quinto elemento, un diccionario con:
+    - 'stop_reason': por qué terminó (uno de STOP_REASONS)
+    - 'generations': cuántas generaciones se ejecutaron
+    - 'restarts': cuántas veces se aplicó 'restart' o 'hypermutation'
+    - 'fitness_cache': con fitness_cache, los contadores del memo (FitnessCache.cache_info)
+    - 'adaptive': con adaptive=True, los valores finales del control y cuántos ajustes hizo
+    """
+    iterator = genetic_algorithm_iter(
+        dist_matrix, pop_size=pop_size, generations=generations, mutation_rate=mutation_rate,
+        elite_size=elite_size, tournament_size=tournament_size, seed=seed, crossover=crossover,
+        local_search_rate=local_search_rate, local_search_k=local_search_k,
+        initialization=initialization, time_limit=time_limit, stagnation=stagnation,
+        target_cost=target_cost, min_diversity=min_diversity, on_stagnation=on_stagnation,
+        checkpoint_path=checkpoint_path, checkpoint_interval=checkpoint_interval, resume=resume,
+        profiler=profiler, fitness_cache=fitness_cache, deduplicate=deduplicate,
+        adaptive=adaptive, track_diversity=False,
+    )
+    first = True
+
+    while True:
+        try:
+            snapshot = next(iterator)
+        except StopIteration as stop:
+            best_route, best_cost, history, elapsed, info = stop.value
+            break
+
+        gen = snapshot['generation']
+        if not verbose:
+            continue
+        if first and gen > 0:
+            print(f"  Retomando desde la generacion {gen} | Mejor costo: {snapshot['history'][gen - 1]}")
+        first = False
         # Imprimimos progreso cada 100 generaciones
         if (gen + 1) % 100 == 0:
-            print(f"  Generacion {gen+1}/{generations} | Mejor costo: {best_cost}")
+            print(f"  Generacion {gen+1}/{generations} | Mejor costo: {snapshot['best_cost']}")
+        if snapshot['stop_reason'] not in (None, 'generations'):
+            print(f"  Parada en generacion {gen+1}/{generations} ({snapshot['stop_reason']}) "
+                  f"| Mejor costo: {snapshot['best_cost']}")
 
-    elapsed = time.time() - start_time
+    if verbose and 'fitness_cache' in info:
+        memo = info['fitness_cache']
+        print(f"  Memo de costos: {memo['hit_rate']:.1%} de aciertos "
+              f"({memo['hits']} de {memo['hits'] + memo['misses']} evaluaciones)")
 
+    if return_info:
+        return best_route, best_cost, history, elapsed, info
     return best_route, best_cost, history, elapsed
+
+
+async def genetic_algorithm_async(dist_matrix, every=1, **params):
+    """
+    Versión para asyncio de genetic_algorithm_iter: un generador asíncrono de snapshots.
+
+    Las generaciones se calculan en un hilo aparte (loop.run_in_executor), así
+    el bucle de eventos sigue atendiendo otras tareas mientras el AG corre.
+    Cada `every` generaciones se entrega un snapshot (el último siempre se entrega).
+
+    Uso:
+        async for snapshot in genetic_algorithm_async(D, generations=2000, every=50):
+            print(snapshot['generation'], snapshot['best_cost'])
+
+    Cancelar la tarea (o salir del `async for`) detiene el AG al terminar la
+    generación en curso.
+    """
+    loop = asyncio.get_running_loop()
+    iterator = genetic_algorithm_iter(dist_matrix, **params)
+    cancelled = False
+
+    def advance():
+        # Avanza hasta `every` generaciones; None si el generador ya terminó
+        snapshot = None
+        for _ in range(every):
+            if cancelled:
+                break
+            snapshot = next(iterator, None)
+            if snapshot is None or snapshot['stop_reason'] is not None:
+                break
+        return snapshot
+
+    try:
+        while True:
+            snapshot = await loop.run_in_executor(None, advance)
+            if snapshot is None:
+                return
+            yield snapshot
+            if snapshot['stop_reason'] is not None:
+                return
+    finally:
+        cancelled = True
+        # Si el hilo todavía está dentro del generador, close() no se puede llamar:
+        # el hilo ve `cancelled` y se detiene solo
+        with contextlib.suppress(ValueError):
+            iterator.close()
@@ -0,0 +1,242 @@
+# initialization.py
+# Población inicial sembrada con heurísticas
+#
+# IDEA:
+# - Con una población 100% aleatoria, el AG gasta sus primeras cientos de
+#   generaciones en redescubrir rutas que el vecino más cercano encuentra en milisegundos
+# - En su lugar, una fracción de la población se llena con rutas heurísticas:
+#   - Vecino más cercano desde distintas ciudades de inicio
+#   - Greedy edge (aristas más cortas primero) y variantes perturbadas con double-bridge
+#   - Vecino más cercano aleatorizado: en cada paso se elige al azar entre los
+#     pocos vecinos más cercanos, así cada ruta es buena pero distinta
+# - El resto sigue siendo aleatorio, y las rutas repetidas se descartan para no
+#   perder diversidad (una población de clones converge prematuramente)
+#
+# Todas las rutas se generan en bloque, como filas de un arreglo numpy (m, n).
+
+import numpy as np
+
+from src.distances import as_distance_matrix
+from src.local_search import build_neighbor_lists
+from src.nearest_neighbor import nearest_neighbor_tours
+
+# Inicializaciones con nombre que acepta genetic_algorithm(initialization=...)
+# (también se puede pasar directamente un diccionario de fracciones)
+INIT_PRESETS = {
+    'random': {},
+    'heuristic': {'nn': 0.1, 'greedy': 0.05, 'randomized_nn': 0.25},
+}
+
+# Entre cuántos vecinos cercanos elige el vecino más cercano aleatorizado
+RANDOMIZED_NN_CANDIDATES = 3
+
+
+# ─────────────────────────────────────────────
+# GREEDY EDGE
+# ─────────────────────────────────────────────
+
+def greedy_edge_tour(dist_matrix, k=10):
+    """
+    Construye una ruta con la heurística greedy edge (o "greedy matching").
+
+    Se recorren las aristas de menor a mayor costo y se acepta cada una si
+    ninguna de sus dos ciudades tiene ya grado 2 y no cierra un ciclo antes
+    de tiempo (se comprueba con union-find). Solo se consideran las aristas
+    hacia los `k` vecinos más cercanos de cada ciudad (build_neighbor_lists),
+    no las n² posibles.
+
+    Al final quedan varios caminos sueltos ("fragmentos"); se unen recorriendo
+    cada uno y saltando al extremo más cercano de otro fragmento no visitado.
+
+    Retorna: la ruta como arreglo int32 de n ciudades.
+    """
+    dist_matrix = as_distance_matrix(dist_matrix)
+    n = len(dist_matrix)
+    if n < 3:
+        return np.arange(n, dtype=np.int32)
+
+    # Aristas candidatas (i < j) sin repetir, ordenadas por costo y luego por índices
+    neighbors = build_neighbor_lists(dist_matrix, k)
+    i = np.repeat(np.arange(n), neighbors.shape[1])
+    j = neighbors.ravel().astype(np.int64)
+    pairs = np.unique(np.stack([np.minimum(i, j), np.maximum(i, j)], axis=1), axis=0)
+    lo, hi = pairs[:, 0], pairs[:, 1]
+    order = np.lexsort((hi, lo, dist_matrix[lo, hi]))
+
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # Compresión de caminos a la mitad
+            x = parent[x]
+        return x
+
+    degree = [0] * n
+    adjacent = [[] for _ in range(n)]
+    for a, b in zip(lo[order].tolist(), hi[order].tolist(), strict=True):
+        if degree[a] == 2 or degree[b] == 2:
+            continue
+        root_a, root_b = find(a), find(b)
+        if root_a == root_b:
+            continue  # Cerraría un ciclo que no pasa por todas las ciudades
+        parent[root_a] = root_b
+        degree[a] += 1
+        degree[b] += 1
+        adjacent[a].append(b)
+        adjacent[b].append(a)
+
+    # ── Unimos los fragmentos ──
+    # Extremos: ciudades con grado < 2 (una ciudad aislada es un fragmento de una sola)
+    endpoints = np.array([c for c in range(n) if degree[c] < 2])
+    fragment = np.array([find(c) for c in endpoints])
+    pending = np.ones(len(endpoints), dtype=bool)
+
+    tour = []
+    city = int(endpoints[0])
+    while True:
+        # Recorremos el fragmento desde `city` hasta su otro extremo
+        pending[fragment == find(city)] = False
+        prev = -1
+        while True:
+            tour.append(city)
+            following = [c for c in adjacent[city] if c != prev]
+            if not following:
+                break
+            prev, city = city, following[0]
+
+        if not pending.any():
+            break
+        # Saltamos al extremo pendiente más cercano
+        candidates = np.flatnonzero(pending)
+        city = int(endpoints[candidates[np.argmin(dist_matrix[city][endpoints[candidates]])]])
+
+    return np.array(tour, dtype=np.int32)
+
+
+# ─────────────────────────────────────────────
+# DIVERSIDAD
+# ─────────────────────────────────────────────
+
+def double_bridge_batch(routes, rng):
+    """
+    Aplica una perturbación double-bridge a cada fila de `routes` (m, n).
+
+    La ruta se parte en cuatro tramos A B C D y se reordena como A C B D:
+    cambia cuatro aristas a la vez y no se deshace con un solo 2-opt.
+    Para hacerlo en bloque, a cada posición se le asigna el "orden" de su tramo
+    (A=0, C=1, B=2, D=3) y un argsort estable por filas da el nuevo orden.
+
+    Retorna: arreglo (m, n) con las rutas perturbadas.
+    """
+    m, n = routes.shape
+    if n < 8:
+        return routes.copy()
+    # Tres cortes distintos por fila en 1..n-1: los 3 menores de una fila de números al azar
+    cuts = np.sort(np.argpartition(rng.random((m, n - 1)), 2, axis=1)[:, :3] + 1, axis=1)
+    positions = np.arange(n)
+    a, b, c = cuts[:, :1], cuts[:, 1:2], cuts[:, 2:]
+    key = np.where(positions < a, 0,
+          np.where(positions < b, 2,
+          np.where(positions < c, 1, 3)))
+    order = np.argsort(key, axis=1, kind='stable')
+    return np.take_along_axis(routes, order, axis=1)
+
+
+def canonical_tours(routes):
+    """
+    Forma canónica de cada ruta (m, n): la misma ruta puede escribirse empezando
+    en cualquier ciudad y en los dos sentidos. Se rota cada fila para que empiece
+    en la ciudad 0 y se invierte si la segunda ciudad es mayor que la última.
+    Dos rutas son el mismo ciclo si y solo si su forma canónica es igual.
+    """
+    m, n = routes.shape
+    if n < 3:
+        return np.sort(routes, axis=1)
+    zero = np.argmax(routes == 0, axis=1)[:, None]
+    rotated = np.take_along_axis(routes, (np.arange(n) + zero) % n, axis=1)
+    flipped = np.concatenate([rotated[:, :1], rotated[:, :0:-1]], axis=1)
+    return np.where((rotated[:, 1] > rotated[:, -1])[:, None], flipped, rotated)
+
+
+def unique_tours(routes):
+    """Quita las rutas repetidas (mismo ciclo), conservando el orden de aparición."""
+    if len(routes) == 0:
+        return routes
+    _, first = np.unique(canonical_tours(routes), axis=0, return_index=True)
+    return routes[np.sort(first)]
+
+
+# ─────────────────────────────────────────────
+# POBLACIÓN INICIAL
+# ─────────────────────────────────────────────
+
+def resolve_initialization(initialization):
+    """
+    Convierte el parámetro `initialization` del AG en un diccionario de fracciones.
+    Acepta None (aleatoria), un nombre de INIT_PRESETS o un diccionario propio.
+    """
+    if initialization is None:
+        return {}
+    if isinstance(initialization, str):
+        if initialization not in INIT_PRESETS:
+            raise ValueError(f"Inicialización desconocida: {initialization!r} "
+                             f"(opciones: {tuple(INIT_PRESETS)})")
+        return INIT_PRESETS[initialization]
+    unknown = set(initialization) - set(INIT_PRESETS['heuristic'])
+    if unknown:
+        raise ValueError(f"Fracciones desconocidas: {sorted(unknown)} "
+                         f"(opciones: {tuple(INIT_PRESETS['heuristic'])})")
+    return dict(initialization)
+
+
+def initial_population(dist_matrix, pop_size, rng, fractions=None):
+    """
+    Crea la población inicial (pop_size, n) mezclando rutas heurísticas y aleatorias.
+
+    Parámetros:
+    - dist_matrix: matriz de distancias
+    - pop_size: tamaño de la población
+    - rng: generador de numpy (np.random.default_rng)
+    - fractions: diccionario con la fracción de la población de cada tipo:
+      - 'nn': vecino más cercano desde ciudades de inicio distintas
+      - 'greedy': la ruta greedy edge más variantes con double-bridge
+      - 'randomized_nn': vecino más cercano aleatorizado desde inicios al azar
+      None o {} equivale a una población totalmente aleatoria.
+
+    Las rutas heurísticas repetidas se descartan y su lugar lo ocupan rutas
+    aleatorias, así la población nunca empieza llena de copias.
+
+    Retorna: arreglo (pop_size, n) de tipo int32.
+    """
+    dist_matrix = as_distance_matrix(dist_matrix)
+    n = len(dist_matrix)
+    fractions = fractions or {}
+
+    def count(key):
+        return int(round(fractions.get(key, 0.0) * pop_size))
+
+    n_nn = min(count('nn'), n)  # No hay más inicios distintos que ciudades
+    n_greedy = count('greedy')
+    n_randomized = count('randomized_nn')
+
+    blocks = []
+    if n_nn > 0:
+        starts = rng.choice(n, size=n_nn, replace=False)
+        blocks.append(nearest_neighbor_tours(dist_matrix, starts)[0])
+    if n_greedy > 0:
+        greedy = greedy_edge_tour(dist_matrix)[None, :]
+        variants = double_bridge_batch(np.repeat(greedy, n_greedy - 1, axis=0), rng)
+        blocks.extend([greedy, variants])
+    if n_randomized > 0:
+        starts = rng.integers(0, n, size=n_randomized)
+        blocks.append(nearest_neighbor_tours(dist_matrix, starts, rng=rng,
+                                             candidates=RANDOMIZED_NN_CANDIDATES)[0])
+
+    seeded = np.empty((0, n), dtype=np.int32)
+    if blocks:
+        seeded = unique_tours(np.concatenate(blocks).astype(np.int32))[:pop_size]
+
+    # El resto: permutaciones aleatorias, como create_population_array
+    n_random = pop_size - len(seeded)
+    base = np.tile(np.arange(n, dtype=np.int32), (n_random, 1))
+    return np.concatenate([seeded, rng.permuted(base, axis=1)])
@@ -0,0 +1,277 @@
+# island_model.py
+# Modelo de islas: varias poblaciones del AG evolucionando en paralelo
+#
+# IDEA:
+# - En lugar de UNA población grande, tenemos N "islas" (subpoblaciones)
+# - Cada isla evoluciona de forma independiente en su propio proceso (núcleo de CPU)
+# - Cada `migration_interval` generaciones, las islas intercambian a sus mejores
+#   individuos (migración), así las buenas soluciones se propagan sin que todas
+#   las islas converjan al mismo punto
+#
+# La matriz de distancias se coloca UNA vez en memoria compartida; los procesos
+# trabajadores la leen directamente en vez de recibir una copia serializada.
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.distances import CondensedDistanceMatrix, CoordinateDistanceMatrix, as_distance_matrix
+from src.genetic_algorithm import (
+    EAX_NEIGHBORS,
+    create_population_array,
+    evaluate_population_array,
+    next_generation,
+    select_elite,
+)
+from src.local_search import build_neighbor_lists
+
+# Topologías de migración soportadas
+MIGRATION_TOPOLOGIES = ('ring', 'random')
+
+
+# ─────────────────────────────────────────────
+# LADO DEL TRABAJADOR (cada proceso del pool)
+# ─────────────────────────────────────────────
+
+_worker_shm = None      # Referencia al bloque compartido (evita que se libere)
+_worker_matrix = None   # Vista de solo lectura sobre la memoria compartida
+
+
+def _init_worker(shm_name, shape, dtype, condensed_n=None):
+    """
+    Inicializador de cada proceso del pool: se conecta a la memoria compartida
+    y crea una vista numpy de la matriz de distancias (sin copiarla).
+    Si `condensed_n` no es None, el bloque es el triángulo de una
+    CondensedDistanceMatrix de n = condensed_n ciudades.
+    """
+    global _worker_shm, _worker_matrix
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    matrix = np.ndarray(shape, dtype=dtype, buffer=_worker_shm.buf)
+    matrix.flags.writeable = False  # La matriz es de solo lectura para todos
+    if condensed_n is not None:
+        matrix = CondensedDistanceMatrix(matrix, condensed_n)
+    _worker_matrix = matrix
+
+
+def _init_worker_coordinates(dist_matrix):
+    """
+    Inicializador para una CoordinateDistanceMatrix: no hay matriz que
+    compartir; cada proceso recibe las coordenadas y arma su propia caché de filas.
+    """
+    global _worker_matrix
+    _worker_matrix = dist_matrix
+
+
+def _run_epoch(population, costs, rng, generations, dist_matrix, params):
+    """
+    Evoluciona una isla (población + costos) durante `generations` generaciones.
+
+    Retorna: (population, costs, best_route, best_cost, history, rng)
+    - costs son los costos de la población final (para elegir migrantes)
+    - history es el mejor costo de cada generación dentro de esta época
+    - rng se devuelve para continuar la misma secuencia aleatoria en la siguiente época
+    """
+    best_route = None
+    best_cost = float('inf')
+    history = []
+
+    for _ in range(generations):
+        best_idx = np.argmin(costs)
+        if costs[best_idx] < best_cost:
+            best_cost = costs[best_idx].item()
+            best_route = population[best_idx].tolist()
+        history.append(best_cost)
+        population, costs = next_generation(population, costs, dist_matrix, rng=rng, **params)
+
+    return population, costs, best_route, best_cost, history, rng
+
+
+def _evolve_island(population, costs, rng, generations, params):
+    """Tarea enviada al pool: usa la matriz compartida del proceso trabajador."""
+    return _run_epoch(population, costs, rng, generations, _worker_matrix, params)
+
+
+# ─────────────────────────────────────────────
+# MIGRACIÓN
+# ─────────────────────────────────────────────
+
+def migrate(populations, costs, migration_size, topology, rng):
+    """
+    Copia los `migration_size` mejores de cada isla a otra isla, reemplazando
+    a los peores de la isla destino. Modifica `populations` y `costs` en el lugar.
+
+    - topology='ring': la isla i envía a la isla (i+1) % N
+    - topology='random': cada isla envía a otra isla elegida al azar (distinta de sí misma)
+
+    Los migrantes se eligen ANTES de reemplazar a nadie, así todas las islas
+    envían individuos de la época que acaba de terminar.
+    """
+    n_islands = len(populations)
+    if n_islands < 2 or migration_size <= 0:
+        return
+
+    if topology == 'ring':
+        targets = [(i + 1) % n_islands for i in range(n_islands)]
+    else:
+        # Desplazamiento aleatorio 1..N-1 por isla → nunca se envía a sí misma
+        offsets = rng.integers(1, n_islands, size=n_islands)
+        targets = [(i + offsets[i]) % n_islands for i in range(n_islands)]
+
+    migrants = []
+    for pop, pop_costs in zip(populations, costs, strict=True):
+        idx = select_elite(pop_costs, migration_size)
+        migrants.append((pop[idx].copy(), pop_costs[idx].copy()))
+
+    for source, target in enumerate(targets):
+        mig_pop, mig_costs = migrants[source]
+        k = len(mig_costs)
+        worst = np.argpartition(costs[target], -k)[-k:]  # Los k de mayor costo
+        populations[target][worst] = mig_pop
+        costs[target][worst] = mig_costs
+
+
+# ─────────────────────────────────────────────
+# ALGORITMO GENÉTICO CON ISLAS
+# ─────────────────────────────────────────────
+
+def island_genetic_algorithm(
+    dist_matrix,
+    n_islands=4,           # Número de subpoblaciones
+    pop_size=100,          # Tamaño de CADA isla
+    generations=500,       # Generaciones totales
+    mutation_rate=0.1,
+    elite_size=10,
+    tournament_size=5,
+    crossover='ox1',
+    migration_interval=50,  # Cada cuántas generaciones migran los mejores
+    migration_size=2,       # Cuántos individuos envía cada isla
+    topology='ring',        # 'ring' o 'random'
+    workers=None,           # Procesos del pool (None = uno por isla, sin pasar de los núcleos)
+    seed=42,
+    return_info=False
+):
+    """
+    Ejecuta el AG con modelo de islas en varios procesos.
+
+    Los parámetros del AG (pop_size, mutation_rate, crossover, ...) son los mismos de
+    genetic_algorithm y se aplican a cada isla. Con workers=1 todas las islas
+    se evolucionan en el proceso actual (útil para depurar).
+
+    Retorna (igual que genetic_algorithm):
+    - best_route, best_cost, history, elapsed
+      history es el mejor costo global (entre todas las islas) por generación
+    Si return_info=True se agrega un quinto elemento, un diccionario con:
+    - 'island_histories': lista con la historia de cada isla
+    - 'island_best_costs': mejor costo alcanzado por cada isla
+    """
+    if topology not in MIGRATION_TOPOLOGIES:
+        raise ValueError(f"Topología desconocida: {topology!r} (opciones: {MIGRATION_TOPOLOGIES})")
+
+    start_time = time.time()
+    dist_matrix = as_distance_matrix(dist_matrix)
+    n = len(dist_matrix)
+
+    # Una semilla independiente por isla + una para la migración
+    seeds = np.random.SeedSequence(seed).spawn(n_islands + 1)
+    island_rngs = [np.random.default_rng(s) for s in seeds[:n_islands]]
+    migration_rng = np.random.default_rng(seeds[n_islands])
+
+    populations = [create_population_array(pop_size, n, r) for r in island_rngs]
+    costs = [evaluate_population_array(p, dist_matrix) for p in populations]
+
+    params = {
+        'mutation_rate': mutation_rate,
+        'elite_size': elite_size,
+        'tournament_size': tournament_size,
+        'crossover': crossover,
+    }
+    if crossover == 'eax':
+        # Las listas de vecinos de EAX se calculan UNA vez; sin ellas
+        # eax_crossover_batch las recalcularía en cada generación de cada isla
+        params['neighbors'] = build_neighbor_lists(dist_matrix, EAX_NEIGHBORS)
+
+    if workers is None:
+        workers = min(n_islands, os.cpu_count() or 1)
+
+    island_histories = [[] for _ in range(n_islands)]
+    island_best = [float('inf')] * n_islands
+    island_routes = [None] * n_islands
+
+    shm = None
+    pool = None
+    try:
+        if workers > 1 and isinstance(dist_matrix, CoordinateDistanceMatrix):
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker_coordinates,
+                initargs=(dist_matrix,),
+            )
+        elif workers > 1:
+            # Copiamos la matriz UNA vez a memoria compartida
+            # (de una matriz condensada solo se comparte su triángulo)
+            condensed = isinstance(dist_matrix, CondensedDistanceMatrix)
+            data = dist_matrix.data if condensed else np.ascontiguousarray(dist_matrix)
+            shm = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+            shared = np.ndarray(data.shape, dtype=data.dtype, buffer=shm.buf)
+            shared[:] = data
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(shm.name, data.shape, data.dtype.str, n if condensed else None),
+            )
+
+        done = 0
+        while done < generations:
+            epoch = min(migration_interval, generations - done) if migration_interval > 0 else generations - done
+
+            if pool is not None:
+                futures = [
+                    pool.submit(_evolve_island, populations[i], costs[i], island_rngs[i], epoch, params)
+                    for i in range(n_islands)
+                ]
+                results = [f.result() for f in futures]
+            else:
+                results = [
+                    _run_epoch(populations[i], costs[i], island_rngs[i], epoch, dist_matrix, params)
+                    for i in range(n_islands)
+                ]
+
+            for i, (pop, pop_costs, route, cost, hist, rng) in enumerate(results):
+                populations[i] = pop
+                costs[i] = pop_costs
+                island_rngs[i] = rng  # Estado aleatorio actualizado por el trabajador
+                if cost < island_best[i]:
+                    island_best[i] = cost
+                    island_routes[i] = route
+                # La historia de la época es local; la combinamos con el mejor previo de la isla
+                prev = island_histories[i][-1] if island_histories[i] else float('inf')
+                island_histories[i].extend(min(prev, h) for h in hist)
+
+            done += epoch
+            if done < generations:
+                migrate(populations, costs, migration_size, topology, migration_rng)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if shm is not None:
+            shm.close()
+            shm.unlink()  # Liberamos la memoria compartida
+
+    # Historia global: en cada generación, el mejor entre todas las islas
+    history = np.min(np.array(island_histories), axis=0).tolist()
+    best_island = int(np.argmin(island_best))
+    best_route = island_routes[best_island]
+    best_cost = island_best[best_island]
+
+    elapsed = time.time() - start_time
+
+    if return_info:
+        info = {
+            'island_histories': island_histories,
+            'island_best_costs': island_best,
+        }
+        return best_route, best_cost, history, elapsed, info
+    return best_route, best_cost, history, elapsed
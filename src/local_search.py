@@ -0,0 +1,313 @@
+# local_search.py
+# Búsqueda local para el TSP: 2-opt y Or-opt
+#
+# IDEA:
+# - Partimos de una ruta completa (por ejemplo la del vecino más cercano)
+# - Buscamos un cambio pequeño que la mejore (un "movimiento")
+# - Si lo encontramos lo aplicamos y seguimos; si no, la ruta es un óptimo local
+#
+# MOVIMIENTOS:
+# - 2-opt: quitamos dos aristas y reconectamos invirtiendo el tramo entre ellas.
+#   Elimina los "cruces" de la ruta.
+#     ... a b ... c d ...  →  ... a c ... b d ...
+# - Or-opt: movemos un tramo corto (1 a 3 ciudades) a otro lugar de la ruta,
+#   opcionalmente invertido.
+#
+# TRUCOS PARA QUE SEA RÁPIDO:
+# - Listas de candidatos: para cada ciudad solo probamos sus k vecinos más cercanos
+#   (una buena arista nueva casi siempre une ciudades cercanas)
+# - Don't-look bits: una cola de ciudades "activas"; una ciudad que no logró mejorar
+#   sale de la cola y solo vuelve si una de sus aristas cambia
+# - Evaluación delta O(1): el efecto de un movimiento es la diferencia entre las
+#   aristas nuevas y las quitadas; no hace falta recalcular el costo de la ruta
+#
+# Se asume una matriz de distancias simétrica (como las instancias TSPLIB del proyecto).
+
+from collections import deque
+
+import numpy as np
+
+from src.distances import as_distance_matrix
+from src.nearest_neighbor import route_cost
+
+# Tolerancia para aceptar una mejora (evita ciclos por errores de redondeo con floats)
+EPSILON = 1e-9
+
+# Longitudes de tramo que prueba Or-opt
+OR_OPT_SEGMENTS = (1, 2, 3)
+
+# Máximo de distancias por bloque de filas en build_neighbor_lists (hasta 1024
+# filas; con muchas ciudades, menos, para que el bloque no ocupe gigabytes)
+NEIGHBOR_BLOCK_ELEMENTS = 1 << 22
+
+
+# ─────────────────────────────────────────────
+# LISTAS DE CANDIDATOS
+# ─────────────────────────────────────────────
+
+def build_neighbor_lists(dist_matrix, k=10):
+    """
+    Calcula, para cada ciudad, sus `k` vecinos más cercanos ordenados por distancia.
+
+    Usa np.argpartition por bloques de filas, así nunca ordena filas completas
+    ni crea copias de toda la matriz a la vez. Con una CoordinateDistanceMatrix
+    cada bloque se calcula de las coordenadas: la memoria no depende de n².
+
+    Retorna: arreglo (n, k) de índices de ciudades.
+    """
+    dist_matrix = as_distance_matrix(dist_matrix)
+    n = len(dist_matrix)
+    k = max(0, min(k, n - 1))
+    neighbors = np.empty((n, k), dtype=np.int32)
+    if k == 0:
+        return neighbors
+
+    block = max(1, min(1024, NEIGHBOR_BLOCK_ELEMENTS // n))
+    for start in range(0, n, block):
+        rows = dist_matrix[start:start + block].astype(float)
+        idx = np.arange(start, start + len(rows))
+        rows[idx - start, idx] = np.inf  # Una ciudad no es vecina de sí misma
+        part = np.argpartition(rows, k - 1, axis=1)[:, :k]
+        # Orden por distancia; los empates se resuelven por índice de ciudad
+        order = np.lexsort((part, np.take_along_axis(rows, part, axis=1)), axis=-1)
+        neighbors[start:start + len(rows)] = np.take_along_axis(part, order, axis=1)
+
+    return neighbors
+
+
+# ─────────────────────────────────────────────
+# OPERACIONES SOBRE LA RUTA
+# ─────────────────────────────────────────────
+# La ruta se guarda como lista `tour` (orden de visita) más la lista inversa `pos`
+# (pos[ciudad] = posición en tour), así sucesor y predecesor son O(1).
+
+def _reverse(tour, pos, i, j):
+    """
+    Invierte el tramo de `tour` entre las posiciones i y j (inclusive, circular).
+
+    Si el tramo es más largo que la mitad de la ruta invertimos el complemento:
+    como la ruta es un ciclo simétrico, el resultado es el mismo recorrido.
+    """
+    n = len(tour)
+    inner = (j - i) % n + 1
+    if 2 * inner > n:
+        i, j = (j + 1) % n, (i - 1) % n
+        inner = n - inner
+
+    if inner < 2:
+        return
+    if i <= j:
+        segment = tour[i:j + 1]
+        segment.reverse()
+        tour[i:j + 1] = segment
+    else:
+        # El tramo da la vuelta: lo armamos, lo invertimos y lo repartimos en los dos extremos
+        segment = tour[i:] + tour[:j + 1]
+        segment.reverse()
+        tour[i:] = segment[:n - i]
+        tour[:j + 1] = segment[n - i:]
+    # Solo cambian las posiciones de las ciudades del tramo
+    for k, city in enumerate(segment, i):
+        pos[city] = k if k < n else k - n
+
+
+def _try_2opt(a, tour, pos, dist, neighbors):
+    """
+    Busca un movimiento 2-opt que mejore la ruta usando una arista nueva (a, c),
+    con c entre los vecinos cercanos de a. Aplica el primero que encuentre.
+
+    `dist(i, j)` devuelve la distancia entre dos ciudades como número de Python.
+
+    Retorna: las ciudades cuyas aristas cambiaron, o None si no hubo mejora.
+    """
+    n = len(tour)
+    for forward in (True, False):
+        # b es el sucesor (o predecesor) de a: la arista (a, b) es la que se quita
+        b = tour[(pos[a] + 1) % n] if forward else tour[pos[a] - 1]
+        d_ab = dist(a, b)
+
+        for c in neighbors[a]:
+            d_ac = dist(a, c)
+            if d_ac >= d_ab:
+                break  # Vecinos ordenados: ninguno de los siguientes puede mejorar
+
+            d = tour[(pos[c] + 1) % n] if forward else tour[pos[c] - 1]
+            if c == b or d == a:
+                continue
+
+            # Delta O(1): aristas nuevas (a,c) + (b,d) menos las quitadas (a,b) + (c,d)
+            delta = d_ac + dist(b, d) - d_ab - dist(c, d)
+            if delta < -EPSILON:
+                if forward:
+                    _reverse(tour, pos, pos[b], pos[c])   # a b ... c d → a c ... b d
+                else:
+                    _reverse(tour, pos, pos[c], pos[b])   # d c ... b a → d b ... c a
+                return (a, b, c, d)
+
+    return None
+
+
+def _try_or_opt(a, tour, pos, dist, neighbors):
+    """
+    Busca un movimiento Or-opt: mover el tramo de 1 a 3 ciudades que empieza en `a`
+    junto a uno de los vecinos cercanos de sus extremos (en cualquier orientación).
+    Aplica el primero que mejore.
+
+    Retorna: las ciudades cuyas aristas cambiaron, o None si no hubo mejora.
+    """
+    n = len(tour)
+    for length in OR_OPT_SEGMENTS:
+        if length > n - 3:
+            break
+
+        i = pos[a]
+        segment = [tour[(i + t) % n] for t in range(length)]
+        s1, s2 = segment[0], segment[-1]
+        p = tour[i - 1]                         # Predecesor del tramo
+        nx = tour[(i + length) % n]             # Sucesor del tramo
+        in_segment = set(segment)
+
+        # Ganancia de sacar el tramo y unir p con nx
+        removal_gain = dist(p, s1) + dist(s2, nx) - dist(p, nx)
+        if removal_gain <= EPSILON:
+            continue
+
+        for end in (s1, s2):
+            for c in neighbors[end]:
+                if dist(end, c) >= removal_gain:
+                    break  # Insertar junto a c ya no puede compensar
+                if c in in_segment:
+                    continue
+
+                # Probamos los dos huecos alrededor de c: (pred(c), c) y (c, succ(c))
+                for x, y in ((tour[pos[c] - 1], c), (c, tour[(pos[c] + 1) % n])):
+                    if x in in_segment or y in in_segment:
+                        continue
+                    d_xy = dist(x, y)
+                    add_fwd = dist(x, s1) + dist(s2, y) - d_xy
+                    add_rev = dist(x, s2) + dist(s1, y) - d_xy
+                    add, reverse = (add_fwd, False) if add_fwd <= add_rev else (add_rev, True)
+
+                    if add - removal_gain < -EPSILON:
+                        _move_segment(tour, pos, p, s1, s2, nx, x, y, reverse)
+                        return (p, nx, s1, s2, x, y)
+
+    return None
+
+
+def _exchange(tour, pos, a, b, c, d):
+    """
+    Movimiento 2-opt sobre las aristas (a, b) y (c, d), con b y d a continuación
+    de a y c en el mismo sentido: quedan (a, c) y (b, d).
+
+    _reverse puede haber invertido el sentido de la ruta (invierte el complemento
+    si es más corto), así que se mira si b es el sucesor o el predecesor de a.
+    """
+    if tour[(pos[a] + 1) % len(tour)] == b:
+        _reverse(tour, pos, pos[b], pos[c])   # a b ... c d → a c ... b d
+    else:
+        _reverse(tour, pos, pos[c], pos[b])   # d c ... b a → d b ... c a
+
+
+def _move_segment(tour, pos, p, s1, s2, nx, x, y, reverse):
+    """
+    Mueve el tramo s1 ... s2 (entre p y nx) al hueco entre x e y, con y el
+    sucesor de x en el mismo sentido que s1 → s2.
+
+    Se hace con dos o tres inversiones en el lugar, como un 2-opt: cada una solo
+    recorre el tramo invertido (o su complemento, si es más corto), no la ruta entera.
+        p s1..s2 nx ... x y  →  p x ... nx s2..s1 y   (quita (p,s1) y (x,y))
+                             →  p nx ... x s2..s1 y   (quita (p,x) y (nx,s2))
+                             →  p nx ... x s1..s2 y   (sin invertir el tramo)
+    """
+    _exchange(tour, pos, p, s1, x, y)
+    _exchange(tour, pos, p, x, nx, s2)
+    if not reverse:
+        _exchange(tour, pos, x, s2, s1, y)
+
+
+# ─────────────────────────────────────────────
+# BÚSQUEDA LOCAL
+# ─────────────────────────────────────────────
+
+def local_search(route, dist_matrix, neighbors=None, k=10, moves=('2opt', 'oropt'), active=None):
+    """
+    Mejora una ruta con 2-opt y/o Or-opt hasta llegar a un óptimo local.
+
+    Parámetros:
+    - route: ruta inicial (lista o arreglo de ciudades)
+    - dist_matrix: matriz de distancias (simétrica)
+    - neighbors: listas de candidatos de build_neighbor_lists (se calculan si faltan)
+    - k: número de vecinos por ciudad si hay que calcular `neighbors`
+    - moves: movimientos a usar: '2opt', 'oropt' o ambos
+    - active: ciudades con las que empezar la búsqueda (por defecto, todas).
+      Útil cuando solo una parte de la ruta cambió.
+
+    Retorna:
+    - tour: la ruta mejorada (lista)
+    - cost: su costo total
+    """
+    dist_matrix = as_distance_matrix(dist_matrix)
+    if neighbors is None:
+        neighbors = build_neighbor_lists(dist_matrix, k)
+    if isinstance(neighbors, np.ndarray):
+        neighbors = neighbors.tolist()  # Listas de Python: más rápidas en bucles
+
+    # .item(i, j) devuelve números de Python: los deltas nunca desbordan aunque
+    # la matriz sea int16, y es más rápido que indexar escalares de numpy
+    dist = dist_matrix.item
+
+    tour = [int(c) for c in route]
+    pos = [0] * len(tour)
+    for idx, city in enumerate(tour):
+        pos[city] = idx
+
+    # Cola de ciudades activas (don't-look bits: una ciudad fuera de la cola "no se mira")
+    queue = deque(tour if active is None else (int(c) for c in active))
+    in_queue = [False] * len(tour)
+    for city in queue:
+        in_queue[city] = True
+
+    while queue:
+        a = queue.popleft()
+        in_queue[a] = False
+
+        touched = None
+        if '2opt' in moves:
+            touched = _try_2opt(a, tour, pos, dist, neighbors)
+        if touched is None and 'oropt' in moves:
+            touched = _try_or_opt(a, tour, pos, dist, neighbors)
+
+        if touched is not None:
+            # Las ciudades cuyas aristas cambiaron vuelven a estar activas
+            for city in touched:
+                if not in_queue[city]:
+                    in_queue[city] = True
+                    queue.append(city)
+
+    return tour, route_cost(tour, dist_matrix)
+
+
+def two_opt(route, dist_matrix, neighbors=None, k=10):
+    """Búsqueda local solo con movimientos 2-opt. Retorna (tour, cost)."""
+    return local_search(route, dist_matrix, neighbors, k, moves=('2opt',))
+
+
+def or_opt(route, dist_matrix, neighbors=None, k=10):
+    """Búsqueda local solo con movimientos Or-opt. Retorna (tour, cost)."""
+    return local_search(route, dist_matrix, neighbors, k, moves=('oropt',))
+
+
+def improve_population(population, rows, dist_matrix, neighbors, costs=None):
+    """
+    Paso memético: aplica local_search a las filas `rows` de la población
+    (arreglo (pop_size, n)), modificándolas en el lugar.
+    Si se pasa `costs`, también se actualiza el costo de esas filas.
+    """
+    if isinstance(neighbors, np.ndarray):
+        neighbors = neighbors.tolist()
+    for r in rows:
+        tour, cost = local_search(population[r], dist_matrix, neighbors)
+        population[r] = tour
+        if costs is not None:
+            costs[r] = cost
@@ -4,13 +4,34 @@
 
 import time  # Para medir cuánto tarda
 
-def nearest_neighbor(dist_matrix, start_city=0):
+import numpy as np
+
+from src import backends
+from src.backends import penalty_dtype
+from src.distances import as_distance_matrix
+
+# Cuántas rutas del multi-start se construyen a la vez (limita la memoria: bloque x n)
+MULTI_START_BLOCK = 256
+
+
+def nearest_neighbor(dist_matrix, start_city=0, neighbors=None):
     """
     Construye una ruta usando la heurística del vecino más cercano.
 
     Parámetros:
-    - dist_matrix: matriz de distancias (numpy array 2D)
+    - dist_matrix: matriz de distancias (numpy array 2D o CondensedDistanceMatrix)
     - start_city: ciudad desde donde se empieza (por defecto, ciudad 0)
+    - neighbors: opcional, listas de vecinos ordenados por distancia
+      (build_neighbor_lists de local_search). Si se dan, primero se busca la
+      ciudad siguiente entre los k vecinos cercanos no visitados; solo si todos
+      ya fueron visitados se revisa la fila completa.
+
+    Sin `neighbors` la ruta se construye con el kernel del backend activo
+    (backends.nearest_neighbor_tours: bucle compilado, numpy o Python puro).
+    Con `neighbors`, en cada paso a la fila de distancias de la ciudad actual se
+    le suma un vector de penalización (infinito en las ciudades visitadas, 0 en
+    las demás) y np.argmin elige la más cercana. Las ciudades a distancia 0
+    (puntos duplicados) también se pueden elegir.
 
     Retorna:
     - route: lista con el orden de visita de ciudades [0, 3, 7, ...]
@@ -18,29 +39,39 @@ def nearest_neighbor(dist_matrix, start_city=0):
     - elapsed: tiempo en segundos que tardó
     """
     start_time = time.time()  # Guardamos el tiempo de inicio
+    dist_matrix = as_distance_matrix(dist_matrix)
+
+    if neighbors is None:
+        route = backends.nearest_neighbor_tours(dist_matrix, np.array([start_city]))[0].tolist()
+        elapsed = time.time() - start_time
+        return route, route_cost(route, dist_matrix), elapsed
 
-    n = len(dist_matrix)       # Número de ciudades
-    visited = [False] * n      # Lista de booleanos: visited[i]=True si ya visitamos ciudad i
-    route = [start_city]       # Empezamos la ruta desde la ciudad inicial
-    visited[start_city] = True # Marcamos la ciudad inicial como visitada
+    n = len(dist_matrix)                 # Número de ciudades
+    visited = np.zeros(n, dtype=bool)    # visited[i]=True si ya visitamos la ciudad i
+    penalty = np.zeros(n, dtype=penalty_dtype(dist_matrix))  # inf en las visitadas
+    route = [start_city]                 # Empezamos la ruta desde la ciudad inicial
+    visited[start_city] = True           # Marcamos la ciudad inicial como visitada
+    penalty[start_city] = np.inf
 
-    current = start_city       # La ciudad donde estamos parados actualmente
+    current = start_city                 # La ciudad donde estamos parados actualmente
 
     # Repetimos n-1 veces (porque ya tenemos 1 ciudad en la ruta)
     for _ in range(n - 1):
-        best_dist = float('inf')  # Inicializamos con infinito (cualquier distancia será menor)
-        best_city = -1             # La mejor ciudad vecina que encontremos
+        best_city = -1
 
-        # Revisamos todas las ciudades posibles
-        for j in range(n):
-            # Solo consideramos ciudades no visitadas con distancia > 0
-            if not visited[j] and dist_matrix[current][j] > 0:
-                if dist_matrix[current][j] < best_dist:
-                    best_dist = dist_matrix[current][j]  # Actualizamos la mejor distancia
-                    best_city = j                         # Y la mejor ciudad
+        # Atajo: el vecino cercano más próximo que siga sin visitar
+        for c in neighbors[current]:
+            if not visited[c]:
+                best_city = int(c)
+                break
+
+        if best_city < 0:
+            # Fila completa: las visitadas valen infinito y argmin da la más cercana
+            best_city = int(np.argmin(dist_matrix[current] + penalty))
 
         route.append(best_city)      # Agregamos la ciudad elegida a la ruta
         visited[best_city] = True    # La marcamos como visitada
+        penalty[best_city] = np.inf
         current = best_city          # Nos movemos a esa ciudad
 
     elapsed = time.time() - start_time  # Calculamos el tiempo transcurrido
@@ -51,23 +82,108 @@ def nearest_neighbor(dist_matrix, start_city=0):
     return route, total_dist, elapsed
 
 
+def nearest_neighbor_tours(dist_matrix, starts, rng=None, candidates=1):
+    """
+    Construye a la vez una ruta de vecino más cercano desde cada ciudad de `starts`.
+
+    La versión determinista (candidates=1) es el kernel del backend activo
+    (backends.nearest_neighbor_tours). Con numpy todas las rutas avanzan
+    juntas: en cada paso se toman las filas de las ciudades actuales como un
+    bloque (len(starts), n), se les suma la matriz de penalización de visitadas
+    de cada ruta y un solo np.argmin por filas elige el siguiente paso de todas.
+
+    Variante aleatorizada: con candidates > 1 cada ruta elige al azar (con `rng`)
+    entre sus `candidates` ciudades no visitadas más cercanas. Sirve para generar
+    rutas buenas pero distintas entre sí (siempre con numpy).
+
+    Retorna: (routes, costs) = arreglo (len(starts), n) y vector de costos.
+    """
+    dist_matrix = as_distance_matrix(dist_matrix)
+    n = len(dist_matrix)
+    starts = np.asarray(starts, dtype=np.int64)
+    m = len(starts)
+
+    if candidates <= 1:
+        routes = backends.nearest_neighbor_tours(dist_matrix, starts)
+        return routes, backends.tour_costs(routes, dist_matrix)
+
+    routes = np.empty((m, n), dtype=np.int32)
+    penalty = np.zeros((m, n), dtype=penalty_dtype(dist_matrix))  # inf = visitada
+    block = np.empty_like(penalty)
+    rows = np.arange(m)
+
+    current = starts
+    routes[:, 0] = current
+    penalty[rows, current] = np.inf
+    for step in range(1, n):
+        np.add(dist_matrix[current], penalty, out=block)
+        c = min(candidates, n - step)  # Quedan n - step ciudades sin visitar
+        if c > 1:
+            # Las c más cercanas de cada fila (sin ordenar) y una de ellas al azar
+            nearest = np.argpartition(block, c - 1, axis=1)[:, :c]
+            current = nearest[rows, rng.integers(0, c, size=m)]
+        else:
+            current = np.argmin(block, axis=1)
+        routes[:, step] = current
+        penalty[rows, current] = np.inf
+
+    return routes, backends.tour_costs(routes, dist_matrix)
+
+
+def multi_start_nearest_neighbor(dist_matrix, starts=None, seed=42):
+    """
+    Vecino más cercano desde varias ciudades iniciales; devuelve la mejor ruta.
+
+    Parámetros:
+    - dist_matrix: matriz de distancias
+    - starts: None = desde TODAS las ciudades; un entero K = desde K ciudades
+      elegidas al azar (con `seed`); o una lista explícita de ciudades
+    - seed: semilla para elegir las K ciudades
+
+    Las rutas se construyen por bloques de MULTI_START_BLOCK con
+    nearest_neighbor_tours, así la memoria usada es bloque x n.
+
+    Retorna (igual que nearest_neighbor): route, total_dist, elapsed
+    """
+    start_time = time.time()
+    dist_matrix = as_distance_matrix(dist_matrix)
+    n = len(dist_matrix)
+
+    if starts is None:
+        starts = np.arange(n)
+    elif isinstance(starts, (int, np.integer)):
+        rng = np.random.default_rng(seed)
+        starts = rng.choice(n, size=min(int(starts), n), replace=False)
+    starts = np.asarray(starts)
+
+    best_route = None
+    best_cost = float('inf')
+    for first in range(0, len(starts), MULTI_START_BLOCK):
+        routes, costs = nearest_neighbor_tours(dist_matrix, starts[first:first + MULTI_START_BLOCK])
+        i = int(np.argmin(costs))
+        if costs[i] < best_cost:
+            best_cost = costs[i].item()
+            best_route = routes[i].tolist()
+
+    elapsed = time.time() - start_time
+    return best_route, best_cost, elapsed
+
+
 def route_cost(route, dist_matrix):
     """
     Calcula el costo total de una ruta (suma de todas las distancias).
 
     La ruta es un ciclo: después de la última ciudad, regresamos a la primera.
     Ejemplo: [0, 3, 7, 2] → dist(0,3) + dist(3,7) + dist(7,2) + dist(2,0)
+
+    La suma la hace el kernel del backend activo (backends.tour_costs): con
+    numpy, np.roll(route, -1) es la ruta desplazada una posición: [3, 7, 2, 0]
+    (después de la última ciudad volvemos a la primera), así que
+    dist_matrix[route, siguiente] toma todas las aristas en una sola operación.
+    Funciona igual con una matriz numpy o con una CondensedDistanceMatrix.
     """
-    total = 0
-    n = len(route)
-
-    for i in range(n):
-        # route[i] es la ciudad actual
-        # route[(i+1) % n] es la siguiente ciudad
-        # El operador % (módulo) hace que después de la última ciudad, volvamos a la primera
-        # Ejemplo: i=3, n=4 → (3+1)%4 = 0 → regresamos al inicio
-        city_a = route[i]
-        city_b = route[(i + 1) % n]
-        total += dist_matrix[city_a][city_b]
-
-    return total
+    route = np.asarray(route)
+    if len(route) == 0:
+        return 0
+    # La suma acumula en int64 aunque la matriz sea int16; .item() da un número de Python
+    return backends.tour_costs(route[None, :], dist_matrix)[0].item()
@@ -1,66 +1,308 @@
 # parser.py
 # Este módulo se encarga de leer un archivo .tsp y devolver la matriz de distancias
+#
+# Soporta las dos formas en que TSPLIB describe una instancia simétrica:
+# - EDGE_WEIGHT_SECTION: la matriz explícita, en cualquiera de sus formatos
+#   (FULL_MATRIX, UPPER_ROW, LOWER_ROW, UPPER_DIAG_ROW, LOWER_DIAG_ROW y sus
+#   equivalentes por columnas)
+# - NODE_COORD_SECTION: coordenadas de cada ciudad; la distancia se calcula con
+#   la fórmula de EDGE_WEIGHT_TYPE (EUC_2D, CEIL_2D, GEO, ATT; ver distances.py)
+#
+# Los números no se convierten uno por uno: las líneas de cada sección se leen
+# en bloques y se convierten de una sola vez con numpy.
 
 import numpy as np  # Importamos numpy para crear matrices numéricas eficientes
 
-def parse_tsp(filepath):
+from src.distances import (
+    CondensedDistanceMatrix,
+    CoordinateDistanceMatrix,
+    condensed_coordinate_matrix,
+    condensed_index,
+    coordinate_distance_matrix,
+    smallest_int_dtype,
+)
+
+# Cuántas líneas de números acumulamos antes de convertirlas de un golpe
+CHUNK_LINES = 4096
+
+# Formatos por columnas: recorrer la parte superior por columnas da exactamente
+# la misma secuencia que recorrer la inferior por filas (y viceversa)
+COLUMN_FORMATS = {
+    'UPPER_COL': 'LOWER_ROW',
+    'LOWER_COL': 'UPPER_ROW',
+    'UPPER_DIAG_COL': 'LOWER_DIAG_ROW',
+    'LOWER_DIAG_COL': 'UPPER_DIAG_ROW',
+}
+
+EDGE_WEIGHT_FORMATS = (
+    'FULL_MATRIX', 'UPPER_ROW', 'LOWER_ROW', 'UPPER_DIAG_ROW', 'LOWER_DIAG_ROW',
+) + tuple(COLUMN_FORMATS)
+
+
+def weight_count(edge_weight_format, dimension):
+    """Cuántos números trae la EDGE_WEIGHT_SECTION para ese formato y dimensión."""
+    fmt = COLUMN_FORMATS.get(edge_weight_format, edge_weight_format)
+    n = dimension
+    if fmt == 'FULL_MATRIX':
+        return n * n
+    if fmt in ('UPPER_ROW', 'LOWER_ROW'):
+        return n * (n - 1) // 2
+    if fmt in ('UPPER_DIAG_ROW', 'LOWER_DIAG_ROW'):
+        return n * (n + 1) // 2
+    raise ValueError(f"EDGE_WEIGHT_FORMAT no soportado: {edge_weight_format!r} "
+                     f"(opciones: {EDGE_WEIGHT_FORMATS})")
+
+
+def _read_numbers(f, expected=None):
     """
-    Lee un archivo .tsp en formato LOWER_DIAG_ROW y devuelve:
-    - dimension: número de ciudades (int)
-    - dist_matrix: matriz de distancias completa (numpy array 2D, simétrica)
+    Lee las líneas numéricas de una sección, a partir de la posición actual de `f`.
+
+    Las líneas se acumulan en bloques de CHUNK_LINES y cada bloque se convierte
+    con np.fromstring directamente en un buffer preasignado (si se conoce
+    `expected`, la cantidad de números de la sección).
+
+    Retorna: (numbers, next_line)
+    - numbers: arreglo float64 con todos los números de la sección
+    - next_line: la primera línea que ya no es numérica ('' si se acabó el archivo),
+      para que quien llama la procese como encabezado
     """
+    buffer = np.empty(expected, dtype=float) if expected is not None else None
+    pieces = []   # Solo se usa si no conocemos `expected`
+    filled = 0
+    chunk = []
+    next_line = ''
+
+    def flush():
+        nonlocal filled
+        values = np.fromstring(' '.join(chunk), sep=' ')
+        chunk.clear()
+        if buffer is None:
+            pieces.append(values)
+        else:
+            if filled + len(values) > len(buffer):
+                raise ValueError(f"La sección trae más de los {expected} números esperados")
+            buffer[filled:filled + len(values)] = values
+        filled += len(values)
+
+    for line in f:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped[0].isalpha():   # Empieza otra sección o EOF
+            next_line = line
+            break
+        chunk.append(stripped)
+        if len(chunk) >= CHUNK_LINES:
+            flush()
+    if chunk:
+        flush()
+
+    if buffer is None:
+        return (np.concatenate(pieces) if pieces else np.empty(0)), next_line
+    if filled != expected:
+        raise ValueError(f"La sección trae {filled} números; se esperaban {expected}")
+    return buffer, next_line
+
 
+def read_tsplib(source):
+    """
+    Lee un archivo TSPLIB línea por línea (sin cargarlo entero en memoria).
+    `source` es la ruta del archivo o un archivo de texto ya abierto (por
+    ejemplo io.StringIO con el contenido recibido por el servicio).
+
+    Retorna un diccionario con:
+    - 'name', 'type', 'comment': datos del encabezado
+    - 'dimension': número de ciudades
+    - 'edge_weight_type': EXPLICIT, EUC_2D, CEIL_2D, GEO o ATT
+    - 'edge_weight_format': formato de la matriz explícita (o None)
+    - 'weights': arreglo plano con los números de EDGE_WEIGHT_SECTION (o None)
+    - 'coords': arreglo (n, 2) con las coordenadas de NODE_COORD_SECTION (o None)
+    """
+    if hasattr(source, 'readline'):
+        return _read_tsplib_stream(source)
     # Abrimos el archivo en modo lectura ('r') con codificación UTF-8
-    with open(filepath, 'r', encoding='utf-8') as f:
-        lines = f.readlines()  # Leemos TODAS las líneas y las guardamos en una lista
+    with open(source, encoding='utf-8') as f:
+        return _read_tsplib_stream(f)
+
 
-    dimension = 0          # Aquí guardaremos el número de ciudades
-    in_weights = False     # Bandera: ¿estamos ya en la sección de datos numéricos?
-    raw_numbers = []       # Lista donde acumularemos todos los números de distancia
+def _read_tsplib_stream(f):
+    """Cuerpo de read_tsplib sobre un archivo de texto abierto."""
+    header = {}
+    weights = None
+    coords = None
 
-    for line in lines:
+    line = f.readline()
+    while line:
         # strip() elimina espacios y saltos de línea al inicio/final de cada línea
-        line = line.strip()
-
-        # Si la línea empieza con "DIMENSION", extraemos el número de ciudades
-        if line.startswith('DIMENSION'):
-            # Ejemplo: "DIMENSION: 17" → split(':') → ['DIMENSION', ' 17'] → [1] → '17' → int
-            dimension = int(line.split(':')[1].strip())
-
-        # Si encontramos esta etiqueta, las siguientes líneas son los datos
-        elif line == 'EDGE_WEIGHT_SECTION':
-            in_weights = True  # Activamos la bandera
-
-        # Si encontramos EOF, dejamos de leer datos
-        elif line == 'EOF':
-            in_weights = False  # Desactivamos la bandera
-
-        # Si estamos en la sección de pesos, procesamos los números
-        elif in_weights:
-            # split() sin argumento divide por cualquier espacio en blanco
-            # Ejemplo: "0 633 0 257" → ['0', '633', '0', '257']
-            numbers = line.split()
-            for n in numbers:
-                # Convertimos cada string a entero y lo agregamos a nuestra lista
-                raw_numbers.append(int(n))
-
-    # Ahora reconstruimos la matriz completa a partir de los números del triángulo inferior
-    # Creamos una matriz cuadrada de ceros de tamaño dimension x dimension
-    dist_matrix = np.zeros((dimension, dimension), dtype=int)
-
-    idx = 0  # Índice para recorrer raw_numbers secuencialmente
-
-    # Recorremos fila por fila (i = fila actual, de 0 hasta dimension-1)
-    for i in range(dimension):
-        # En cada fila i, hay i+1 valores (fila 0: 1 valor, fila 1: 2 valores, etc.)
-        for j in range(i + 1):
-            val = raw_numbers[idx]  # Tomamos el siguiente número de la lista
-            idx += 1                 # Avanzamos el índice
-
-            dist_matrix[i][j] = val  # Lo ponemos en la posición (i, j)
-            dist_matrix[j][i] = val  # Y también en (j, i) para hacer la matriz simétrica
-
-    return dimension, dist_matrix
+        stripped = line.strip()
+        next_line = None
+
+        if stripped.startswith('EOF'):
+            break
+
+        elif stripped.startswith('EDGE_WEIGHT_SECTION'):
+            dimension = int(header['DIMENSION'])
+            fmt = header.get('EDGE_WEIGHT_FORMAT', 'FULL_MATRIX')
+            weights, next_line = _read_numbers(f, weight_count(fmt, dimension))
+
+        elif stripped.startswith('NODE_COORD_SECTION'):
+            # Cada línea es "id x y"
+            dimension = int(header['DIMENSION'])
+            block, next_line = _read_numbers(f, 3 * dimension)
+            block = block.reshape(dimension, 3)
+            order = np.argsort(block[:, 0], kind='stable')  # Ordenamos por id de ciudad
+            coords = block[order, 1:]
+
+        elif stripped.endswith('_SECTION'):
+            # Secciones que no necesitamos (ej. DISPLAY_DATA_SECTION): se saltan
+            _, next_line = _read_numbers(f)
+
+        elif ':' in stripped:
+            # Ejemplo: "DIMENSION: 17" → clave 'DIMENSION', valor '17'
+            key, value = stripped.split(':', 1)
+            header[key.strip()] = value.strip()
+
+        line = next_line if next_line is not None else f.readline()
+
+    return {
+        'name': header.get('NAME'),
+        'type': header.get('TYPE'),
+        'comment': header.get('COMMENT'),
+        'dimension': int(header['DIMENSION']),
+        'edge_weight_type': header.get('EDGE_WEIGHT_TYPE', 'EXPLICIT'),
+        'edge_weight_format': header.get('EDGE_WEIGHT_FORMAT'),
+        'weights': weights,
+        'coords': coords,
+    }
+
+
+def read_dimension(filepath):
+    """Número de ciudades de un archivo TSPLIB, leyendo solo el encabezado."""
+    with open(filepath, encoding='utf-8') as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith('DIMENSION') and ':' in stripped:
+                return int(stripped.split(':', 1)[1])
+            if stripped.endswith('_SECTION') or stripped.startswith('EOF'):
+                break
+    raise ValueError(f"{filepath} no tiene DIMENSION en el encabezado")
+
+
+def _row_layout(fmt, n, i):
+    """
+    Para la fila i de un formato por filas, devuelve (offset, j_start, j_stop):
+    dónde empieza la fila en el arreglo de números y qué columnas trae.
+    """
+    if fmt == 'FULL_MATRIX':
+        return i * n, 0, n
+    if fmt == 'UPPER_ROW':
+        return i * (n - 1) - i * (i - 1) // 2, i + 1, n
+    if fmt == 'UPPER_DIAG_ROW':
+        return i * n - i * (i - 1) // 2, i, n
+    if fmt == 'LOWER_ROW':
+        return i * (i - 1) // 2, 0, i
+    if fmt == 'LOWER_DIAG_ROW':
+        return i * (i + 1) // 2, 0, i + 1
+    raise ValueError(f"EDGE_WEIGHT_FORMAT no soportado: {fmt!r}")
+
+
+def explicit_matrix(weights, edge_weight_format, dimension, dtype=None):
+    """
+    Reconstruye la matriz simétrica completa a partir de los números de
+    EDGE_WEIGHT_SECTION, asignando todo el triángulo de una sola vez.
+
+    np.tril_indices / np.triu_indices devuelven las posiciones (i, j) del triángulo
+    en el mismo orden (fila por fila) en que aparecen los números en el archivo.
+    Si no se indica `dtype`, se usa el entero más pequeño que alcanza para el
+    mayor peso (int16 en gr17/gr21/gr24).
+    """
+    fmt = COLUMN_FORMATS.get(edge_weight_format, edge_weight_format)
+    n = dimension
+    weights = np.asarray(weights)
+    if dtype is None:
+        dtype = smallest_int_dtype(weights.max() if weights.size else 0)
+    values = weights.astype(dtype)
+
+    if fmt == 'FULL_MATRIX':
+        return values.reshape(n, n)
+
+    if fmt == 'LOWER_DIAG_ROW':
+        rows, cols = np.tril_indices(n)
+    elif fmt == 'LOWER_ROW':
+        rows, cols = np.tril_indices(n, -1)
+    elif fmt == 'UPPER_DIAG_ROW':
+        rows, cols = np.triu_indices(n)
+    elif fmt == 'UPPER_ROW':
+        rows, cols = np.triu_indices(n, 1)
+    else:
+        raise ValueError(f"EDGE_WEIGHT_FORMAT no soportado: {edge_weight_format!r}")
+
+    dist_matrix = np.zeros((n, n), dtype=dtype)
+    dist_matrix[rows, cols] = values  # Triángulo leído del archivo
+    dist_matrix[cols, rows] = values  # Y su espejo, para hacer la matriz simétrica
+    return dist_matrix
+
+
+def explicit_condensed(weights, edge_weight_format, dimension, dtype=None):
+    """
+    Igual que explicit_matrix, pero construye directamente una
+    CondensedDistanceMatrix (solo el triángulo superior), fila por fila,
+    sin crear nunca la matriz n x n.
+    """
+    fmt = COLUMN_FORMATS.get(edge_weight_format, edge_weight_format)
+    n = dimension
+    weights = np.asarray(weights)
+    if dtype is None:
+        dtype = smallest_int_dtype(weights.max() if weights.size else 0)
+    data = np.empty(n * (n - 1) // 2, dtype=dtype)
+
+    for i in range(n):
+        offset, j_start, j_stop = _row_layout(fmt, n, i)
+        row = weights[offset:offset + j_stop - j_start]
+        if fmt.startswith('UPPER') or fmt == 'FULL_MATRIX':
+            # Columnas j > i: van seguidas en la fila i del triángulo superior
+            first = i + 1 - j_start
+            start = condensed_index(i, i + 1, n)
+            data[start:start + n - i - 1] = row[first:first + n - i - 1]
+        else:
+            # Columnas j < i: el par (j, i) va en la fila j del triángulo superior
+            j = np.arange(i)
+            data[condensed_index(j, i, n)] = row[:i]
+
+    return CondensedDistanceMatrix(data, n)
+
+
+def instance_matrix(instance, condensed=False, lazy=False):
+    """
+    Construye la matriz de distancias de una instancia leída con read_tsplib.
+    Con condensed=True devuelve una CondensedDistanceMatrix (mitad de memoria).
+    Con lazy=True, una instancia por coordenadas devuelve una
+    CoordinateDistanceMatrix (distancias al vuelo, sin matriz); las de matriz
+    explícita no cambian (sus distancias ya vienen en el archivo).
+    """
+    if instance['edge_weight_type'] == 'EXPLICIT':
+        fmt = instance['edge_weight_format'] or 'FULL_MATRIX'
+        build = explicit_condensed if condensed else explicit_matrix
+        return build(instance['weights'], fmt, instance['dimension'])
+    if instance['coords'] is None:
+        raise ValueError("La instancia no trae EDGE_WEIGHT_SECTION ni NODE_COORD_SECTION")
+    if lazy:
+        return CoordinateDistanceMatrix(instance['coords'], instance['edge_weight_type'])
+    build = condensed_coordinate_matrix if condensed else coordinate_distance_matrix
+    return build(instance['coords'], instance['edge_weight_type'])
+
+
+def parse_tsp(filepath, condensed=False, lazy=False):
+    """
+    Lee un archivo .tsp (matriz explícita o coordenadas) y devuelve:
+    - dimension: número de ciudades (int)
+    - dist_matrix: matriz de distancias completa (numpy array 2D, simétrica),
+      con el tipo entero más pequeño posible; o una CondensedDistanceMatrix
+      si condensed=True; o una CoordinateDistanceMatrix si lazy=True y la
+      instancia es por coordenadas
+    """
+    instance = read_tsplib(filepath)
+    return instance['dimension'], instance_matrix(instance, condensed, lazy)
 
 
 def print_matrix(dist_matrix, label="Matriz de distancias"):
@@ -0,0 +1,155 @@
+# profiling.py
+# Medición de tiempos por fase del algoritmo genético
+#
+# IDEA:
+# - genetic_algorithm solo devuelve el tiempo total; no dice si el tiempo se va
+#   en evaluar, seleccionar, cruzar o mutar
+# - Un Profiler (opcional: genetic_algorithm(..., profiler=Profiler())) acumula
+#   el tiempo (time.perf_counter_ns) y la cantidad de llamadas de cada fase,
+#   por generación y en total, más las evaluaciones por segundo y la diversidad
+# - Los resultados se exportan como JSON (resumen + generaciones) o CSV (una
+#   fila por generación)
+#
+# Sin profiler el AG no paga nada: cada medición está detrás de un
+# `if profiler is not None`.
+
+import csv
+import json
+import time
+
+# Fases que mide el AG, en el orden en que aparecen en los reportes
+PHASES = (
+    'initialization',  # Crear la población inicial
+    'neighbor_lists',  # Listas de vecinos cercanos (búsqueda local y EAX)
+    'evaluation',      # Calcular costos de rutas completas
+    'elitism',         # Elegir la élite
+    'selection',       # Torneos
+    'crossover',       # Cruce OX1
+    'mutation',        # Mutación swap (con su delta de costo)
+    'replacement',     # Armar la nueva población (élite + hijos)
+    'deduplication',   # Perturbar hijos repetidos (deduplicate=True)
+    'local_search',    # Paso memético
+    'perturbation',    # Reinicio / hipermutación por estancamiento
+    'diversity',       # population_diversity (para snapshots, min_diversity o el perfil)
+    'bookkeeping',     # Mejor global, historia y criterios de parada
+    'checkpoint',      # Escritura de checkpoints
+)
+
+
+class Profiler:
+    """
+    Acumula tiempos por fase y por generación.
+
+    Uso dentro del AG (cada fase mide desde la marca anterior):
+        t = time.perf_counter_ns()
+        ...trabajo de la fase...
+        t = profiler.record('selection', t)
+
+    `record` devuelve el instante actual, que sirve de inicio para la fase siguiente.
+    """
+
+    def __init__(self):
+        self.totals = {}          # Nanosegundos acumulados por fase
+        self.calls = {}           # Llamadas por fase
+        self.evaluations = 0      # Rutas evaluadas completas
+        self.generations = []     # Una fila (diccionario) por generación
+        self.started = None
+        self.wall_ns = 0          # Tiempo real desde start() hasta la última generación
+        self._current = {}
+        self._current_evaluations = 0
+
+    def start(self):
+        """Marca el inicio de la corrida (para el tiempo total y las evaluaciones/s)."""
+        self.started = time.perf_counter_ns()
+
+    def record(self, phase, since, evaluations=0):
+        """Suma a `phase` el tiempo desde `since` (ns); retorna el instante actual."""
+        now = time.perf_counter_ns()
+        elapsed = now - since
+        self.totals[phase] = self.totals.get(phase, 0) + elapsed
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        self._current[phase] = self._current.get(phase, 0) + elapsed
+        self.evaluations += evaluations
+        self._current_evaluations += evaluations
+        return now
+
+    def end_generation(self, generation, diversity=None):
+        """Cierra la fila de la generación `generation` con lo medido desde la anterior."""
+        row = {'generation': generation, 'diversity': diversity,
+               'evaluations': self._current_evaluations}
+        for phase in PHASES:
+            row[f"{phase}_ns"] = self._current.get(phase, 0)
+        self.generations.append(row)
+        self._current = {}
+        self._current_evaluations = 0
+        if self.started is not None:
+            self.wall_ns = time.perf_counter_ns() - self.started
+
+    def summary(self):
+        """
+        Resumen de la corrida como diccionario (se puede pasar a JSON):
+        - 'generations', 'evaluations', 'wall_seconds', 'evals_per_second'
+        - 'final_diversity': diversidad de la última generación medida
+        - 'phases': por fase, {'seconds', 'calls', 'share'} (share = fracción del
+          tiempo medido)
+        """
+        measured = sum(self.totals.values()) or 1
+        wall = self.wall_ns / 1e9
+        return {
+            'generations': len(self.generations),
+            'evaluations': self.evaluations,
+            'wall_seconds': wall,
+            'evals_per_second': self.evaluations / wall if wall > 0 else None,
+            'final_diversity': self.generations[-1]['diversity'] if self.generations else None,
+            'phases': {
+                phase: {
+                    'seconds': self.totals[phase] / 1e9,
+                    'calls': self.calls[phase],
+                    'share': self.totals[phase] / measured,
+                }
+                for phase in PHASES if phase in self.totals
+            },
+        }
+
+    def to_json(self, path):
+        """Guarda el resumen y la tabla por generación en un archivo JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'summary': self.summary(), 'generations': self.generations}, f, indent=2)
+
+    def to_csv(self, path):
+        """Guarda una fila por generación (tiempos en ns por fase) en un archivo CSV."""
+        fields = ['generation', 'diversity', 'evaluations'] + [f"{p}_ns" for p in PHASES]
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(self.generations)
+
+
+def merge_summaries(summaries):
+    """
+    Combina los resúmenes de varias corridas (ej. las semillas del modo batch)
+    sumando tiempos, llamadas y evaluaciones; las fracciones y las
+    evaluaciones/s se recalculan sobre el total.
+    """
+    summaries = [s for s in summaries if s]
+    if not summaries:
+        return None
+    wall = sum(s['wall_seconds'] for s in summaries)
+    evaluations = sum(s['evaluations'] for s in summaries)
+    phases = {}
+    for s in summaries:
+        for phase, p in s['phases'].items():
+            merged = phases.setdefault(phase, {'seconds': 0.0, 'calls': 0})
+            merged['seconds'] += p['seconds']
+            merged['calls'] += p['calls']
+    measured = sum(p['seconds'] for p in phases.values()) or 1
+    for p in phases.values():
+        p['share'] = p['seconds'] / measured
+    return {
+        'generations': sum(s['generations'] for s in summaries),
+        'evaluations': evaluations,
+        'wall_seconds': wall,
+        'evals_per_second': evaluations / wall if wall > 0 else None,
+        'final_diversity': summaries[-1]['final_diversity'],
+        'phases': {phase: phases[phase] for phase in PHASES if phase in phases},
+    }
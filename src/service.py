@@ -0,0 +1,635 @@
+# service.py
+# Servicio local del solver: cola de trabajos asíncrona y pool de procesos "calientes"
+#
+# IDEA:
+# - `tsp-ga` arranca un proceso nuevo por ejecución: importar numpy, compilar los
+#   kernels y parsear el .tsp cuesta más que resolver una instancia chica
+# - Este servicio queda corriendo: recibe instancias (texto TSPLIB, una matriz o
+#   la ruta de un .tsp), las encola y las reparte a un pool de procesos que se
+#   crean al arrancar y ya tienen todo importado
+# - Cada proceso trabajador guarda las últimas matrices que parseó (LRU), así
+#   la misma instancia enviada otra vez no se vuelve a parsear
+# - Cada trabajo puede traer un presupuesto de tiempo: el tiempo que pasó en la
+#   cola se descuenta del time_limit del AG
+#
+# API HTTP (JSON), con asyncio y sin dependencias externas:
+#   POST /jobs               encola un trabajo (ver SolverService.submit)
+#                            → 202 {"id": ..., "status": "queued"}
+#                            con "wait": true responde al terminar, con el resultado
+#   GET  /jobs/<id>          estado del trabajo y, si terminó, su resultado
+#   GET  /jobs/<id>/events   progreso en vivo: una línea JSON por evento (NDJSON)
+#                            hasta que el trabajo termina
+#   GET  /health             trabajadores, trabajos en cola y en ejecución
+#
+# Uso:  python -m src.service --port 8765          (TCP en 127.0.0.1)
+#       python -m src.service --socket /tmp/tsp.sock (socket Unix)
+
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.backends import BACKENDS, set_backend
+from src.cache import DEFAULT_CACHE_DIR, load_distance_matrix
+from src.decomposition import decomposition_solver
+from src.genetic_algorithm import genetic_algorithm_iter
+from src.local_search import local_search
+from src.nearest_neighbor import nearest_neighbor
+from src.parser import instance_matrix, read_tsplib
+from src.tuning import default_params
+
+# Solvers que acepta el servicio
+SERVICE_SOLVERS = ('ga', 'nn', 'decomposition')
+
+# Parámetros que un cliente puede pasar a cada solver. Los demás (checkpoint_path,
+# resume, profiler, workers, ...) tocan archivos o recursos del servidor: se rechazan
+GA_SERVICE_PARAMS = (
+    'pop_size', 'generations', 'mutation_rate', 'elite_size', 'tournament_size', 'crossover',
+    'local_search_rate', 'local_search_k', 'initialization', 'stagnation', 'target_cost',
+    'min_diversity', 'on_stagnation', 'fitness_cache', 'deduplicate', 'adaptive',
+)
+SERVICE_PARAMS = {
+    'ga': GA_SERVICE_PARAMS,
+    'nn': ('start_city', 'k'),
+    'decomposition': ('method', 'cluster_size', 'n_clusters', 'solver', 'ga_params', 'k'),
+}
+
+# Estados de un trabajo
+JOB_STATES = ('queued', 'running', 'done', 'failed', 'expired')
+
+# Matrices que recuerda cada proceso trabajador
+WORKER_MATRIX_CACHE = 8
+
+# Trabajos terminados que se conservan para consultarlos (los más viejos se olvidan)
+MAX_FINISHED_JOBS = 1000
+
+# Tamaño máximo del cuerpo de una petición (bytes)
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+# Cada cuántas generaciones el AG publica un evento de progreso
+PROGRESS_INTERVAL = 10
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Única carpeta de la que se leen los trabajos con 'path'
+DEFAULT_DATA_DIR = 'data'
+
+
+# ─────────────────────────────────────────────
+# LADO DEL TRABAJADOR (cada proceso del pool)
+# ─────────────────────────────────────────────
+
+_worker_progress = None              # Cola de eventos de progreso hacia el servicio
+_worker_matrices = OrderedDict()     # clave de la instancia → matriz (LRU)
+
+
+def _init_worker(progress_queue, backend=None):
+    """Inicializador de cada proceso: guarda la cola de progreso y fija el backend."""
+    global _worker_progress
+    _worker_progress = progress_queue
+    if backend is not None:
+        set_backend(backend)
+
+
+def _warm_up():
+    """
+    Primera tarea de cada trabajador: resuelve una instancia mínima para que los
+    kernels (y numba, si está) queden compilados antes del primer trabajo real.
+    """
+    dist_matrix = np.array([[0, 1, 2, 1], [1, 0, 1, 2], [2, 1, 0, 1], [1, 2, 1, 0]])
+    route, _, _ = nearest_neighbor(dist_matrix)
+    local_search(route, dist_matrix)
+    return os.getpid()
+
+
+def _load_matrix(key, source, lazy, cache_dir):
+    """
+    Matriz de la instancia `source`, desde la caché del proceso si ya la parseó.
+    Retorna (matriz, estaba_en_caché).
+    """
+    cached = _worker_matrices.get(key)
+    if cached is not None:
+        _worker_matrices.move_to_end(key)
+        return cached, True
+
+    kind, value = source
+    if kind == 'tsp':
+        dist_matrix = instance_matrix(read_tsplib(io.StringIO(value)), lazy=lazy)
+    elif kind == 'path':
+        _, dist_matrix = load_distance_matrix(value, cache_dir, lazy=lazy)
+    else:
+        dist_matrix = np.asarray(value)
+        if dist_matrix.ndim != 2 or dist_matrix.shape[0] != dist_matrix.shape[1]:
+            raise ValueError(f"La matriz debe ser cuadrada; se recibió {dist_matrix.shape}")
+
+    _worker_matrices[key] = dist_matrix
+    if len(_worker_matrices) > WORKER_MATRIX_CACHE:
+        _worker_matrices.popitem(last=False)
+    return dist_matrix, False
+
+
+def _publish(job_id, event):
+    if _worker_progress is not None:
+        _worker_progress.put((job_id, event))
+
+
+def _run_job(job_id, key, source, solver, params, seed, time_limit, lazy, cache_dir):
+    """
+    Tarea del pool: resuelve un trabajo y devuelve su resultado (diccionario JSON).
+    El AG publica su progreso cada PROGRESS_INTERVAL generaciones.
+    """
+    start = time.time()
+    dist_matrix, matrix_cached = _load_matrix(key, source, lazy, cache_dir)
+    result = {'worker': os.getpid(), 'matrix_cached': matrix_cached,
+              'dimension': len(dist_matrix)}
+
+    if solver == 'nn':
+        route, _, _ = nearest_neighbor(dist_matrix, start_city=params.get('start_city', 0))
+        route, cost = local_search(route, dist_matrix, k=params.get('k', 10))
+    elif solver == 'decomposition':
+        # Dentro de un trabajador no se abre otro pool: los grupos se resuelven aquí
+        route, cost, _ = decomposition_solver(dist_matrix, seed=seed, workers=1,
+                                              time_limit=time_limit, **params)
+    else:
+        # Lo que no venga en params se deriva del tamaño de la instancia
+        params = {**default_params(len(dist_matrix)), **params}
+        if time_limit is not None:
+            params['time_limit'] = time_limit
+        iterator = genetic_algorithm_iter(dist_matrix, seed=seed, track_diversity=False, **params)
+        while True:
+            try:
+                snapshot = next(iterator)
+            except StopIteration as stop:
+                route, cost, _, _, info = stop.value
+                break
+            if snapshot['generation'] % PROGRESS_INTERVAL == 0 or snapshot['stop_reason']:
+                _publish(job_id, {'event': 'progress', 'generation': snapshot['generation'],
+                                  'best_cost': snapshot['best_cost'],
+                                  'elapsed': snapshot['elapsed']})
+        result['stop_reason'] = info['stop_reason']
+        result['generations'] = info['generations']
+
+    result['route'] = [int(c) for c in route]
+    result['cost'] = cost.item() if isinstance(cost, np.generic) else cost
+    result['elapsed'] = time.time() - start
+    return result
+
+
+# ─────────────────────────────────────────────
+# SERVICIO: COLA Y DESPACHO
+# ─────────────────────────────────────────────
+
+def check_params(solver, params):
+    """
+    Lanza ValueError si `params` trae algún argumento que no está en
+    SERVICE_PARAMS[solver] (también dentro de 'ga_params' de la descomposición).
+    """
+    if not isinstance(params, dict):
+        raise ValueError("'params' debe ser un objeto JSON")
+    allowed = SERVICE_PARAMS[solver]
+    unknown = sorted(set(params) - set(allowed))
+    if unknown:
+        raise ValueError(f"Parámetros no permitidos para {solver!r}: {unknown} "
+                         f"(opciones: {allowed})")
+    if params.get('ga_params') is not None:
+        check_params('ga', params['ga_params'])
+
+
+def honours_time_limit(solver, params):
+    """True si el solver puede cortar a tiempo: el AG, o la descomposición con solver 'ga'."""
+    return solver == 'ga' or (solver == 'decomposition' and params.get('solver') == 'ga')
+
+
+def resolve_data_path(value, data_dir):
+    """
+    Ruta real de `value` dentro de `data_dir` (las rutas relativas son relativas a
+    esa carpeta). Lanza ValueError si no hay carpeta de datos o si la ruta sale
+    de ella (con '..', una ruta absoluta o un enlace simbólico).
+    """
+    if data_dir is None:
+        raise ValueError("El servicio no tiene carpeta de datos: use 'tsp' o 'matrix'")
+    if not isinstance(value, str):
+        raise ValueError("'path' debe ser un texto")
+    root = os.path.realpath(data_dir)
+    path = os.path.realpath(os.path.join(root, value))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError(f"{value!r} está fuera de la carpeta de datos del servicio")
+    return path
+
+
+def instance_key(source, lazy):
+    """
+    Clave de una instancia: hash de su contenido (texto o matriz). De una ruta
+    se usan la ruta, el tamaño y la fecha de modificación (si el archivo cambia,
+    la clave también). Lanza ValueError si la ruta no existe.
+    """
+    digest = hashlib.sha256(json.dumps([source[0], lazy]).encode('utf-8'))
+    value = source[1]
+    if source[0] == 'path':
+        try:
+            stat = os.stat(value)
+        except (OSError, TypeError) as exc:
+            raise ValueError(f"No se puede leer {value!r}: {exc}") from exc
+        digest.update(json.dumps([stat.st_size, stat.st_mtime_ns]).encode('utf-8'))
+    digest.update(value.encode('utf-8') if isinstance(value, str)
+                  else json.dumps(value).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class SolverService:
+    """
+    Cola de trabajos + pool de procesos calientes. Se usa dentro de un event loop:
+
+        service = SolverService(workers=4)
+        await service.start()          # Crea y calienta los procesos
+        job = service.submit({...})    # Encola; job['id'] identifica el trabajo
+        await job['finished'].wait()
+        await service.close()
+
+    A lo sumo `workers` trabajos corren a la vez; el resto espera en la cola en
+    orden de llegada.
+    """
+
+    def __init__(self, workers=None, backend=None, cache_dir=DEFAULT_CACHE_DIR,
+                 data_dir=DEFAULT_DATA_DIR):
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.data_dir = data_dir  # None = sin trabajos con 'path'
+        self.jobs = OrderedDict()      # id → trabajo (diccionario)
+        self.queue = None
+        self.pool = None
+        self.worker_pids = []
+        self._progress = None
+        self._pump = None
+        self._dispatchers = []
+        self._loop = None
+
+    async def start(self):
+        """Crea el pool, lo calienta (un _warm_up por proceso) y arranca los despachadores."""
+        self._loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        self._progress = multiprocessing.Queue()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                        initargs=(self._progress, self.backend))
+        # Enviar las tareas a la vez obliga al pool a crear todos sus procesos ahora
+        warm = [self._loop.run_in_executor(self.pool, _warm_up) for _ in range(self.workers)]
+        self.worker_pids = sorted(set(await asyncio.gather(*warm)))
+
+        self._pump = threading.Thread(target=self._pump_progress, daemon=True)
+        self._pump.start()
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+
+    async def close(self):
+        """Detiene los despachadores y el pool (los trabajos en curso terminan antes)."""
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        if self.pool is not None:
+            await self._loop.run_in_executor(None, self.pool.shutdown)
+        if self._progress is not None:
+            self._progress.put(None)  # Termina el hilo que lee el progreso
+            self._pump.join()
+
+    def submit(self, request):
+        """
+        Encola un trabajo. `request` es un diccionario con UNA de las claves:
+        - 'tsp': contenido de un archivo TSPLIB (texto)
+        - 'matrix': matriz de distancias (lista de listas)
+        - 'path': ruta de un .tsp dentro de la carpeta de datos del servicio
+          (data_dir; usa la caché de matrices)
+        y opcionalmente:
+        - 'solver': uno de SERVICE_SOLVERS (por defecto 'ga')
+        - 'params': argumentos del solver, solo los de SERVICE_PARAMS (en el AG,
+          los que falten se toman de default_params según el tamaño de la instancia)
+        - 'seed': semilla (por defecto 42)
+        - 'time_limit': presupuesto en segundos desde que llega el trabajo; el AG
+          (también el de cada grupo en 'decomposition' con solver 'ga') recibe lo
+          que quede al salir de la cola. Los solvers que no se pueden cortar ('nn'
+          y la descomposición con 'nn') lo rechazan
+        - 'lazy': distancias al vuelo en instancias por coordenadas
+
+        Retorna el trabajo (diccionario). Lanza ValueError si la petición es inválida.
+        """
+        if not isinstance(request, dict):
+            raise ValueError("La petición debe ser un objeto JSON")
+        given = [k for k in ('tsp', 'matrix', 'path') if k in request]
+        if len(given) != 1:
+            raise ValueError("La petición necesita exactamente una de 'tsp', 'matrix' o 'path'")
+        solver = request.get('solver', 'ga')
+        if solver not in SERVICE_SOLVERS:
+            raise ValueError(f"Solver desconocido: {solver!r} (opciones: {SERVICE_SOLVERS})")
+        params = request.get('params') or {}
+        check_params(solver, params)
+        time_limit = request.get('time_limit')
+        if time_limit is not None and (not isinstance(time_limit, (int, float)) or time_limit <= 0):
+            raise ValueError("'time_limit' debe ser un número de segundos mayor que 0")
+        if time_limit is not None and not honours_time_limit(solver, params):
+            raise ValueError(f"El solver {solver!r} no puede respetar 'time_limit' "
+                             f"(solo 'ga' y 'decomposition' con solver 'ga')")
+
+        source = (given[0], request[given[0]])
+        if source[0] == 'path':
+            source = ('path', resolve_data_path(source[1], self.data_dir))
+        lazy = bool(request.get('lazy', False))
+        job = {
+            'id': uuid.uuid4().hex,
+            'status': 'queued',
+            'solver': solver,
+            'submitted': time.time(),
+            'started': None,
+            'ended': None,
+            'result': None,
+            'error': None,
+            'events': [],
+            'listeners': set(),
+            'finished': asyncio.Event(),
+            'task': (instance_key(source, lazy), source, solver, params,
+                     request.get('seed', 42), time_limit, lazy),
+        }
+        self.jobs[job['id']] = job
+        self.queue.put_nowait(job)
+        return job
+
+    async def _dispatch(self):
+        """Toma trabajos de la cola y los ejecuta en el pool, de a uno."""
+        while True:
+            job = await self.queue.get()
+            key, source, solver, params, seed, time_limit, lazy = job['task']
+            if time_limit is not None:
+                time_limit -= time.time() - job['submitted']  # Descontamos la espera
+                if time_limit <= 0:
+                    self._finish(job, 'expired', error="El presupuesto de tiempo se agotó en la cola")
+                    continue
+            job['status'] = 'running'
+            job['started'] = time.time()
+            self._emit(job, {'event': 'started', 'queued': job['started'] - job['submitted']})
+            try:
+                result = await self._loop.run_in_executor(
+                    self.pool, _run_job, job['id'], key, source, solver, params, seed,
+                    time_limit, lazy, self.cache_dir
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # El error del trabajo se informa; el servicio sigue
+                self._finish(job, 'failed', error=f"{type(exc).__name__}: {exc}")
+            else:
+                self._finish(job, 'done', result=result)
+
+    def _finish(self, job, status, result=None, error=None):
+        job['status'] = status
+        job['ended'] = time.time()
+        job['result'] = result
+        job['error'] = error
+        job['task'] = None  # Liberamos la instancia
+        self._emit(job, {'event': status, **({'cost': result['cost']} if result else {}),
+                         **({'error': error} if error else {})})
+        job['finished'].set()
+        self._forget_old_jobs()
+
+    def _forget_old_jobs(self):
+        finished = [j for j in self.jobs.values() if j['finished'].is_set()]
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job['id']]
+
+    def _emit(self, job, event):
+        """Guarda un evento del trabajo y lo entrega a quienes lo siguen en vivo."""
+        job['events'].append(event)
+        for listener in job['listeners']:
+            listener.put_nowait(event)
+
+    def _pump_progress(self):
+        """Hilo: pasa los eventos de progreso de los trabajadores al event loop."""
+        while True:
+            item = self._progress.get()
+            if item is None:
+                return
+            job_id, event = item
+            self._loop.call_soon_threadsafe(self._deliver_progress, job_id, event)
+
+    def _deliver_progress(self, job_id, event):
+        job = self.jobs.get(job_id)
+        if job is not None and job['status'] == 'running':
+            self._emit(job, event)
+
+    async def events(self, job):
+        """Generador asíncrono con los eventos del trabajo (los ya ocurridos y los nuevos)."""
+        listener = asyncio.Queue()
+        for event in job['events']:
+            listener.put_nowait(event)
+        if not job['finished'].is_set():
+            job['listeners'].add(listener)
+        try:
+            while True:
+                if job['finished'].is_set() and listener.empty():
+                    return
+                event = await listener.get()
+                yield event
+                if event['event'] in JOB_STATES[2:]:
+                    return
+        finally:
+            job['listeners'].discard(listener)
+
+    def job_status(self, job):
+        """Vista JSON de un trabajo."""
+        status = {key: job[key] for key in ('id', 'status', 'solver', 'submitted', 'started',
+                                            'ended', 'result', 'error')}
+        if job['status'] == 'queued':
+            status['position'] = sum(1 for j in self.jobs.values() if j['status'] == 'queued'
+                                     and j['submitted'] <= job['submitted'])
+        return status
+
+    def health(self):
+        states = [j['status'] for j in self.jobs.values()]
+        return {'workers': len(self.worker_pids), 'worker_pids': self.worker_pids,
+                'queued': states.count('queued'), 'running': states.count('running'),
+                'jobs': len(states)}
+
+
+# ─────────────────────────────────────────────
+# HTTP (mínimo, sobre asyncio)
+# ─────────────────────────────────────────────
+
+HTTP_REASONS = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found',
+                405: 'Method Not Allowed', 413: 'Payload Too Large',
+                415: 'Unsupported Media Type'}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+async def _read_request(reader):
+    """
+    Lee una petición HTTP/1.1. Retorna (método, ruta, Content-Type, cuerpo) o
+    None si se cerró.
+    """
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    parts = request_line.decode('latin-1').split()
+    if len(parts) != 3:
+        raise HTTPError(400, "Línea de petición inválida")
+    method, path, _ = parts
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get('content-length', 0))
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, f"El cuerpo supera {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b''
+    content_type = headers.get('content-type', '').split(';', 1)[0].strip().lower()
+    return method, path.split('?', 1)[0], content_type, body
+
+
+def _response(status, payload, content_type='application/json'):
+    body = (json.dumps(payload) + '\n').encode('utf-8')
+    head = (f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n")
+    return head.encode('latin-1') + body
+
+
+async def _route(service, method, path, content_type, body, writer):
+    """Atiende una petición. Retorna la respuesta (bytes) o None si ya se escribió."""
+    parts = [p for p in path.split('/') if p]
+    if parts == ['health']:
+        return _response(200, service.health())
+
+    if parts == ['jobs']:
+        if method != 'POST':
+            raise HTTPError(405, "Use POST /jobs")
+        if content_type != 'application/json':
+            # Un formulario o un text/plain de otra página web no pasa de aquí: con
+            # application/json el navegador pide permiso (CORS) y el servicio no lo da
+            raise HTTPError(415, "POST /jobs necesita Content-Type: application/json")
+        try:
+            request = json.loads(body or b'null')
+            job = service.submit(request)
+        except (json.JSONDecodeError, ValueError) as exc:
+            raise HTTPError(400, str(exc)) from exc
+        if request.get('wait'):
+            await job['finished'].wait()
+            return _response(200, service.job_status(job))
+        return _response(202, {'id': job['id'], 'status': job['status']})
+
+    if len(parts) in (2, 3) and parts[0] == 'jobs':
+        job = service.jobs.get(parts[1])
+        if job is None:
+            raise HTTPError(404, f"No existe el trabajo {parts[1]}")
+        if len(parts) == 2:
+            return _response(200, service.job_status(job))
+        if parts[2] == 'events':
+            # Respuesta sin Content-Length: termina al cerrar la conexión
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                         b"Connection: close\r\n\r\n")
+            async for event in service.events(job):
+                writer.write((json.dumps(event) + '\n').encode('utf-8'))
+                await writer.drain()
+            return None
+
+    raise HTTPError(404, f"Ruta desconocida: {path}")
+
+
+def make_handler(service):
+    """Crea el manejador de conexiones de asyncio.start_server para `service`."""
+    async def handle(reader, writer):
+        try:
+            try:
+                request = await _read_request(reader)
+                if request is None:
+                    return
+                response = await _route(service, *request, writer)
+            except HTTPError as exc:
+                response = _response(exc.status, {'error': str(exc)})
+            except (ValueError, asyncio.IncompleteReadError) as exc:
+                response = _response(400, {'error': str(exc)})
+            if response is not None:
+                writer.write(response)
+            await writer.drain()
+        except ConnectionError:
+            pass  # El cliente se fue antes de la respuesta
+        finally:
+            writer.close()
+    return handle
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None, workers=None,
+                backend=None, cache_dir=DEFAULT_CACHE_DIR, data_dir=DEFAULT_DATA_DIR,
+                ready=None):
+    """
+    Arranca el servicio y atiende peticiones hasta que se cancele.
+    Con `socket_path` escucha en un socket Unix en lugar de host:port.
+    Los trabajos con 'path' solo leen archivos dentro de `data_dir`.
+    `ready` (asyncio.Event, opcional) se activa cuando ya acepta conexiones.
+    """
+    service = SolverService(workers, backend, cache_dir, data_dir)
+    await service.start()
+    handler = make_handler(service)
+    if socket_path is not None:
+        server = await asyncio.start_unix_server(handler, path=socket_path)
+        where = socket_path
+    else:
+        server = await asyncio.start_server(handler, host, port)
+        where = ', '.join(f"{s.getsockname()[0]}:{s.getsockname()[1]}" for s in server.sockets)
+    print(f"[SERVICIO] Escuchando en {where} con {len(service.worker_pids)} procesos")
+    if ready is not None:
+        ready.set()
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+        if socket_path is not None and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def main(argv=None):
+    """Punto de entrada: python -m src.service [opciones]."""
+    parser = argparse.ArgumentParser(prog='tsp-ga-service',
+                                     description='Servicio local del solver TSP.')
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help=f'dirección TCP (por defecto: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f'puerto TCP (por defecto: {DEFAULT_PORT})')
+    parser.add_argument('--socket', default=None, metavar='RUTA',
+                        help='escucha en un socket Unix en lugar de TCP')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='procesos del pool (por defecto: núcleos disponibles)')
+    parser.add_argument('--backend', choices=BACKENDS, default=None,
+                        help='kernels de los procesos trabajadores (ver src/backends.py)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f'caché de matrices para trabajos con "path" (por defecto: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR,
+                        help='carpeta de la que se leen los trabajos con "path" '
+                             f'(por defecto: {DEFAULT_DATA_DIR})')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.socket, args.workers, args.backend,
+                          args.cache_dir, args.data_dir))
+    except KeyboardInterrupt:
+        print("\n[SERVICIO] Detenido")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+# tuning.py
+# Parámetros del AG sin ajuste manual: valores por tamaño y ajuste automático
+#
+# IDEA:
+# - GA_PARAMS (main.py) tiene parámetros ajustados a mano para gr17, gr21 y
+#   gr24; una instancia nueva no tiene entrada
+# - default_params(n) deriva parámetros razonables a partir del número de ciudades
+# - tune() busca, para cada clase de tamaño de instancia (INSTANCE_CLASSES), la
+#   mejor combinación de una grilla de candidatos con "successive halving":
+#   todos los candidatos corren con pocas semillas, sobrevive la mejor mitad,
+#   los sobrevivientes corren con el doble de semillas, y así hasta quedar uno.
+#   Las corridas de cada ronda se reparten en un pool de procesos.
+# - El resultado es un "perfil" (JSON) con los parámetros elegidos por clase;
+#   params_for(n, perfil) los combina con default_params(n)
+#
+# Uso:  python -m src.tuning data/gr17.tsp data/gr21.tsp --out tuning_profile.json
+#       python main.py --params-profile tuning_profile.json
+
+import argparse
+import itertools
+import json
+import math
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+from src.cache import DEFAULT_CACHE_DIR, atomic_write, load_distance_matrix
+from src.genetic_algorithm import genetic_algorithm
+
+# Clases de instancia por número de ciudades: (nombre, máximo de ciudades)
+INSTANCE_CLASSES = (
+    ('tiny', 50),
+    ('small', 200),
+    ('medium', 1000),
+    ('large', None),
+)
+
+# Grilla de candidatos por defecto: se combinan todos los valores
+DEFAULT_TUNING_GRID = {
+    'mutation_rate': (0.05, 0.15, 0.3),
+    'crossover': ('ox1', 'eax'),
+    'adaptive': (False, True),
+}
+
+# Con cuántas semillas corre cada candidato en la primera ronda
+INITIAL_SEEDS = 1
+
+
+def instance_class(n):
+    """Nombre de la clase de INSTANCE_CLASSES a la que pertenece una instancia de n ciudades."""
+    for name, limit in INSTANCE_CLASSES:
+        if limit is None or n <= limit:
+            return name
+    return INSTANCE_CLASSES[-1][0]
+
+
+def default_params(n):
+    """
+    Parámetros del AG derivados del número de ciudades, en el formato de GA_PARAMS.
+
+    - pop_size: crece con la raíz de n (entre 100 y 500)
+    - generations: crece con n (entre 500 y 5000)
+    - elite_size: 10% de la población
+    - crossover: OX1 en instancias chicas; EAX (hereda aristas, converge en
+      muchas menos generaciones) desde 'small', con parada por estancamiento
+    """
+    pop_size = int(min(500, max(100, 40 * round(math.sqrt(n)))))
+    params = {
+        'pop_size': pop_size,
+        'generations': int(min(5000, max(500, 50 * n))),
+        'mutation_rate': 0.15,
+        'elite_size': max(2, pop_size // 10),
+        'tournament_size': 5,
+        'crossover': 'ox1',
+    }
+    if instance_class(n) != 'tiny':
+        params['crossover'] = 'eax'
+        params['stagnation'] = 200
+    return params
+
+
+def params_for(n, profile=None):
+    """default_params(n) con los valores del perfil para la clase de la instancia (si hay)."""
+    params = default_params(n)
+    if profile:
+        params.update(profile.get(instance_class(n), {}))
+    return params
+
+
+def load_profile(path):
+    """Lee un perfil escrito por save_profile: {clase: parámetros}."""
+    with open(path, encoding='utf-8') as f:
+        profile = json.load(f)
+    unknown = set(profile) - {name for name, _ in INSTANCE_CLASSES}
+    if unknown:
+        raise ValueError(f"Clases desconocidas en {path}: {sorted(unknown)} "
+                         f"(opciones: {[name for name, _ in INSTANCE_CLASSES]})")
+    return profile
+
+
+def save_profile(profile, path):
+    """Guarda un perfil como JSON (de forma atómica)."""
+    data = json.dumps(profile, indent=2, sort_keys=True).encode('utf-8')
+    atomic_write(path, lambda f: f.write(data))
+
+
+def grid_candidates(grid):
+    """Todas las combinaciones de la grilla {parámetro: valores}, como lista de diccionarios."""
+    keys = list(grid)
+    return [dict(zip(keys, combo, strict=True)) for combo in itertools.product(*(grid[k] for k in keys))]
+
+
+# ─────────────────────────────────────────────
+# SUCCESSIVE HALVING
+# ─────────────────────────────────────────────
+
+def _tuning_run(filepath, overrides, seed, time_limit, cache_dir):
+    """Tarea del pool: una corrida del AG con default_params + `overrides`. Retorna el costo."""
+    dimension, dist_matrix = load_distance_matrix(filepath, cache_dir)
+    params = {**default_params(dimension), **overrides}
+    if time_limit is not None:
+        params['time_limit'] = time_limit
+    _, cost, _, _ = genetic_algorithm(dist_matrix, verbose=False, seed=seed, **params)
+    return cost
+
+
+def successive_halving(instances, candidates, seeds, eta=2, workers=None, time_limit=None,
+                       cache_dir=DEFAULT_CACHE_DIR, verbose=True):
+    """
+    Elige el mejor candidato para un grupo de instancias.
+
+    Parámetros:
+    - instances: rutas de archivos .tsp
+    - candidates: lista de diccionarios de parámetros (se aplican sobre default_params)
+    - seeds: semillas disponibles; en cada ronda los sobrevivientes corren con
+      eta veces más semillas que en la anterior (las corridas previas se reutilizan)
+    - eta: en cada ronda sobrevive 1/eta de los candidatos (entero >= 2)
+    - time_limit: segundos por corrida (mide la calidad alcanzada en ese tiempo)
+
+    Cada corrida se puntúa como costo / mejor costo visto en esa instancia, y un
+    candidato se puntúa con la media de sus corridas (1.0 = siempre el mejor).
+
+    Retorna: lista de (candidato, puntaje, corridas), de mejor a peor puntaje,
+    con los candidatos de la última ronda primero.
+    """
+    if not candidates:
+        raise ValueError("successive_halving necesita al menos un candidato")
+    if eta < 2:
+        # Con eta=1 no se descarta a nadie ni crecen las semillas: no terminaría nunca
+        raise ValueError(f"eta debe ser al menos 2; se recibió {eta}")
+    costs = {}  # (candidato, instancia, semilla) → costo
+    alive = list(range(len(candidates)))
+    n_seeds = min(INITIAL_SEEDS, len(seeds))
+    ranking = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            jobs = {
+                (c, path, seed): pool.submit(_tuning_run, path, candidates[c], seed,
+                                             time_limit, cache_dir)
+                for c in alive for path in instances for seed in seeds[:n_seeds]
+                if (c, path, seed) not in costs
+            }
+            for key, future in jobs.items():
+                costs[key] = future.result()
+
+            best = {path: min(cost for (_, p, _), cost in costs.items() if p == path)
+                    for path in instances}
+            scores = {
+                c: statistics.mean(cost / best[p] if best[p] > 0 else 1.0
+                                   for (cc, p, _), cost in costs.items() if cc == c)
+                for c in alive
+            }
+            alive.sort(key=lambda c: scores[c])
+            ranking = [(candidates[c], scores[c], n_seeds * len(instances)) for c in alive] + [
+                r for r in ranking if r[0] not in [candidates[c] for c in alive]
+            ]
+            if verbose:
+                print(f"  Ronda con {n_seeds} semilla(s): {len(alive)} candidatos; "
+                      f"mejor {candidates[alive[0]]} (puntaje {scores[alive[0]]:.4f})")
+
+            if len(alive) == 1 or n_seeds >= len(seeds):
+                return ranking
+            alive = alive[:max(1, math.ceil(len(alive) / eta))]
+            n_seeds = min(len(seeds), n_seeds * eta)
+
+
+def tune(instances, grid=None, seeds=(1, 2, 3, 4), eta=2, workers=None, time_limit=None,
+         cache_dir=DEFAULT_CACHE_DIR, verbose=True):
+    """
+    Ajusta los parámetros por clase de instancia.
+
+    Agrupa `instances` (rutas .tsp) por instance_class y corre
+    successive_halving sobre cada grupo con los candidatos de `grid`
+    (DEFAULT_TUNING_GRID por defecto).
+
+    Retorna: el perfil {clase: parámetros elegidos}, listo para save_profile.
+    """
+    candidates = grid_candidates(grid or DEFAULT_TUNING_GRID)
+    groups = {}
+    for path in instances:
+        dimension, _ = load_distance_matrix(path, cache_dir)  # Llena la caché antes del pool
+        groups.setdefault(instance_class(dimension), []).append(path)
+
+    profile = {}
+    for name, paths in groups.items():
+        if verbose:
+            print(f"\n[TUNING] Clase '{name}': {len(paths)} instancia(s), "
+                  f"{len(candidates)} candidatos")
+        ranking = successive_halving(paths, candidates, list(seeds), eta, workers, time_limit,
+                                     cache_dir, verbose)
+        profile[name] = ranking[0][0]
+    return profile
+
+
+def main(argv=None):
+    """Punto de entrada: python -m src.tuning INSTANCIAS... [opciones]."""
+    parser = argparse.ArgumentParser(prog='tsp-ga-tune',
+                                     description='Ajuste automático de parámetros del AG.')
+    parser.add_argument('instances', nargs='+', metavar='ARCHIVO', help='instancias .tsp')
+    parser.add_argument('--seeds', nargs='+', type=int, default=[1, 2, 3, 4], metavar='SEMILLA')
+    parser.add_argument('--eta', type=int, default=2,
+                        help='en cada ronda sobrevive 1/ETA de los candidatos (por defecto: 2)')
+    parser.add_argument('--time-limit', type=float, default=None, metavar='SEG',
+                        help='tiempo máximo por corrida del AG')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='procesos del pool (por defecto: núcleos disponibles)')
+    parser.add_argument('--grid', default=None, metavar='JSON',
+                        help='grilla propia {"parámetro": [valores]} '
+                             '(por defecto: DEFAULT_TUNING_GRID)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--out', default='tuning_profile.json',
+                        help='archivo del perfil (por defecto: %(default)s)')
+    args = parser.parse_args(argv)
+
+    if args.eta < 2:
+        parser.error("--eta debe ser al menos 2")
+    missing = [p for p in args.instances if not os.path.exists(p)]
+    if missing:
+        parser.error(f"no existen: {', '.join(missing)}")
+    grid = json.loads(args.grid) if args.grid else None
+    profile = tune(args.instances, grid, args.seeds, args.eta, args.workers, args.time_limit,
+                   args.cache_dir)
+    save_profile(profile, args.out)
+    print(f"\n[OK] Perfil guardado en {args.out}")
+    for name, params in profile.items():
+        print(f"  {name}: {params}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,31 @@
 # utils.py
-# Funciones auxiliares: graficar convergencia, formatear resultados
+# Funciones auxiliares: guardar y graficar la convergencia, formatear resultados
+#
+# matplotlib NO se importa al cargar este módulo: solo las funciones que
+# grafican lo importan, así el AG (y cada proceso del modo batch) arranca sin
+# pagar su costo. Las gráficas usan Figure directamente (sin pyplot), que no
+# necesita backend gráfico y se puede dibujar desde un hilo aparte.
 
-import matplotlib
-matplotlib.use('Agg')  # Usar backend no interactivo para evitar problemas con GUI
-import matplotlib.pyplot as plt  # Para crear gráficas
+import csv
+
+import numpy as np
+
+
+def save_history(history, path):
+    """
+    Guarda la historia del AG (mejor costo por generación) sin graficarla.
+
+    El formato sale de la extensión de `path`:
+    - .csv: columnas generation,best_cost (para planillas u otras herramientas)
+    - cualquier otra (ej. .npy): arreglo binario de numpy, se lee con np.load
+    """
+    if path.endswith('.csv'):
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['generation', 'best_cost'])
+            writer.writerows(enumerate(history))
+    else:
+        np.save(path, np.asarray(history))
 
 
 def plot_convergence(history, title="Convergencia del Algoritmo Genético", save_path=None):
@@ -15,24 +37,39 @@ def plot_convergence(history, title="Convergencia del Algoritmo Genético", save
     - title: título de la gráfica
     - save_path: si se proporciona, guarda la imagen en esa ruta
     """
-    plt.figure(figsize=(10, 5))  # Tamaño de la figura en pulgadas
+    plot_convergence_runs([history], ['Mejor costo'], title, save_path)
+
+
+def plot_convergence_runs(histories, labels, title="Convergencia del Algoritmo Genético",
+                          save_path=None):
+    """
+    Grafica varias historias en la misma figura (ej. las semillas del modo batch).
+
+    Parámetros:
+    - histories: lista de historias (costos por generación)
+    - labels: una etiqueta por historia, para la leyenda
+    - title, save_path: igual que plot_convergence
+    """
+    from matplotlib.figure import Figure  # Import perezoso: solo se paga al graficar
+
+    fig = Figure(figsize=(10, 5))  # Tamaño de la figura en pulgadas
+    ax = fig.subplots()
 
     # range(len(history)) genera [0, 1, 2, ..., n-1] = número de generación
-    plt.plot(range(len(history)), history, 'b-', linewidth=1.5, label='Mejor costo')
+    for history, label in zip(histories, labels, strict=True):
+        ax.plot(range(len(history)), history, linewidth=1.5, label=label)
 
-    plt.xlabel('Generacion')           # Etiqueta del eje X
-    plt.ylabel('Costo de la ruta')     # Etiqueta del eje Y
-    plt.title(title)                   # Título de la gráfica
-    plt.legend()                       # Muestra la leyenda
-    plt.grid(True, alpha=0.3)          # Agrega cuadrícula semi-transparente
-    plt.tight_layout()                 # Ajusta márgenes automáticamente
+    ax.set_xlabel('Generacion')           # Etiqueta del eje X
+    ax.set_ylabel('Costo de la ruta')     # Etiqueta del eje Y
+    ax.set_title(title)                   # Título de la gráfica
+    ax.legend()                           # Muestra la leyenda
+    ax.grid(True, alpha=0.3)              # Agrega cuadrícula semi-transparente
+    fig.tight_layout()                    # Ajusta márgenes automáticamente
 
     if save_path:
-        plt.savefig(save_path, dpi=150)  # Guarda la imagen con buena resolución
+        fig.savefig(save_path, dpi=150)  # Guarda la imagen con buena resolución
         print(f"  Gráfica guardada en: {save_path}")
 
-    plt.close()  # Cierra la figura para liberar memoria
-
 
 def print_results_table(results):
     """
@@ -47,16 +84,80 @@ def print_results_table(results):
         'ga_time': 3.45,
         'efficiency': 1.00
     }
+
+    Si los diccionarios vienen del modo batch (tienen 'runs', 'ga_cost_mean' y
+    'ga_cost_std'), la tabla agrega columnas con la estadística sobre semillas:
+    'AG Min' es el mejor costo, 'AG Media'/'AG Desv' la media y desviación,
+    y tiempo y eficiencia son promedios.
     """
+    if any('ga_cost_mean' in r for r in results):
+        _print_batch_table(results)
+        return
+
     print("\n" + "="*80)
     print(f"{'Instancia':<12} {'Opt.Lit.':<12} {'NN Costo':<12} {'AG Costo':<12} "
           f"{'Tiempo(s)':<12} {'Eficiencia':<10}")
     print("="*80)
 
     for r in results:
-        eff = r.get('efficiency', 'N/A')
-        eff_str = f"{eff:.4f}" if isinstance(eff, float) else eff
+        eff = r.get('efficiency')
+        eff_str = f"{eff:.4f}" if isinstance(eff, float) else 'N/A'  # Sin óptimo conocido: None
         print(f"{r['instance']:<12} {r['optimal']:<12} {r['nn_cost']:<12} "
               f"{r['ga_cost']:<12} {r['ga_time']:<12.3f} {eff_str:<10}")
 
     print("="*80)
+
+
+def _print_batch_table(results):
+    """Tabla del modo batch: una fila por (instancia, parámetros)."""
+    width = 112
+    print("\n" + "="*width)
+    print(f"{'Instancia':<10} {'Corridas':<9} {'Opt.Lit.':<9} {'NN Costo':<9} {'AG Min':<9} "
+          f"{'AG Media':<10} {'AG Desv':<9} {'Tiempo(s)':<10} {'Eficiencia':<10} Parámetros")
+    print("="*width)
+
+    for r in results:
+        eff = r.get('efficiency')
+        eff_str = f"{eff:.4f}" if isinstance(eff, float) else 'N/A'
+        params = ' '.join(f"{k}={v}" for k, v in r.get('params', {}).items())
+        print(f"{r['instance']:<10} {r['runs']:<9} {r['optimal']:<9} {r['nn_cost']:<9} "
+              f"{r['ga_cost']:<9} {r['ga_cost_mean']:<10.1f} {r['ga_cost_std']:<9.2f} "
+              f"{r['ga_time']:<10.3f} {eff_str:<10} {params}")
+
+    print("="*width)
+
+
+def print_profile_table(results):
+    """
+    Imprime, para cada resultado que traiga 'profile' (un resumen de
+    Profiler.summary), las evaluaciones por segundo y qué fracción del tiempo
+    medido se fue en cada fase del AG.
+    """
+    rows = [r for r in results if r.get('profile')]
+    if not rows:
+        return
+
+    # Fases principales con columna propia; el resto se agrupa en 'Otros'
+    columns = [('evaluation', 'Eval.'), ('elitism', 'Elite'), ('selection', 'Selec.'),
+               ('crossover', 'Cruce'), ('mutation', 'Mutac.'), ('local_search', 'B.Local'),
+               ('diversity', 'Divers.')]
+    width = 112
+    print("\n" + "="*width)
+    print(f"{'Instancia':<10} {'Gener.':<8} {'Evals':<10} {'Evals/s':<11} {'Div.Fin':<8} "
+          + ' '.join(f"{label:<7}" for _, label in columns) + f" {'Otros':<7}")
+    print("="*width)
+
+    for r in rows:
+        profile = r['profile']
+        phases = profile['phases']
+        shares = [phases.get(phase, {}).get('share', 0.0) for phase, _ in columns]
+        others = 1.0 - sum(shares)
+        rate = profile['evals_per_second']
+        rate_str = f"{rate:,.0f}" if rate is not None else 'N/A'
+        div = profile['final_diversity']
+        div_str = f"{div:.3f}" if div is not None else 'N/A'
+        print(f"{r['instance']:<10} {profile['generations']:<8} {profile['evaluations']:<10} "
+              f"{rate_str:<11} {div_str:<8} "
+              + ' '.join(f"{share:<7.1%}" for share in shares) + f" {others:<7.1%}")
+
+    print("="*width)
@@ -0,0 +1,90 @@
+# test_backends.py
+# Elección del backend de kernels y resultados iguales en todos ellos
+
+import numpy as np
+import pytest
+
+from src import backends
+from src.parser import parse_tsp
+
+RNG = np.random.default_rng(0)
+FLOAT_MATRIX = RNG.random((30, 30)) * 100
+MATRICES = {
+    'int16': parse_tsp('data/gr24.tsp')[1],
+    'float64': (FLOAT_MATRIX + FLOAT_MATRIX.T) / 2,
+}
+
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    previous = backends.get_backend()
+    yield
+    backends.set_backend(previous)
+
+
+@pytest.mark.parametrize('value', ['bogus', 'numba'])
+def test_invalid_environment_value_falls_back_with_a_warning(monkeypatch, value):
+    if value in backends.available_backends():
+        pytest.skip(f"{value} está instalado")
+    monkeypatch.setenv(backends.BACKEND_ENV, value)
+    with pytest.warns(RuntimeWarning, match=backends.BACKEND_ENV):
+        backends._init_backend()
+    assert backends.get_backend() == backends.available_backends()[0]
+
+
+def test_environment_value_selects_the_backend(monkeypatch):
+    monkeypatch.setenv(backends.BACKEND_ENV, 'python')
+    backends._init_backend()
+    assert backends.get_backend() == 'python'
+
+
+def test_set_backend_rejects_unknown_names():
+    with pytest.raises(ValueError, match='desconocido'):
+        backends.set_backend('fortran')
+
+
+# ─── Kernels: cada backend instalado contra el de Python puro ────────────────
+
+def reference(kernel, *args):
+    backends.set_backend('python')
+    return getattr(backends, kernel)(*args)
+
+
+def random_population(n, pop_size=40):
+    return np.array([RNG.permutation(n) for _ in range(pop_size)], dtype=np.int32)
+
+
+@pytest.mark.parametrize('backend', backends.available_backends())
+@pytest.mark.parametrize('dtype', list(MATRICES))
+def test_tour_costs_match_across_backends(backend, dtype):
+    dist_matrix = MATRICES[dtype]
+    routes = random_population(len(dist_matrix))
+    expected = reference('tour_costs', routes, dist_matrix)
+    backends.set_backend(backend)
+    result = backends.tour_costs(routes, dist_matrix)
+    assert result.dtype == expected.dtype
+    assert np.allclose(result, expected, rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize('backend', backends.available_backends())
+def test_order_crossover_matches_across_backends(backend):
+    population = random_population(24)
+    parents = RNG.integers(0, len(population), size=(60, 2))
+    cuts = np.sort(RNG.integers(0, 24, size=(60, 2)), axis=1)
+    expected = reference('order_crossover', population, parents, cuts)
+    backends.set_backend(backend)
+    children = backends.order_crossover(population, parents, cuts)
+    assert np.array_equal(children, expected)
+    assert all(sorted(child) == list(range(24)) for child in children.tolist())
+
+
+@pytest.mark.parametrize('backend', backends.available_backends())
+@pytest.mark.parametrize('dtype', list(MATRICES))
+def test_nearest_neighbor_tours_match_across_backends(backend, dtype):
+    dist_matrix = MATRICES[dtype]
+    starts = np.arange(len(dist_matrix))
+    expected = reference('nearest_neighbor_tours', dist_matrix, starts)
+    backends.set_backend(backend)
+    tours = backends.nearest_neighbor_tours(dist_matrix, starts)
+    assert tours.dtype == np.int32
+    assert np.array_equal(tours, expected)
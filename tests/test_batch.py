@@ -0,0 +1,63 @@
+# test_batch.py
+# Modo batch de main.py: cada corrida deja su historia en output/, con o sin --plot
+
+import os
+
+import numpy as np
+import pytest
+
+from main import params_key, parse_args, run_batch
+from src.parser import parse_tsp
+
+GR17 = os.path.abspath('data/gr17.tsp')
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # output/ y las cachés quedan en la carpeta temporal
+    return tmp_path
+
+
+@pytest.mark.parametrize('history_format', ['npy', 'csv'])
+def test_batch_saves_every_run_history(workdir, history_format):
+    args = parse_args(['--batch', '--seeds', '1', '2', '--pop-size', '20', '--generations', '15',
+                       '--mutation-rate', '0.1', '0.2', '--workers', '2', '--no-result-cache',
+                       '--history-format', history_format])
+    summary = run_batch([('gr17', GR17)], args)
+
+    assert len(summary) == 2
+    for group in summary:
+        assert group['histories'] == []  # Sin --plot no vuelven al proceso principal
+        for seed in (1, 2):
+            path = (workdir / 'output' /
+                    f"history_gr17-{params_key(group['params'])}-seed{seed}.{history_format}")
+            assert path.exists()
+            if history_format == 'npy':
+                history = np.load(path)
+            else:
+                history = np.loadtxt(path, delimiter=',', skiprows=1, usecols=1)
+            assert len(history) == 15
+            assert history[-1] <= history[0]
+
+
+def test_nearest_neighbor_runs_once_per_instance(workdir, monkeypatch):
+    import main
+
+    parent = os.getpid()
+    calls = []
+    original = main.nearest_neighbor
+
+    def counting(dist_matrix, start_city=0):
+        # Los procesos del pool heredan este reemplazo: si una corrida lo llama, falla
+        assert os.getpid() == parent, "nearest_neighbor se llamó en una corrida del pool"
+        calls.append(len(dist_matrix))
+        return original(dist_matrix, start_city=start_city)
+
+    monkeypatch.setattr(main, 'nearest_neighbor', counting)
+    args = parse_args(['--batch', '--seeds', '1', '2', '3', '--pop-size', '20',
+                       '--generations', '5', '--workers', '2', '--no-result-cache'])
+    summary = run_batch([('gr17', GR17)], args)
+
+    assert calls == [17]
+    assert summary[0]['runs'] == 3
+    assert summary[0]['nn_cost'] == original(parse_tsp(GR17)[1])[1]
@@ -0,0 +1,110 @@
+# test_checkpoint.py
+# Retomar una corrida desde su checkpoint da exactamente el mismo resultado
+
+import random
+
+import numpy as np
+import pytest
+
+from src.checkpoint import CHECKPOINT_VERSION, load_checkpoint, save_checkpoint
+from src.genetic_algorithm import genetic_algorithm, genetic_algorithm_iter
+from src.parser import parse_tsp
+
+PARAMS = dict(pop_size=60, generations=240, mutation_rate=0.2, elite_size=6, seed=7)
+
+
+@pytest.fixture(scope='module')
+def dist_matrix():
+    return parse_tsp('data/gr24.tsp')[1]
+
+
+@pytest.mark.parametrize('extra', [
+    {},
+    {'crossover': 'eax', 'adaptive': True},
+    {'crossover': 'pmx', 'stagnation': 20, 'on_stagnation': 'restart'},
+    {'fitness_cache': 1000, 'deduplicate': True},
+])
+def test_resume_reproduces_the_run(tmp_path, dist_matrix, extra):
+    params = {**PARAMS, **extra}
+    route, cost, history, _ = genetic_algorithm(dist_matrix, verbose=False, **params)
+
+    # Corrida "interrumpida": se abandona el generador en la generación 130
+    # (el último checkpoint es el de la generación 100)
+    path = tmp_path / 'run.npz'
+    iterator = genetic_algorithm_iter(dist_matrix, checkpoint_path=str(path),
+                                      checkpoint_interval=50, **params)
+    for snapshot in iterator:
+        if snapshot['generation'] == 130:
+            break
+    iterator.close()
+    assert load_checkpoint(str(path))['generation'] == 100
+
+    resumed = genetic_algorithm(dist_matrix, verbose=False, checkpoint_path=str(path),
+                                checkpoint_interval=50, resume=True, **params)
+    assert resumed[0] == route
+    assert resumed[1] == cost
+    assert resumed[2] == history
+
+
+def test_resume_without_checkpoint_starts_from_scratch(tmp_path, dist_matrix):
+    expected = genetic_algorithm(dist_matrix, verbose=False, **PARAMS)
+    result = genetic_algorithm(dist_matrix, verbose=False, resume=True,
+                               checkpoint_path=str(tmp_path / 'missing.npz'), **PARAMS)
+    assert result[:3] == expected[:3]
+
+
+def test_checkpoint_round_trip(tmp_path):
+    rng = np.random.default_rng(3)
+    rng.random(5)
+    state = {
+        'population': np.arange(12).reshape(3, 4),
+        'costs': np.array([10, 20, 30]),
+        'best_route': [0, 1, 2, 3],
+        'best_cost': 10,
+        'history': [12, 11, 10],
+        'generation': 3,
+        'last_improvement': 2,
+        'restarts': 0,
+        'elapsed': 1.5,
+        'controller': {'mutation_rate': 0.2, 'tournament_size': 4, 'adjustments': 1},
+        'rng': rng,
+    }
+    path = str(tmp_path / 'state.npz')
+    save_checkpoint(path, state)
+    loaded = load_checkpoint(path)
+
+    assert np.array_equal(loaded['population'], state['population'])
+    assert np.array_equal(loaded['costs'], state['costs'])
+    for key in ('best_route', 'best_cost', 'history', 'generation', 'last_improvement',
+                'restarts', 'elapsed', 'controller'):
+        assert loaded[key] == state[key]
+    # El generador sigue la misma secuencia
+    assert np.array_equal(loaded['rng'].random(10), rng.random(10))
+
+
+def test_checkpoint_leaves_global_random_alone(tmp_path):
+    path = str(tmp_path / 'state.npz')
+    save_checkpoint(path, {
+        'population': np.zeros((1, 3), dtype=int), 'costs': np.zeros(1), 'best_route': None,
+        'best_cost': 0, 'history': [], 'generation': 0, 'last_improvement': 0,
+        'restarts': 0, 'elapsed': 0.0, 'rng': np.random.default_rng(),
+    })
+    random.seed(11)
+    expected = random.getstate()
+    load_checkpoint(path)
+    assert random.getstate() == expected
+
+
+def test_checkpoint_of_another_version_is_rejected(tmp_path, monkeypatch):
+    import src.checkpoint as checkpoint
+
+    path = str(tmp_path / 'old.npz')
+    monkeypatch.setattr(checkpoint, 'CHECKPOINT_VERSION', CHECKPOINT_VERSION + 1)
+    save_checkpoint(path, {
+        'population': np.zeros((1, 3), dtype=int), 'costs': np.zeros(1), 'best_route': None,
+        'best_cost': 0, 'history': [], 'generation': 0, 'last_improvement': 0,
+        'restarts': 0, 'elapsed': 0.0, 'rng': np.random.default_rng(),
+    })
+    monkeypatch.undo()
+    with pytest.raises(ValueError, match='versión'):
+        load_checkpoint(path)
@@ -0,0 +1,137 @@
+# test_crossover.py
+# Cruces del AG: OX1 en bloque contra la versión de un solo hijo, y validez
+# de los hijos de PMX, ERX y EAX
+
+import random
+
+import numpy as np
+import pytest
+
+from src import backends
+from src.genetic_algorithm import (
+    eax_crossover_batch,
+    edge_recombination_batch,
+    genetic_algorithm,
+    order_crossover,
+    order_crossover_batch,
+    pmx_crossover_batch,
+    random_cut_points,
+)
+from src.parser import parse_tsp
+
+
+def reference_ox1(parent1, parent2, cut1, cut2):
+    """OX1 tal como lo describe order_crossover, en Python puro."""
+    n = len(parent1)
+    child = [None] * n
+    child[cut1:cut2 + 1] = parent1[cut1:cut2 + 1]
+    segment = set(parent1[cut1:cut2 + 1])
+    fill = [parent2[(cut2 + 1 + k) % n] for k in range(n)]
+    fill = [city for city in fill if city not in segment]
+    for k, city in enumerate(fill):
+        child[(cut2 + 1 + k) % n] = city
+    return child
+
+
+@pytest.fixture(params=backends.available_backends())
+def backend(request):
+    """Corre la prueba con cada backend instalado y deja el anterior al terminar."""
+    previous = backends.get_backend()
+    backends.set_backend(request.param)
+    yield request.param
+    backends.set_backend(previous)
+
+
+@pytest.fixture
+def population():
+    rng = np.random.default_rng(0)
+    return np.array([rng.permutation(30) for _ in range(40)])
+
+
+def assert_permutations(children, n):
+    assert children.shape[1] == n
+    expected = np.arange(n)
+    for child in children:
+        assert np.array_equal(np.sort(child), expected)
+
+
+def test_order_crossover_batch_matches_reference(backend, population):
+    rng = np.random.default_rng(1)
+    parents = rng.integers(0, len(population), size=(200, 2))
+    cuts = random_cut_points(len(parents), population.shape[1], rng)
+
+    children = order_crossover_batch(population, parents, cuts)
+
+    for child, (a, b), (cut1, cut2) in zip(children, parents, cuts, strict=True):
+        expected = reference_ox1(population[a].tolist(), population[b].tolist(), cut1, cut2)
+        assert child.tolist() == expected
+
+
+def test_order_crossover_batch_matches_order_crossover(backend, population):
+    n = population.shape[1]
+    for seed in range(50):
+        # order_crossover elige sus cortes con el módulo random: los repetimos
+        random.seed(seed)
+        cuts = sorted(random.sample(range(n), 2))
+        random.seed(seed)
+        child = order_crossover(population[0].tolist(), population[1].tolist())
+
+        batch = order_crossover_batch(population, np.array([[0, 1]]), np.array([cuts]))
+        assert batch[0].tolist() == child
+
+
+def test_random_cut_points_are_ordered_and_distinct():
+    cuts = random_cut_points(1000, 12, np.random.default_rng(2))
+    assert (cuts[:, 0] < cuts[:, 1]).all()
+    assert cuts.min() >= 0 and cuts.max() <= 11
+
+
+def test_pmx_children_are_permutations(population):
+    rng = np.random.default_rng(3)
+    parents = rng.integers(0, len(population), size=(100, 2))
+    cuts = random_cut_points(len(parents), population.shape[1], rng)
+
+    children = pmx_crossover_batch(population, parents, cuts)
+
+    assert_permutations(children, population.shape[1])
+    # El segmento del padre 1 se copia tal cual
+    for child, (a, _), (cut1, cut2) in zip(children, parents, cuts, strict=True):
+        assert np.array_equal(child[cut1:cut2 + 1], population[a, cut1:cut2 + 1])
+
+
+def test_erx_children_are_permutations(population):
+    rng = np.random.default_rng(4)
+    parents = rng.integers(0, len(population), size=(100, 2))
+
+    children = edge_recombination_batch(population, parents, rng)
+
+    assert_permutations(children, population.shape[1])
+
+
+def test_eax_children_are_permutations():
+    n, dist_matrix = parse_tsp('data/gr24.tsp')
+    rng = np.random.default_rng(5)
+    population = np.array([rng.permutation(n) for _ in range(30)])
+    parents = rng.integers(0, len(population), size=(60, 2))
+
+    children = eax_crossover_batch(population, parents, dist_matrix, rng)
+
+    assert_permutations(children, n)
+
+
+def test_crossover_of_identical_parents_returns_the_parent(population):
+    rng = np.random.default_rng(6)
+    parents = np.zeros((5, 2), dtype=np.intp)
+    cuts = random_cut_points(5, population.shape[1], rng)
+
+    for children in (order_crossover_batch(population, parents, cuts),
+                     pmx_crossover_batch(population, parents, cuts)):
+        assert (children == population[0]).all()
+
+
+def test_eax_ga_ignores_local_search_k():
+    # EAX usa siempre EAX_NEIGHBORS vecinos; local_search_k solo es de la búsqueda local
+    _, dist_matrix = parse_tsp('data/gr24.tsp')
+    params = dict(pop_size=30, generations=20, seed=8, crossover='eax', verbose=False)
+    runs = [genetic_algorithm(dist_matrix, local_search_k=k, **params)[:3] for k in (3, 10, 20)]
+    assert runs[0] == runs[1] == runs[2]
@@ -0,0 +1,100 @@
+# test_decomposition.py
+# Descomposición: particiones, la unión de sub-rutas (_best_break / stitch_tours)
+# contra una búsqueda exhaustiva, y el solver completo dando rutas válidas
+
+import numpy as np
+import pytest
+
+from src.decomposition import (
+    _best_break,
+    cluster_members,
+    decomposition_solver,
+    partition_cities,
+    stitch_tours,
+)
+from src.distances import CoordinateDistanceMatrix, coordinate_distance_matrix
+from src.nearest_neighbor import route_cost
+from src.parser import parse_tsp
+
+COORDS = np.random.default_rng(0).random((300, 2)) * 1000
+DENSE = coordinate_distance_matrix(COORDS, 'EUC_2D')
+LAZY = CoordinateDistanceMatrix(COORDS, 'EUC_2D')
+
+
+def edges(route, closed=True):
+    pairs = zip(route, list(route[1:]) + ([route[0]] if closed else []), strict=closed)
+    return {frozenset((int(a), int(b))) for a, b in pairs}
+
+
+def connection_cost(path, dist_matrix, prev_city, next_city):
+    cost = sum(int(dist_matrix[a, b]) for a, b in zip(path[:-1], path[1:], strict=True))
+    if prev_city is not None:
+        cost += int(dist_matrix[prev_city, path[0]])
+    if next_city is not None:
+        cost += int(dist_matrix[path[-1], next_city])
+    return cost
+
+
+@pytest.mark.parametrize('prev_city, next_city', [(None, None), (0, None), (None, 5), (0, 5)])
+def test_best_break_matches_exhaustive_search(prev_city, next_city):
+    rng = np.random.default_rng(1)
+    for _ in range(30):
+        tour = rng.permutation(np.arange(10, 30))
+        path = _best_break(tour, DENSE, prev_city, next_city)
+
+        # Es la sub-ruta abierta por una de sus aristas, en algún sentido
+        assert edges(path, closed=False) <= edges(tour)
+        assert len(edges(path, closed=False)) == len(tour) - 1
+        # Y ninguna otra arista ni sentido conecta más barato
+        options = [np.roll(tour, -(j + 1)) for j in range(len(tour))]
+        options += [o[::-1] for o in options]
+        best = min(connection_cost(o, DENSE, prev_city, next_city) for o in options)
+        assert connection_cost(path, DENSE, prev_city, next_city) == best
+
+
+def test_stitch_tours_gives_one_valid_route():
+    labels = partition_cities(DENSE, 6, 'kmeans', COORDS)
+    members = cluster_members(labels)
+    rng = np.random.default_rng(2)
+    tours = [rng.permutation(cities) for cities in members]
+
+    route = stitch_tours(tours, DENSE)
+
+    assert sorted(route.tolist()) == list(range(300))
+    naive = np.concatenate(tours)
+    assert route_cost(route.tolist(), DENSE) <= route_cost(naive.tolist(), DENSE)
+
+
+@pytest.mark.parametrize('method', ['kmeans', 'hilbert', 'spectral'])
+def test_partitions_cover_every_city(method):
+    labels = partition_cities(DENSE[:120, :120], 5, method, COORDS[:120], seed=3)
+    members = cluster_members(labels)
+    assert len(labels) == 120
+    assert len(members) == labels.max() + 1 <= 5
+    assert sorted(np.concatenate(members).tolist()) == list(range(120))
+    if method == 'hilbert':
+        assert {len(m) for m in members} == {24}
+
+
+def test_partition_without_coordinates_needs_spectral():
+    with pytest.raises(ValueError, match='coordenadas'):
+        partition_cities(DENSE, 4, 'kmeans')
+
+
+@pytest.mark.parametrize('dist_matrix, workers', [(DENSE, 1), (LAZY, 1), (LAZY, 2)])
+def test_solver_returns_a_valid_improved_route(dist_matrix, workers):
+    route, cost, _, info = decomposition_solver(dist_matrix, cluster_size=60, workers=workers,
+                                                return_info=True)
+    assert sorted(route) == list(range(300))
+    assert cost == route_cost(route, DENSE)
+    assert cost <= info['stitched_cost']
+    assert info['n_clusters'] == 5
+
+
+def test_ga_clusters_and_explicit_matrix():
+    _, dist_matrix = parse_tsp('data/gr24.tsp')
+    route, cost, _ = decomposition_solver(dist_matrix, cluster_size=8, solver='ga', workers=1,
+                                          ga_params={'pop_size': 20, 'generations': 20})
+    assert sorted(route) == list(range(24))
+    assert cost == route_cost(route, dist_matrix)
+
@@ -0,0 +1,75 @@
+# test_distances.py
+# Distancias al vuelo (CoordinateDistanceMatrix): mismas distancias que la
+# matriz densa, caché de filas acotada, y el AG dando el mismo resultado con ambas
+
+import pickle
+
+import numpy as np
+import pytest
+
+from src.distances import CoordinateDistanceMatrix, coordinate_distance_matrix
+from src.genetic_algorithm import genetic_algorithm
+from src.island_model import island_genetic_algorithm
+from src.nearest_neighbor import nearest_neighbor, route_cost
+
+COORDS = np.random.default_rng(0).random((80, 2)) * 5000
+
+
+@pytest.mark.parametrize('edge_weight_type', ['EUC_2D', 'CEIL_2D', 'ATT', 'GEO'])
+def test_lazy_distances_match_the_dense_matrix(edge_weight_type):
+    coords = COORDS / 60 if edge_weight_type == 'GEO' else COORDS  # Grados válidos para GEO
+    dense = coordinate_distance_matrix(coords, edge_weight_type)
+    lazy = CoordinateDistanceMatrix(coords, edge_weight_type)
+
+    assert lazy.shape == dense.shape and lazy.dtype == dense.dtype
+    assert np.array_equal(np.asarray(lazy), dense)
+    assert np.array_equal(lazy[10:20], dense[10:20])
+    assert np.array_equal(lazy[[3, 7, 3]], dense[[3, 7, 3]])
+    i, j = np.meshgrid(np.arange(80), np.arange(80), indexing='ij')
+    assert np.array_equal(lazy[i, j], dense)
+    assert all(lazy.item(a, b) == dense[a, b] for a in range(0, 80, 7) for b in range(80))
+
+
+def test_row_cache_is_bounded_and_counts_hits():
+    lazy = CoordinateDistanceMatrix(COORDS, 'EUC_2D', cache_bytes=5 * 80 * 2)
+    assert lazy.max_rows == 5 and lazy.dtype.itemsize == 2
+    for city in range(8):
+        lazy.row(city)
+    lazy.row(7)
+    info = lazy.cache_info()
+    assert info['rows'] == 5 and info['misses'] == 8 and info['hits'] == 1
+    with pytest.raises(ValueError):
+        lazy.row(7)[0] = 1  # Las filas de la caché son de solo lectura
+
+    copy = pickle.loads(pickle.dumps(lazy))  # A otro proceso viajan solo las coordenadas
+    assert copy.cache_info()['rows'] == 0
+    assert np.array_equal(copy.row(3), lazy.row(3))
+
+
+@pytest.mark.parametrize('params', [
+    {},
+    {'crossover': 'eax'},
+    {'local_search_rate': 0.2, 'initialization': 'heuristic'},
+])
+def test_ga_on_lazy_distances_matches_dense(params):
+    dense = coordinate_distance_matrix(COORDS, 'EUC_2D')
+    lazy = CoordinateDistanceMatrix(COORDS, 'EUC_2D')
+    run = dict(pop_size=30, generations=30, seed=2, verbose=False, **params)
+
+    expected = genetic_algorithm(dense, **run)
+    result = genetic_algorithm(lazy, **run)
+
+    assert result[:3] == expected[:3]
+    route, cost = result[:2]
+    assert sorted(route) == list(range(80))
+    assert cost == route_cost(route, dense)
+
+
+def test_nearest_neighbor_and_islands_on_lazy_distances():
+    dense = coordinate_distance_matrix(COORDS, 'EUC_2D')
+    lazy = CoordinateDistanceMatrix(COORDS, 'EUC_2D')
+    assert nearest_neighbor(lazy, start_city=4)[:2] == nearest_neighbor(dense, start_city=4)[:2]
+
+    params = dict(n_islands=2, pop_size=20, generations=20, migration_interval=5, seed=1)
+    assert island_genetic_algorithm(lazy, workers=2, **params)[:3] == \
+        island_genetic_algorithm(dense, workers=1, **params)[:3]
@@ -0,0 +1,73 @@
+# test_fitness_cache.py
+# Memo de costos del AG: aciertos con rutas rotadas o invertidas y expulsión LRU
+
+import numpy as np
+
+from src.genetic_algorithm import FitnessCache, evaluate_population_array
+from src.parser import parse_tsp
+
+DIST_MATRIX = parse_tsp('data/gr17.tsp')[1]
+
+
+def routes(seed, count, n=17):
+    rng = np.random.default_rng(seed)
+    return np.array([rng.permutation(n) for _ in range(count)])
+
+
+def test_costs_match_direct_evaluation():
+    population = routes(0, 20)
+    memo = FitnessCache(100)
+    costs = memo.evaluate(population, DIST_MATRIX)
+    assert np.array_equal(costs, evaluate_population_array(population, DIST_MATRIX))
+    assert memo.cache_info()['misses'] == 20
+    assert memo.cache_info()['hits'] == 0
+
+
+def test_rotated_and_reversed_routes_hit():
+    route = routes(1, 1)[0]
+    memo = FitnessCache(100)
+    memo.evaluate(route[None, :], DIST_MATRIX)
+
+    variants = np.array([np.roll(route, 5), route[::-1], np.roll(route[::-1], 3), route])
+    costs = memo.evaluate(variants, DIST_MATRIX)
+
+    info = memo.cache_info()
+    assert info['hits'] == 4 and info['misses'] == 1
+    assert info['entries'] == 1
+    assert (costs == evaluate_population_array(route[None, :], DIST_MATRIX)[0]).all()
+
+
+def test_duplicates_in_one_batch_are_evaluated_once():
+    population = np.repeat(routes(2, 3), 4, axis=0)
+    memo = FitnessCache(100)
+    costs = memo.evaluate(population, DIST_MATRIX)
+    assert memo.cache_info()['misses'] == 3
+    assert memo.cache_info()['hits'] == 9
+    assert np.array_equal(costs, evaluate_population_array(population, DIST_MATRIX))
+
+
+def test_least_recently_used_route_is_evicted():
+    a, b, c = routes(3, 3)
+    memo = FitnessCache(2)
+    memo.evaluate(np.array([a, b]), DIST_MATRIX)
+    memo.evaluate(a[None, :], DIST_MATRIX)       # a pasa a ser la más reciente
+    memo.evaluate(c[None, :], DIST_MATRIX)       # Se expulsa b
+    assert memo.cache_info()['entries'] == 2
+
+    hits = memo.hits
+    memo.evaluate(a[None, :], DIST_MATRIX)
+    assert memo.hits == hits + 1                 # a sigue en el memo
+    misses = memo.misses
+    memo.evaluate(b[None, :], DIST_MATRIX)
+    assert memo.misses == misses + 1             # b ya no estaba
+
+
+def test_store_and_clear():
+    population = routes(4, 5)
+    memo = FitnessCache(10)
+    memo.store(population, evaluate_population_array(population, DIST_MATRIX))
+    memo.evaluate(population, DIST_MATRIX)
+    assert memo.cache_info()['hits'] == 5
+
+    memo.clear()
+    assert memo.cache_info()['entries'] == 0
@@ -0,0 +1,100 @@
+# test_genetic_algorithm.py
+# El AG completo: API de generador, criterios de parada, control adaptativo y
+# matrices que no son un arreglo denso
+
+import inspect
+
+import numpy as np
+import pytest
+
+from src.genetic_algorithm import genetic_algorithm, genetic_algorithm_iter, population_diversity
+from src.parser import parse_tsp
+
+DIST_MATRIX = parse_tsp('data/gr17.tsp')[1]
+
+
+def assert_valid_tour(route, cost, dist_matrix):
+    n = len(dist_matrix)
+    assert sorted(route) == list(range(n))
+    assert cost == sum(int(dist_matrix[route[i], route[(i + 1) % n]]) for i in range(n))
+
+
+def test_generator_takes_the_wrapper_parameters_in_the_same_order():
+    wrapper = list(inspect.signature(genetic_algorithm).parameters)
+    generator = list(inspect.signature(genetic_algorithm_iter).parameters)
+    shared = wrapper[:wrapper.index('adaptive') + 1]
+    assert generator[:len(shared)] == shared
+
+
+def test_positional_generator_call_matches_the_wrapper():
+    args = (DIST_MATRIX, 40, 60, 0.1, 5, 4, 42)
+    snapshot = list(genetic_algorithm_iter(*args))[-1]
+    route, cost, history, _ = genetic_algorithm(*args, verbose=False)
+    assert snapshot['best_route'] == route
+    assert snapshot['best_cost'] == cost
+    assert snapshot['history'] == history
+    assert_valid_tour(route, cost, DIST_MATRIX)
+    assert history == sorted(history, reverse=True)  # El mejor costo nunca empeora
+
+
+def run(**params):
+    base = dict(pop_size=40, generations=400, seed=3, verbose=False, return_info=True)
+    return genetic_algorithm(DIST_MATRIX, **{**base, **params})
+
+
+def test_runs_all_generations_without_criteria():
+    route, cost, history, _, info = run(generations=50)
+    assert info['stop_reason'] == 'generations' and info['generations'] == 50
+    assert len(history) == 50
+    assert_valid_tour(route, cost, DIST_MATRIX)
+
+
+def test_target_cost_stops_as_soon_as_it_is_reached():
+    target = run(generations=30)[1] + 50
+    route, cost, history, _, info = run(target_cost=target)
+    assert info['stop_reason'] == 'target'
+    assert cost <= target < history[-2]
+    assert_valid_tour(route, cost, DIST_MATRIX)
+
+
+def test_time_limit_stops_the_run():
+    _, _, _, elapsed, info = run(generations=10 ** 7, time_limit=0.3)
+    assert info['stop_reason'] == 'time_limit'
+    assert 0.3 <= elapsed < 2
+
+
+def test_stagnation_stops_after_the_window():
+    _, _, history, _, info = run(stagnation=25)
+    assert info['stop_reason'] == 'stagnation'
+    last_improvement = max(g for g in range(1, len(history)) if history[g] < history[g - 1])
+    assert info['generations'] == last_improvement + 25 + 1
+    assert len(set(history[-26:])) == 1
+
+
+@pytest.mark.parametrize('action', ['restart', 'hypermutation'])
+def test_stagnation_actions_renew_the_population_and_continue(action):
+    route, cost, history, _, info = run(generations=300, stagnation=15, on_stagnation=action,
+                                        initialization='heuristic')
+    assert info['stop_reason'] == 'generations' and len(history) == 300
+    assert info['restarts'] > 0
+    assert history == sorted(history, reverse=True)  # La élite sobrevive a cada reinicio
+    assert_valid_tour(route, cost, DIST_MATRIX)
+
+
+def test_min_diversity_stops_a_collapsed_population():
+    _, _, _, _, info = run(min_diversity=0.2, mutation_rate=0.01, tournament_size=8)
+    assert info['stop_reason'] == 'diversity'
+
+
+def test_population_diversity_bounds():
+    route = np.random.default_rng(0).permutation(30)
+    clones = np.repeat(route[None, :], 10, axis=0)
+    assert population_diversity(clones) == 0.0
+    rng = np.random.default_rng(1)
+    mixed = np.array([rng.permutation(30) for _ in range(10)])
+    assert 0.5 < population_diversity(mixed) <= 1.0
+
+
+def test_unknown_stagnation_action_raises():
+    with pytest.raises(ValueError, match='Acción desconocida'):
+        run(on_stagnation='panic')
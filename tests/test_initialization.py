@@ -0,0 +1,112 @@
+# test_initialization.py
+# Población inicial sembrada: greedy edge contra una versión de referencia,
+# rutas válidas y sin repetir, y las fracciones pedidas
+
+import numpy as np
+import pytest
+
+from src.genetic_algorithm import evaluate_population_array
+from src.initialization import (
+    canonical_tours,
+    double_bridge_batch,
+    greedy_edge_tour,
+    initial_population,
+    resolve_initialization,
+    unique_tours,
+)
+from src.parser import parse_tsp
+
+DIST_MATRIX = parse_tsp('data/gr24.tsp')[1]
+
+
+def edges(route):
+    route = [int(c) for c in route]
+    return {frozenset(e) for e in zip(route, route[1:] + route[:1], strict=True)}
+
+
+def reference_greedy_edges(dist_matrix):
+    """Greedy edge sobre TODAS las aristas, en Python puro: las aristas que acepta."""
+    n = len(dist_matrix)
+    candidates = sorted((int(dist_matrix[i, j]), i, j) for i in range(n) for j in range(i + 1, n))
+    degree = [0] * n
+    group = list(range(n))
+    accepted = set()
+    for _, i, j in candidates:
+        if degree[i] == 2 or degree[j] == 2 or group[i] == group[j]:
+            continue
+        old, new = group[i], group[j]
+        group = [new if g == old else g for g in group]
+        degree[i] += 1
+        degree[j] += 1
+        accepted.add(frozenset((i, j)))
+    return accepted
+
+
+def assert_permutations(routes, n):
+    assert (np.sort(routes, axis=1) == np.arange(n)).all()
+
+
+def test_greedy_edge_keeps_every_greedy_edge():
+    n = len(DIST_MATRIX)
+    tour = greedy_edge_tour(DIST_MATRIX, k=n - 1)  # Con k = n - 1 se ven todas las aristas
+    assert sorted(tour.tolist()) == list(range(n))
+    # Los fragmentos de greedy quedan enteros; solo se agregan aristas para unirlos
+    assert reference_greedy_edges(DIST_MATRIX) <= edges(tour)
+
+
+def test_greedy_edge_beats_random_tours():
+    greedy = evaluate_population_array(greedy_edge_tour(DIST_MATRIX)[None, :], DIST_MATRIX)[0]
+    rng = np.random.default_rng(0)
+    randoms = evaluate_population_array(np.array([rng.permutation(24) for _ in range(50)]),
+                                        DIST_MATRIX)
+    assert greedy < randoms.min()
+
+
+def test_double_bridge_gives_permutations():
+    rng = np.random.default_rng(1)
+    routes = np.array([rng.permutation(30) for _ in range(40)])
+    shaken = double_bridge_batch(routes, rng)
+    assert_permutations(shaken, 30)
+    for before, after in zip(routes, shaken, strict=True):
+        assert 1 <= len(edges(before) - edges(after)) <= 3  # A B C D → A C B D
+    small = np.array([rng.permutation(7) for _ in range(3)])
+    assert np.array_equal(double_bridge_batch(small, rng), small)  # Con n < 8 no se toca
+
+
+def test_canonical_form_identifies_rotations_and_reversals():
+    route = np.random.default_rng(2).permutation(12)
+    variants = np.array([route, np.roll(route, 4), route[::-1], np.roll(route[::-1], 7)])
+    assert (canonical_tours(variants) == canonical_tours(variants)[0]).all()
+    other = route.copy()
+    other[[1, 2]] = other[[2, 1]]
+    assert len(unique_tours(np.vstack([variants, other]))) == 2
+
+
+@pytest.mark.parametrize('initialization', ['heuristic', {'nn': 0.3},
+                                            {'greedy': 0.2, 'randomized_nn': 0.5}])
+def test_initial_population_is_valid_and_seeded(initialization):
+    fractions = resolve_initialization(initialization)
+    population = initial_population(DIST_MATRIX, 60, np.random.default_rng(3), fractions)
+
+    assert population.shape == (60, 24) and population.dtype == np.int32
+    assert_permutations(population, 24)
+    seeded = int(round(sum(fractions.values()) * 60))
+    heuristic = population[:seeded]
+    # Las rutas sembradas no se repiten y son mejores que las aleatorias del final
+    assert len(unique_tours(heuristic)) == len(heuristic) <= seeded
+    costs = evaluate_population_array(population, DIST_MATRIX)
+    assert costs[:len(heuristic)].mean() < costs[seeded:].mean()
+
+
+def test_initial_population_is_reproducible():
+    fractions = resolve_initialization('heuristic')
+    a = initial_population(DIST_MATRIX, 40, np.random.default_rng(4), fractions)
+    b = initial_population(DIST_MATRIX, 40, np.random.default_rng(4), fractions)
+    assert np.array_equal(a, b)
+
+
+def test_unknown_initialization_raises():
+    with pytest.raises(ValueError, match='desconocida'):
+        resolve_initialization('smart')
+    with pytest.raises(ValueError, match='desconocidas'):
+        resolve_initialization({'nn': 0.1, 'christofides': 0.1})
@@ -0,0 +1,90 @@
+# test_island_model.py
+# Modelo de islas: la migración mueve a los mejores sobre los peores, y las
+# islas evolucionadas en procesos (memoria compartida) dan lo mismo que en serie
+
+import numpy as np
+import pytest
+
+from src.genetic_algorithm import evaluate_population_array
+from src.island_model import island_genetic_algorithm, migrate
+from src.nearest_neighbor import route_cost
+from src.parser import parse_tsp
+
+DIST_MATRIX = parse_tsp('data/gr24.tsp')[1]
+
+
+def islands(n_islands=4, pop_size=12, seed=0):
+    rng = np.random.default_rng(seed)
+    populations = [np.array([rng.permutation(24) for _ in range(pop_size)])
+                   for _ in range(n_islands)]
+    costs = [evaluate_population_array(p, DIST_MATRIX) for p in populations]
+    return populations, costs
+
+
+def test_ring_migration_replaces_the_worst_with_the_previous_islands_best():
+    populations, costs = islands()
+    before = [(p.copy(), c.copy()) for p, c in zip(populations, costs, strict=True)]
+
+    migrate(populations, costs, 2, 'ring', np.random.default_rng(1))
+
+    for target in range(4):
+        source_pop, source_costs = before[target - 1]
+        best = np.sort(source_costs)[:2]
+        old_pop, old_costs = before[target]
+        kept = np.argsort(old_costs)[:-2]  # Todos menos los dos peores siguen ahí
+        assert np.array_equal(populations[target][np.sort(kept)], old_pop[np.sort(kept)])
+        assert sorted(costs[target][np.setdiff1d(np.arange(12), kept)].tolist()) == best.tolist()
+        # Cada fila sigue siendo una ruta válida con su costo correcto
+        assert np.array_equal(costs[target], evaluate_population_array(populations[target],
+                                                                       DIST_MATRIX))
+
+
+def test_random_migration_never_sends_to_itself():
+    for seed in range(20):
+        # Cada isla es una sola ruta repetida: así se ve de dónde vino cada migrante
+        routes = np.array([np.roll(np.arange(24), i) for i in range(5)])
+        populations = [np.repeat(routes[i:i + 1], 6, axis=0) for i in range(5)]
+        costs = [np.arange(6, dtype=np.int64) for _ in range(5)]
+        migrate(populations, costs, 1, 'random', np.random.default_rng(seed))
+        # Un migrante enviado a su propia isla no se notaría: hay 5 rutas ajenas
+        # solo si cada isla envió el suyo a otra
+        foreign = sum(not np.array_equal(r, routes[i])
+                      for i, pop in enumerate(populations) for r in pop)
+        assert foreign == 5
+
+
+def test_migration_with_one_island_does_nothing():
+    populations, costs = islands(n_islands=1)
+    before = populations[0].copy()
+    migrate(populations, costs, 3, 'ring', np.random.default_rng(0))
+    assert np.array_equal(populations[0], before)
+
+
+@pytest.mark.parametrize('condensed', [False, True])
+def test_worker_pool_matches_serial_run(condensed):
+    _, dist_matrix = parse_tsp('data/gr24.tsp', condensed=condensed)
+    params = dict(n_islands=3, pop_size=30, generations=40, migration_interval=10,
+                  migration_size=2, seed=5, return_info=True)
+    serial = island_genetic_algorithm(dist_matrix, workers=1, **params)
+    pooled = island_genetic_algorithm(dist_matrix, workers=2, **params)
+
+    assert pooled[:3] == serial[:3]
+    route, cost, history = pooled[:3]
+    assert sorted(route) == list(range(24))
+    assert cost == route_cost(route, DIST_MATRIX)
+    assert len(history) == 40 and history == sorted(history, reverse=True)
+    assert pooled[4]['island_best_costs'] == serial[4]['island_best_costs']
+    assert min(pooled[4]['island_best_costs']) == cost
+
+
+def test_eax_islands_run():
+    route, cost, _, _ = island_genetic_algorithm(DIST_MATRIX, n_islands=2, pop_size=20,
+                                                 generations=10, crossover='eax', workers=2,
+                                                 topology='random')
+    assert sorted(route) == list(range(24))
+    assert cost == route_cost(route, DIST_MATRIX)
+
+
+def test_unknown_topology_raises():
+    with pytest.raises(ValueError, match='Topología'):
+        island_genetic_algorithm(DIST_MATRIX, topology='star')
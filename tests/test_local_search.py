@@ -0,0 +1,145 @@
+# test_local_search.py
+# 2-opt / Or-opt: la ruta sigue siendo una permutación, el costo nunca sube y
+# los movimientos en el lugar dejan `pos` consistente con `tour`
+
+import numpy as np
+import pytest
+
+from src.local_search import (
+    _move_segment,
+    _reverse,
+    _try_2opt,
+    build_neighbor_lists,
+    improve_population,
+    local_search,
+    or_opt,
+    two_opt,
+)
+from src.nearest_neighbor import route_cost
+from src.parser import parse_tsp
+
+
+def euclidean_matrix(n, seed):
+    xy = np.random.default_rng(seed).random((n, 2)) * 1000
+    return np.rint(np.sqrt(((xy[:, None] - xy[None]) ** 2).sum(-1))).astype(np.int32)
+
+
+def edges(tour):
+    return {frozenset(e) for e in zip(tour, tour[1:] + tour[:1], strict=True)}
+
+
+def assert_consistent(tour, pos):
+    assert sorted(tour) == list(range(len(tour)))
+    assert all(pos[city] == idx for idx, city in enumerate(tour))
+
+
+@pytest.mark.parametrize('n', [5, 8, 13])
+def test_reverse_keeps_pos_and_gives_the_same_cycle(n):
+    rng = np.random.default_rng(n)
+    for _ in range(200):
+        tour = rng.permutation(n).tolist()
+        pos = [0] * n
+        for idx, city in enumerate(tour):
+            pos[city] = idx
+        i, j = rng.integers(0, n, size=2).tolist()
+        # Referencia: el tramo i..j (circular) invertido, sin el atajo del complemento
+        span = [(i + t) % n for t in range((j - i) % n + 1)]
+        expected = list(tour)
+        for slot, city in zip(span, [tour[k] for k in reversed(span)], strict=True):
+            expected[slot] = city
+
+        _reverse(tour, pos, i, j)
+
+        assert_consistent(tour, pos)
+        assert edges(tour) == edges(expected)
+
+
+@pytest.mark.parametrize('n', [6, 9, 20])
+def test_move_segment_matches_rebuilding_the_tour(n):
+    rng = np.random.default_rng(100 + n)
+    for _ in range(300):
+        tour = rng.permutation(n).tolist()
+        if rng.random() < 0.5:
+            tour.reverse()  # Las inversiones previas pueden haber dado vuelta la ruta
+        pos = [0] * n
+        for idx, city in enumerate(tour):
+            pos[city] = idx
+        length = int(rng.integers(1, 4))
+        i = int(rng.integers(n))
+        segment = [tour[(i + t) % n] for t in range(length)]
+        p, nx = tour[i - 1], tour[(i + length) % n]
+        outside = [c for c in tour if c not in segment]
+        x = outside[int(rng.integers(len(outside)))]
+        y = tour[(pos[x] + 1) % n]
+        if y in segment:
+            continue
+        reverse = bool(rng.integers(2))
+
+        # Referencia: sacar el tramo y volver a armar la lista
+        k = outside.index(x) + 1
+        expected = outside[:k] + (segment[::-1] if reverse else segment) + outside[k:]
+
+        _move_segment(tour, pos, p, segment[0], segment[-1], nx, x, y, reverse)
+
+        assert_consistent(tour, pos)
+        assert edges(tour) == edges(expected)
+
+
+@pytest.mark.parametrize('moves', [('2opt',), ('oropt',), ('2opt', 'oropt')])
+def test_local_search_never_increases_cost(moves):
+    dist_matrix = euclidean_matrix(150, 1)
+    neighbors = build_neighbor_lists(dist_matrix, 8)
+    rng = np.random.default_rng(2)
+    for _ in range(5):
+        route = rng.permutation(150)
+        tour, cost = local_search(route, dist_matrix, neighbors, moves=moves)
+        assert sorted(tour) == list(range(150))
+        assert cost == route_cost(tour, dist_matrix)
+        assert cost < route_cost(route.tolist(), dist_matrix)
+
+
+def test_two_opt_reaches_a_local_optimum():
+    dist_matrix = euclidean_matrix(120, 3)
+    neighbors = build_neighbor_lists(dist_matrix, 8).tolist()
+    tour, _ = two_opt(np.random.default_rng(4).permutation(120), dist_matrix, neighbors)
+    pos = [0] * len(tour)
+    for idx, city in enumerate(tour):
+        pos[city] = idx
+    # Ninguna ciudad encuentra ya un 2-opt que mejore entre sus candidatas
+    assert all(_try_2opt(a, tour, pos, dist_matrix.item, neighbors) is None for a in range(120))
+
+
+def test_or_opt_improves_a_displaced_city():
+    _, dist_matrix = parse_tsp('data/gr24.tsp')
+    tour, cost = two_opt(list(range(24)), dist_matrix)
+    moved = tour[:5] + tour[6:12] + [tour[5]] + tour[12:]  # Una ciudad fuera de lugar
+    improved, improved_cost = or_opt(moved, dist_matrix)
+    assert improved_cost <= cost < route_cost(moved, dist_matrix)
+    assert sorted(improved) == list(range(24))
+
+
+def test_improve_population_updates_rows_and_costs():
+    dist_matrix = euclidean_matrix(60, 5)
+    rng = np.random.default_rng(6)
+    population = np.array([rng.permutation(60) for _ in range(6)])
+    costs = np.array([route_cost(r.tolist(), dist_matrix) for r in population])
+    before = population.copy()
+
+    improve_population(population, [1, 4], dist_matrix, build_neighbor_lists(dist_matrix, 6), costs)
+
+    for r in range(6):
+        assert costs[r] == route_cost(population[r].tolist(), dist_matrix)
+        if r in (1, 4):
+            assert costs[r] < route_cost(before[r].tolist(), dist_matrix)
+        else:
+            assert np.array_equal(population[r], before[r])
+
+
+def test_neighbor_lists_are_sorted_by_distance():
+    dist_matrix = euclidean_matrix(40, 7)
+    neighbors = build_neighbor_lists(dist_matrix, 5)
+    for city, row in enumerate(neighbors):
+        assert city not in row
+        others = np.delete(np.arange(40), city)
+        nearest = np.sort(dist_matrix[city, others])[:5]
+        assert dist_matrix[city, row].tolist() == nearest.tolist()
@@ -0,0 +1,167 @@
+# test_parser.py
+# Lectura de instancias TSPLIB: cada formato de matriz explícita y cada
+# fórmula de distancia por coordenadas contra una versión de referencia
+
+import io
+import math
+
+import numpy as np
+import pytest
+
+from src.distances import CondensedDistanceMatrix, CoordinateDistanceMatrix
+from src.parser import instance_matrix, parse_tsp, read_dimension, read_tsplib
+
+INSTANCES = ['data/gr17.tsp', 'data/gr21.tsp', 'data/gr24.tsp']
+
+
+def baseline_parse(filepath):
+    """El parser original del proyecto: solo LOWER_DIAG_ROW, número por número."""
+    with open(filepath, encoding='utf-8') as f:
+        lines = f.readlines()
+    dimension = 0
+    in_weights = False
+    numbers = []
+    for line in lines:
+        line = line.strip()
+        if line.startswith('DIMENSION'):
+            dimension = int(line.split(':')[1])
+        elif line == 'EDGE_WEIGHT_SECTION':
+            in_weights = True
+        elif line == 'EOF':
+            in_weights = False
+        elif in_weights:
+            numbers.extend(int(x) for x in line.split())
+    matrix = np.zeros((dimension, dimension), dtype=int)
+    idx = 0
+    for i in range(dimension):
+        for j in range(i + 1):
+            matrix[i][j] = matrix[j][i] = numbers[idx]
+            idx += 1
+    return dimension, matrix
+
+
+def explicit_weights(matrix, fmt):
+    """Números de EDGE_WEIGHT_SECTION de `matrix` en el formato `fmt`."""
+    n = len(matrix)
+    if fmt == 'FULL_MATRIX':
+        return [matrix[i][j] for i in range(n) for j in range(n)]
+    if fmt == 'UPPER_ROW':
+        return [matrix[i][j] for i in range(n) for j in range(i + 1, n)]
+    if fmt == 'UPPER_DIAG_ROW':
+        return [matrix[i][j] for i in range(n) for j in range(i, n)]
+    if fmt == 'LOWER_ROW':
+        return [matrix[i][j] for i in range(n) for j in range(i)]
+    if fmt == 'LOWER_DIAG_ROW':
+        return [matrix[i][j] for i in range(n) for j in range(i + 1)]
+    raise AssertionError(fmt)
+
+
+def explicit_instance(matrix, fmt, per_line=7):
+    weights = explicit_weights(matrix, fmt)
+    lines = [' '.join(str(w) for w in weights[k:k + per_line])
+             for k in range(0, len(weights), per_line)]
+    return '\n'.join([
+        'NAME: test', 'TYPE: TSP', f'DIMENSION: {len(matrix)}',
+        'EDGE_WEIGHT_TYPE: EXPLICIT', f'EDGE_WEIGHT_FORMAT: {fmt}',
+        'EDGE_WEIGHT_SECTION', *lines, 'EOF', '',
+    ])
+
+
+def reference_distance(a, b, edge_weight_type):
+    """Fórmulas de TSPLIB95 (sección 2.1 del manual), escalares."""
+    if edge_weight_type == 'EUC_2D':
+        return int(math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) + 0.5)
+    if edge_weight_type == 'CEIL_2D':
+        return math.ceil(math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2))
+    if edge_weight_type == 'ATT':
+        r = math.sqrt(((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) / 10.0)
+        t = int(r + 0.5)
+        return t + 1 if t < r else t
+    if edge_weight_type == 'GEO':
+        def radians(x):
+            deg = int(x)
+            return 3.141592 * (deg + 5.0 * (x - deg) / 3.0) / 180.0
+        lat_a, lon_a, lat_b, lon_b = radians(a[0]), radians(a[1]), radians(b[0]), radians(b[1])
+        q1 = math.cos(lon_a - lon_b)
+        q2 = math.cos(lat_a - lat_b)
+        q3 = math.cos(lat_a + lat_b)
+        return int(6378.388 * math.acos(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)) + 1.0)
+    raise AssertionError(edge_weight_type)
+
+
+# burma14 (GEO) de TSPLIB; para EUC_2D y ATT se usan las mismas coordenadas escaladas
+BURMA14 = [
+    (16.47, 96.10), (16.47, 94.44), (20.09, 92.54), (22.39, 93.37), (25.23, 97.24),
+    (22.00, 96.05), (20.47, 97.02), (17.20, 96.29), (16.30, 97.38), (14.05, 98.12),
+    (16.53, 97.38), (21.52, 95.59), (19.41, 97.13), (20.09, 94.55),
+]
+
+
+def coordinate_instance(coords, edge_weight_type):
+    lines = [f"{i + 1} {x} {y}" for i, (x, y) in enumerate(coords)]
+    return '\n'.join([
+        'NAME: test', 'TYPE: TSP', f'DIMENSION: {len(coords)}',
+        f'EDGE_WEIGHT_TYPE: {edge_weight_type}', 'NODE_COORD_SECTION', *lines, 'EOF', '',
+    ])
+
+
+@pytest.mark.parametrize('filepath', INSTANCES)
+def test_parse_tsp_matches_baseline_parser(filepath):
+    dimension, expected = baseline_parse(filepath)
+    n, dist_matrix = parse_tsp(filepath)
+    assert n == dimension == read_dimension(filepath)
+    assert np.array_equal(dist_matrix, expected)
+
+
+@pytest.mark.parametrize('filepath', INSTANCES)
+def test_condensed_matrix_matches_dense(filepath):
+    _, dense = parse_tsp(filepath)
+    _, condensed = parse_tsp(filepath, condensed=True)
+    assert isinstance(condensed, CondensedDistanceMatrix)
+    n = len(dense)
+    i, j = np.meshgrid(np.arange(n), np.arange(n), indexing='ij')
+    assert np.array_equal(condensed[i, j], dense)
+
+
+@pytest.mark.parametrize('fmt', ['FULL_MATRIX', 'UPPER_ROW', 'LOWER_ROW',
+                                 'UPPER_DIAG_ROW', 'LOWER_DIAG_ROW'])
+def test_explicit_formats_give_baseline_matrix(fmt):
+    _, expected = baseline_parse('data/gr17.tsp')
+    instance = read_tsplib(io.StringIO(explicit_instance(expected.tolist(), fmt)))
+    assert np.array_equal(instance_matrix(instance), expected)
+
+    condensed = instance_matrix(instance, condensed=True)
+    n = len(expected)
+    i, j = np.meshgrid(np.arange(n), np.arange(n), indexing='ij')
+    assert np.array_equal(condensed[i, j], expected)
+
+
+@pytest.mark.parametrize('edge_weight_type, scale', [
+    ('EUC_2D', 100), ('CEIL_2D', 100), ('ATT', 1000), ('GEO', 1),
+])
+def test_coordinate_formats_match_tsplib_formulas(edge_weight_type, scale):
+    coords = [(round(x * scale, 2), round(y * scale, 2)) for x, y in BURMA14]
+    instance = read_tsplib(io.StringIO(coordinate_instance(coords, edge_weight_type)))
+    expected = np.array([[reference_distance(a, b, edge_weight_type) if a is not b else 0
+                          for b in coords] for a in coords])
+
+    dense = instance_matrix(instance)
+    assert np.array_equal(dense, expected)
+
+    lazy = instance_matrix(instance, lazy=True)
+    assert isinstance(lazy, CoordinateDistanceMatrix)
+    assert np.array_equal(np.array([lazy[i] for i in range(len(coords))]), expected)
+
+
+def test_burma14_geo_optimal_tour_cost():
+    # Óptimo publicado de burma14: 3323 con la ruta 1-2-14-3-4-5-6-12-7-13-8-11-9-10
+    instance = read_tsplib(io.StringIO(coordinate_instance(BURMA14, 'GEO')))
+    dist_matrix = instance_matrix(instance)
+    tour = [c - 1 for c in (1, 2, 14, 3, 4, 5, 6, 12, 7, 13, 8, 11, 9, 10)]
+    assert sum(int(dist_matrix[a, b]) for a, b in zip(tour, tour[1:] + tour[:1], strict=True)) == 3323
+
+
+def test_unknown_format_raises():
+    text = explicit_instance([[0, 1], [1, 0]], 'FULL_MATRIX').replace('FULL_MATRIX', 'WEIRD')
+    with pytest.raises(ValueError, match='no soportado'):
+        read_tsplib(io.StringIO(text))
@@ -0,0 +1,56 @@
+# test_profiling.py
+# Perfil por fase del AG: una llamada por fase y por generación
+
+from src.genetic_algorithm import genetic_algorithm
+from src.parser import parse_tsp
+from src.profiling import PHASES, Profiler, merge_summaries
+
+DIST_MATRIX = parse_tsp('data/gr17.tsp')[1]
+
+# Fases que corren una vez por generación: las primeras al inicio de cada una
+# (también en la última), las de cría solo si después viene otra generación
+EVERY_GENERATION = ('diversity', 'bookkeeping')
+BREEDING = ('elitism', 'selection', 'crossover', 'mutation', 'replacement')
+
+
+def run(generations=9, **params):
+    profiler = Profiler()
+    genetic_algorithm(DIST_MATRIX, pop_size=30, generations=generations, seed=1,
+                      verbose=False, profiler=profiler, **params)
+    return profiler
+
+
+def test_each_phase_is_counted_once_per_generation():
+    profiler = run()
+    summary = profiler.summary()
+    calls = {phase: p['calls'] for phase, p in summary['phases'].items()}
+
+    assert summary['generations'] == 9
+    assert calls['initialization'] == 1
+    assert 'neighbor_lists' not in calls  # OX1 sin búsqueda local no las necesita
+    for phase in EVERY_GENERATION:
+        assert calls[phase] == 9, phase
+    for phase in BREEDING:
+        assert calls[phase] == 8, phase
+    assert calls['evaluation'] == 1 + 8  # La población inicial y los hijos de cada generación
+    assert set(calls) <= set(PHASES)
+
+
+def test_neighbor_lists_are_their_own_phase():
+    calls = {phase: p['calls'] for phase, p in
+             run(generations=3, local_search_rate=0.2).summary()['phases'].items()}
+    assert calls['initialization'] == 1
+    assert calls['neighbor_lists'] == 1
+    assert calls['local_search'] == 2
+
+
+def test_generation_rows_and_merge():
+    profiler = run()
+    assert len(profiler.generations) == 9
+    assert profiler.evaluations == sum(row['evaluations'] for row in profiler.generations)
+
+    summary = profiler.summary()
+    merged = merge_summaries([summary, summary])
+    assert merged['generations'] == 18
+    assert merged['phases']['selection']['calls'] == 2 * summary['phases']['selection']['calls']
+    assert abs(sum(p['share'] for p in merged['phases'].values()) - 1) < 1e-9
@@ -0,0 +1,102 @@
+# test_result_cache.py
+# Caché de resultados: la clave cambia con la matriz, el solver o los
+# parámetros, y un resultado guardado solo se reutiliza con la misma clave
+
+import os
+
+import numpy as np
+import pytest
+
+import src.cache as cache
+from main import solver_params
+from src.cache import evict_results, load_result, result_key, result_path, save_result
+from src.parser import parse_tsp
+
+
+@pytest.fixture(scope='module')
+def dist_matrix():
+    return parse_tsp('data/gr17.tsp')[1]
+
+
+def result(cost=2085):
+    return {'route': list(range(17)), 'cost': cost, 'history': [2200, 2100, cost],
+            'elapsed': 0.5, 'solver': 'genetic_algorithm', 'params': {}}
+
+
+def test_same_inputs_give_same_key(dist_matrix):
+    params = solver_params({'pop_size': 200, 'generations': 1000}, seed=42)
+    same = solver_params({'generations': 1000, 'pop_size': 200}, seed=42)
+    assert result_key(dist_matrix, 'genetic_algorithm', params) == \
+        result_key(dist_matrix.copy(), 'genetic_algorithm', same)
+
+
+def test_key_changes_with_matrix_solver_and_params(dist_matrix):
+    params = solver_params({'pop_size': 200}, seed=42)
+    key = result_key(dist_matrix, 'genetic_algorithm', params)
+
+    changed = dist_matrix.copy()
+    changed[0, 1] += 1
+    _, condensed = parse_tsp('data/gr17.tsp', condensed=True)
+    others = [
+        result_key(changed, 'genetic_algorithm', params),
+        result_key(condensed, 'genetic_algorithm', params),
+        result_key(dist_matrix.astype(np.int64), 'genetic_algorithm', params),
+        result_key(dist_matrix, 'island_genetic_algorithm', params),
+        result_key(dist_matrix, 'genetic_algorithm', solver_params({'pop_size': 201}, seed=42)),
+        result_key(dist_matrix, 'genetic_algorithm', solver_params({'pop_size': 200}, seed=43)),
+    ]
+    assert len({key, *others}) == len(others) + 1
+
+
+def test_neutral_params_do_not_change_the_key(dist_matrix):
+    base = solver_params({'pop_size': 200}, seed=42)
+    neutral = solver_params({'pop_size': 200, 'checkpoint_path': 'x.npz', 'resume': True,
+                             'fitness_cache': 1000}, seed=42)
+    assert result_key(dist_matrix, 'ga', base) == result_key(dist_matrix, 'ga', neutral)
+
+
+def test_hit_only_with_the_same_key(tmp_path, dist_matrix):
+    cache_dir = str(tmp_path)
+    key = result_key(dist_matrix, 'ga', solver_params({'pop_size': 200}, seed=1))
+    other = result_key(dist_matrix, 'ga', solver_params({'pop_size': 200}, seed=2))
+
+    assert load_result(key, cache_dir) is None
+    save_result(key, result(), cache_dir)
+
+    loaded = load_result(key, cache_dir)
+    assert loaded['cost'] == 2085
+    assert loaded['route'] == list(range(17))
+    assert loaded['history'] == [2200, 2100, 2085]
+    assert load_result(other, cache_dir) is None
+
+
+def test_entries_of_another_version_are_ignored(tmp_path, dist_matrix, monkeypatch):
+    cache_dir = str(tmp_path)
+    key = result_key(dist_matrix, 'ga', {})
+    save_result(key, result(), cache_dir)
+    monkeypatch.setattr(cache, 'RESULT_CACHE_VERSION', cache.RESULT_CACHE_VERSION + 1)
+    assert cache.load_result(key, cache_dir) is None
+
+
+def test_damaged_entry_is_a_miss(tmp_path, dist_matrix):
+    cache_dir = str(tmp_path)
+    key = result_key(dist_matrix, 'ga', {})
+    save_result(key, result(), cache_dir)
+    with open(result_path(key, cache_dir), 'wb') as f:
+        f.write(b'not a npz')
+    assert load_result(key, cache_dir) is None
+
+
+def test_eviction_removes_least_recently_used(tmp_path, dist_matrix):
+    cache_dir = str(tmp_path)
+    keys = [result_key(dist_matrix, 'ga', {'seed': s}) for s in range(3)]
+    for i, key in enumerate(keys):
+        save_result(key, result(2085 + i), cache_dir)
+        os.utime(result_path(key, cache_dir), ns=(i * 10**9, i * 10**9))
+    load_result(keys[0], cache_dir)  # La más vieja pasa a ser la usada más recientemente
+
+    size = os.path.getsize(result_path(keys[0], cache_dir))
+    assert evict_results(cache_dir, max_bytes=2 * size + size // 2) == 1
+    assert load_result(keys[0], cache_dir) is not None
+    assert load_result(keys[1], cache_dir) is None
+    assert load_result(keys[2], cache_dir) is not None
@@ -0,0 +1,133 @@
+# test_service.py
+# Servicio local: los endpoints HTTP de punta a punta sobre un socket Unix,
+# con un pool de un proceso, y las peticiones que se rechazan
+
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from src.nearest_neighbor import route_cost
+from src.parser import parse_tsp
+from src.service import serve
+
+DATA_DIR = os.path.abspath('data')
+GR17 = parse_tsp('data/gr17.tsp')[1]
+GR24 = parse_tsp('data/gr24.tsp')[1]
+
+
+async def call(socket_path, method, path, payload=None, content_type='application/json'):
+    """Una petición HTTP; retorna (estado, cuerpo decodificado como JSON o líneas JSON)."""
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Type: {content_type}\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, data = raw.partition(b'\r\n\r\n')
+    status = int(head.split()[1])
+    lines = [json.loads(line) for line in data.decode('utf-8').splitlines() if line]
+    return status, lines[0] if len(lines) == 1 else lines
+
+
+def run_with_service(tmp_path, scenario):
+    """Arranca el servicio, corre `scenario(socket_path)` y lo detiene."""
+    socket_path = str(tmp_path / 'tsp.sock')
+
+    async def main():
+        ready = asyncio.Event()
+        server = asyncio.create_task(serve(socket_path=socket_path, workers=1, cache_dir=None,
+                                           data_dir=DATA_DIR, ready=ready))
+        await ready.wait()
+        try:
+            return await scenario(socket_path)
+        finally:
+            server.cancel()
+            await asyncio.gather(server, return_exceptions=True)
+
+    return asyncio.run(main())
+
+
+def assert_valid(result, dist_matrix):
+    route = result['route']
+    assert sorted(route) == list(range(len(dist_matrix)))
+    assert result['cost'] == route_cost(route, dist_matrix)
+
+
+def test_jobs_round_trip(tmp_path):
+    async def scenario(sock):
+        status, health = await call(sock, 'GET', '/health')
+        assert status == 200 and health['workers'] == 1
+
+        status, ga = await call(sock, 'POST', '/jobs', {
+            'matrix': GR17.tolist(), 'params': {'pop_size': 30, 'generations': 40}, 'wait': True})
+        assert status == 200 and ga['status'] == 'done'
+        assert_valid(ga['result'], GR17)
+        assert ga['result']['generations'] == 40
+
+        status, nn = await call(sock, 'POST', '/jobs', {'path': 'gr24.tsp', 'solver': 'nn',
+                                                        'wait': True})
+        assert status == 200
+        assert_valid(nn['result'], GR24)
+
+        status, queued = await call(sock, 'POST', '/jobs', {
+            'matrix': GR17.tolist(), 'solver': 'decomposition',
+            'params': {'cluster_size': 6}})
+        assert status == 202
+        status, events = await call(sock, 'GET', f"/jobs/{queued['id']}/events")
+        assert status == 200 and events[-1]['event'] == 'done'
+        status, job = await call(sock, 'GET', f"/jobs/{queued['id']}")
+        assert status == 200 and job['status'] == 'done'
+        assert_valid(job['result'], GR17)
+
+    run_with_service(tmp_path, scenario)
+
+
+def test_time_limit_bounds_decomposition_with_ga(tmp_path):
+    async def scenario(sock):
+        start = time.time()
+        status, job = await call(sock, 'POST', '/jobs', {
+            'matrix': GR24.tolist(), 'solver': 'decomposition', 'time_limit': 1.5, 'wait': True,
+            'params': {'cluster_size': 8, 'solver': 'ga',
+                       'ga_params': {'pop_size': 20, 'generations': 10 ** 7}}})
+        assert status == 200 and job['status'] == 'done'
+        assert_valid(job['result'], GR24)
+        assert time.time() - start < 6
+
+    run_with_service(tmp_path, scenario)
+
+
+@pytest.mark.parametrize('payload, content_type, expected', [
+    ({'matrix': [[0, 1], [1, 0]]}, 'text/plain', 415),
+    ({'matrix': [[0, 1], [1, 0]], 'params': {'checkpoint_path': '/tmp/x.npz'}}, None, 400),
+    ({'matrix': [[0, 1], [1, 0]], 'solver': 'decomposition',
+      'params': {'solver': 'ga', 'ga_params': {'resume': True}}}, None, 400),
+    ({'path': '../README.md'}, None, 400),
+    ({'path': '/etc/passwd'}, None, 400),
+    ({'matrix': [[0, 1], [1, 0]], 'solver': 'nn', 'time_limit': 1}, None, 400),
+    ({'matrix': [[0, 1], [1, 0]], 'solver': 'decomposition', 'time_limit': 1}, None, 400),
+    ({'matrix': [[0, 1], [1, 0]], 'time_limit': -1}, None, 400),
+    ({'matrix': [[0, 1], [1, 0]], 'solver': 'lkh'}, None, 400),
+])
+def test_invalid_requests_are_rejected(tmp_path, payload, content_type, expected):
+    async def scenario(sock):
+        status, body = await call(sock, 'POST', '/jobs', payload,
+                                  content_type or 'application/json')
+        assert status == expected, body
+        assert 'error' in body
+        status, health = await call(sock, 'GET', '/health')
+        assert health['jobs'] == 0
+
+    run_with_service(tmp_path, scenario)
+
+
+def test_unknown_routes_and_methods(tmp_path):
+    async def scenario(sock):
+        assert (await call(sock, 'GET', '/jobs'))[0] == 405
+        assert (await call(sock, 'GET', '/jobs/nope'))[0] == 404
+        assert (await call(sock, 'GET', '/other'))[0] == 404
+
+    run_with_service(tmp_path, scenario)
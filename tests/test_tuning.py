@@ -0,0 +1,94 @@
+# test_tuning.py
+# Parámetros por tamaño, control adaptativo y validación del ajuste por
+# successive halving
+
+import pytest
+
+from src.genetic_algorithm import AdaptiveController, genetic_algorithm
+from src.parser import parse_tsp
+from src.tuning import default_params, instance_class, main, params_for, successive_halving
+
+
+def test_default_params_grow_with_the_instance():
+    small, large = default_params(17), default_params(2000)
+    assert small['pop_size'] <= large['pop_size']
+    assert small['generations'] <= large['generations']
+    assert small['crossover'] == 'ox1' and large['crossover'] == 'eax'
+    assert instance_class(17) == 'tiny' and instance_class(2000) == 'large'
+
+
+def test_profile_overrides_the_class_defaults():
+    profile = {'tiny': {'mutation_rate': 0.3, 'adaptive': True}}
+    assert params_for(17, profile)['mutation_rate'] == 0.3
+    assert params_for(500, profile) == default_params(500)
+
+
+@pytest.mark.parametrize('eta', [1, 0, -2])
+def test_successive_halving_rejects_eta_below_two(eta):
+    with pytest.raises(ValueError, match='eta'):
+        successive_halving(['data/gr17.tsp'], [{}], [1, 2], eta=eta)
+
+
+def test_cli_rejects_eta_below_two():
+    with pytest.raises(SystemExit):
+        main(['data/gr17.tsp', '--eta', '1'])
+
+
+# ─── Control adaptativo ──────────────────────────────────────────────────────
+
+IMPROVING = [1000.0] * 5 + [900.0]  # Mejora del 10 % en la ventana de 5
+STALLED = [1000.0] * 6
+
+
+@pytest.mark.parametrize('diversity,history', [(0.05, IMPROVING), (0.3, STALLED)])
+def test_controller_explores_on_low_diversity_or_no_improvement(diversity, history):
+    controller = AdaptiveController(0.1, 5, window=5)
+    rate, tournament = controller.update(5, diversity, history)
+    assert rate == pytest.approx(0.125) and tournament == 4
+    assert controller.adjustments == 1
+
+
+def test_controller_exploits_on_high_diversity_while_improving():
+    controller = AdaptiveController(0.1, 5, window=5)
+    rate, tournament = controller.update(5, 0.8, IMPROVING)
+    assert rate == pytest.approx(0.08) and tournament == 6
+
+
+def test_controller_keeps_parameters_between_windows_and_in_the_middle_band():
+    controller = AdaptiveController(0.1, 5, window=5)
+    assert not controller.due(0) and not controller.due(3) and controller.due(10)
+    assert controller.update(3, 0.05, IMPROVING) == (0.1, 5)   # No toca ajustar
+    assert controller.update(5, 0.05, IMPROVING[:3]) == (0.1, 5)  # Historia corta
+    assert controller.update(5, 0.3, IMPROVING) == (0.1, 5)    # Ni baja ni alta
+    assert controller.adjustments == 0
+
+
+def test_controller_respects_its_bounds():
+    explore = AdaptiveController(0.4, 2, window=1, max_rate=0.45)
+    for generation in range(1, 5):
+        explore.update(generation, 0.0, STALLED)
+    assert explore.state() == {'mutation_rate': 0.45, 'tournament_size': 2, 'adjustments': 4}
+
+    exploit = AdaptiveController(0.02, 3, window=1, min_rate=0.015)
+    for generation in range(1, 10):
+        exploit.update(generation, 0.9, [1000.0 - generation, 900.0 - generation])
+    assert exploit.mutation_rate == 0.015 and exploit.tournament_size == 6  # 2 × inicial
+
+
+def test_controller_state_round_trips():
+    controller = AdaptiveController(0.1, 5, window=5)
+    controller.update(5, 0.05, STALLED)
+    restored = AdaptiveController(0.1, 5, window=5)
+    restored.restore(controller.state())
+    assert restored.state() == controller.state()
+
+
+def test_adaptive_ga_reports_the_controller_state():
+    dist_matrix = parse_tsp('data/gr17.tsp')[1]
+    route, _, _, _, info = genetic_algorithm(
+        dist_matrix, pop_size=30, generations=100, mutation_rate=0.1, tournament_size=5,
+        seed=0, verbose=False, return_info=True, adaptive=True)
+    assert sorted(route) == list(range(17))
+    assert info['adaptive']['adjustments'] > 0
+    assert 0.01 <= info['adaptive']['mutation_rate'] <= 0.5
+    assert 2 <= info['adaptive']['tournament_size'] <= 10